@@ -4,11 +4,65 @@ from src.environment.resource import get_resource_amount, deplete_resource
 from src.agent import movement
 import pygame
 import random
-from scipy.special import beta as beta_function  # Import the beta function
+import math
+
+# Deterministic max-energy curves, keyed by (alpha, beta, max_age).
+# Each entry is an array indexed by integer age.
+_MAX_ENERGY_TABLES = {}
+
+def get_max_energy_table(alpha, beta, max_age, min_length=None):
+    """
+    Returns the noise-free max energy curve for a beta distribution, indexed by age.
+
+    The table is built once per (alpha, beta, max_age) and grown on demand when
+    an age past the end of the table is requested.
+    """
+    if min_length is None:
+        min_length = max_age + 1
+    key = (alpha, beta, max_age)
+    table = _MAX_ENERGY_TABLES.get(key)
+    if table is None or len(table) < min_length:
+        length = max(min_length, max_age + 1, 2 * len(table) if table is not None else 0)
+        x = np.arange(length, dtype=np.float64) / max_age  # Normalize
+
+        # Beta function from log-gamma, so we don't need scipy here.
+        beta_value = math.exp(math.lgamma(alpha) + math.lgamma(beta) - math.lgamma(alpha + beta))
+
+        # The PDF, scaled to 90 and shifted to start at 10.
+        pdf = (x**(alpha - 1) * (1 - x)**(beta - 1)) / beta_value
+        table = pdf * 90 + 10
+        table.setflags(write=False)  # Shared between agents.
+        _MAX_ENERGY_TABLES[key] = table
+    return table
+
+def apply_max_energy_noise(max_energy, noise):
+    """Adds noise to max energy values, skipping any that would leave the (0, 100) range."""
+    noisy = max_energy + noise
+    return np.where((noisy > 0) & (noisy < 100), noisy, max_energy)
+
+def calculate_max_energies(agents):
+    """
+    Looks up the max energy of every agent at its current age.
+
+    Agents sharing beta parameters are resolved with a single table lookup.
+    Returns an array aligned with `agents`.
+    """
+    result = np.empty(len(agents), dtype=np.float64)
+    groups = {}
+    for i, agent in enumerate(agents):
+        groups.setdefault((agent.alpha, agent.beta, agent.max_age), []).append(i)
+
+    for (alpha, beta, max_age), indices in groups.items():
+        ages = np.array([int(agents[i].age) for i in indices])
+        table = get_max_energy_table(alpha, beta, max_age, ages.max() + 1)
+        noise = np.array([agents[i].get_max_energy_noise(age + 1)[age] for i, age in zip(indices, ages)])
+        result[indices] = apply_max_energy_noise(table[ages], noise)
+    return result
 
 class Agent:
-    def __init__(self, x, y, energy=100, group=None):
-        """Initializes an agent with a starting position and energy."""
+    def __init__(self, x, y, energy=100, group=None, genome=None):
+        """Initializes an agent with a starting position, energy and an optional Genome."""
+        self.genome = genome
         self.x = x
         self.y = y
         self.energy = energy
@@ -21,10 +75,13 @@ class Agent:
         self.death_time = None  # Time it died.
         self.death_x = None  # Position that died.
         self.death_y = None  # Position that died.
+        self.death_cause = None  # Why it died (see population.DEATH_CAUSES).
+        self.slot = None  # Slot in the Population, assigned when added.
+        self.agent_id = None  # Id unique over the run (never reused, unlike slots), assigned when added.
         self.age = 0  # Age, for beta calculation
         self.group = group  # Group for this agent.
         self.last_age_update = self.birth_time  # Track when to update.
-        self.last_graph_update = -1  # Track if the graph was made.
+        self.energy_plot = None  # Sidebar plot of max energy over age, created when first shown.
         self.color = (random.randint(0, 255), random.randint(0, 255), random.randint(0, 255))  # Set color.
         self.total_las_ate = "Never Ate"
         self.last_eat_update = self.birth_time  # Track when to update last_eat string on sidebar.
@@ -34,6 +91,7 @@ class Agent:
         self.alpha = 2
         self.beta = 5
         self.max_age = 100  # Max value.
+        self._max_energy_noise = np.empty(0)  # Noise for each age, drawn as the agent gets older.
 
         # Calculate max energy using beta values.
         self.max_energy = self.calculate_max_energy()  # The maximum energy
@@ -50,6 +108,7 @@ class Agent:
                 self.death_time = pygame.time.get_ticks()  # Time
                 self.death_x = self.x  # Position.
                 self.death_y = self.y  # Position
+                self.death_cause = "starvation"
             return False  # Agent is dead
 
         # Base metabolism - reduced energy loss for better survival
@@ -88,24 +147,34 @@ class Agent:
         """Returns the agent's current energy level."""
         return self.energy
 
+    def get_gene(self, gene_name, default=0.5):
+        """Returns a gene from the agent's genome, or `default` if it has none."""
+        if self.genome is None:
+            return default
+        return self.genome.get_gene(gene_name)
+
+    def get_max_energy_noise(self, length):
+        """Returns this agent's max energy noise for ages 0..length-1, drawing any new values."""
+        if len(self._max_energy_noise) < length:
+            extra = np.random.uniform(-5, 5, length - len(self._max_energy_noise))  # Create noise.
+            self._max_energy_noise = np.concatenate((self._max_energy_noise, extra))
+        return self._max_energy_noise
+
     def calculate_max_energy(self):
         """Calculates the maximum energy based on a beta distribution and age."""
-        x = self.age / self.max_age  # Normalize
-
-        # The PDF
-        pdf = (x**(self.alpha - 1) * (1 - x)**(self.beta - 1)) / beta_function(self.alpha, self.beta)
-        
-        # Ensure the value to be inside our requirements.
-        max_energy = (pdf * 90) + 10  # Scale to 90 and shift to start at 10
-        
-        # Add noise; do not add noise if it's higher or lower than requirements.
-        noise = random.uniform(-5, 5)  # Create noise.
-        
-        # Verify the range of the value.
-        if max_energy + noise > 0 and max_energy + noise < 100:
-            max_energy += noise
-
-        return max_energy
+        age = int(self.age)
+        table = get_max_energy_table(self.alpha, self.beta, self.max_age, age + 1)
+        noise = self.get_max_energy_noise(age + 1)
+        return float(apply_max_energy_noise(table[age], noise[age]))
+
+    def max_energy_curve(self, up_to_age=None):
+        """Returns the max energy for every age from 0 to `up_to_age` (defaults to the current age)."""
+        if up_to_age is None:
+            up_to_age = self.age
+        length = int(up_to_age) + 1
+        table = get_max_energy_table(self.alpha, self.beta, self.max_age, length)
+        noise = self.get_max_energy_noise(length)
+        return apply_max_energy_noise(table[:length], noise[:length])
     
     def adjust_energy_level(self):
         """Adjusts the agent's energy level towards max_energy if current energy exceeds it."""
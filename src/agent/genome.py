@@ -0,0 +1,83 @@
+# src/agent/genome.py
+import numpy as np
+
+# Gene name -> (min value, max value). Column order in the population matrix follows this order.
+DEFAULT_GENE_SCHEMA = {
+    "hacns1": (0.0, 1.0),               # Movement/communication efficiency
+    "bipedalism": (0.0, 1.0),           # Terrain speed bonus
+    "dietary_flexibility": (0.0, 1.0),  # Energy gained from food
+    "social_bonding": (0.0, 1.0),       # Affinity towards group members
+}
+
+class GeneSchema:
+    """Ordered gene names with their value bounds, shared by every genome in a population."""
+
+    def __init__(self, genes=None):
+        if genes is None:
+            genes = DEFAULT_GENE_SCHEMA
+        self.names = list(genes.keys())
+        self.low = np.array([bounds[0] for bounds in genes.values()], dtype=np.float32)
+        self.high = np.array([bounds[1] for bounds in genes.values()], dtype=np.float32)
+        self._columns = {name: i for i, name in enumerate(self.names)}
+
+    def __len__(self):
+        return len(self.names)
+
+    def index(self, gene_name):
+        """Returns the matrix column of a gene."""
+        return self._columns[gene_name]
+
+class GenomePopulation:
+    """
+    A population of genomes stored as one (agents x genes) float32 matrix.
+
+    Row i is the genome of individual i; columns follow the schema's gene order.
+    Mutation, crossover and selection in `src.genetic_algorithm` operate on the
+    whole matrix at once.
+    """
+
+    def __init__(self, genes, schema=None):
+        self.schema = schema if schema is not None else GeneSchema()
+        self.genes = np.ascontiguousarray(genes, dtype=np.float32).reshape(-1, len(self.schema))
+
+    @classmethod
+    def random(cls, size, schema=None, rng=None):
+        """Creates `size` genomes with every gene drawn uniformly within its bounds."""
+        schema = schema if schema is not None else GeneSchema()
+        rng = rng if rng is not None else np.random.default_rng()
+        genes = rng.uniform(schema.low, schema.high, (size, len(schema))).astype(np.float32)
+        return cls(genes, schema)
+
+    def __len__(self):
+        return len(self.genes)
+
+    def __getitem__(self, index):
+        """Returns a Genome view of one individual."""
+        return Genome(self, index)
+
+    def column(self, gene_name):
+        """Returns one gene across the whole population (a view, not a copy)."""
+        return self.genes[:, self.schema.index(gene_name)]
+
+    def clip(self):
+        """Clamps every gene to its schema bounds, in place."""
+        np.clip(self.genes, self.schema.low, self.schema.high, out=self.genes)
+
+    def copy(self):
+        return GenomePopulation(self.genes.copy(), self.schema)
+
+class Genome:
+    """A single individual's genome: a row view into a GenomePopulation."""
+
+    def __init__(self, population, index):
+        self.population = population
+        self.index = index
+
+    def get_gene(self, gene_name):
+        """Returns the value of a given gene."""
+        return float(self.population.genes[self.index, self.population.schema.index(gene_name)])
+
+    def get_all_genes(self):
+        """Returns a dictionary of all gene names and their values."""
+        row = self.population.genes[self.index]
+        return {name: float(value) for name, value in zip(self.population.schema.names, row)}
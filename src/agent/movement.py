@@ -29,6 +29,7 @@ def move(agent, dx, dy, terrain, terrain_type_map, delta):
     # Get current terrain type and apply speed multiplier
     current_terrain = get_terrain_type(terrain_type_map, round(agent.x), round(agent.y))
     speed_multiplier = TERRAIN_SPEED_MULTIPLIER.get(current_terrain, 1.0)
+    speed_multiplier *= 0.5 + agent.get_gene("bipedalism")  # x1.0 without a genome
     
     # Store the speed multiplier in the agent for sidebar display
     agent.terrain_speed_multiplier = speed_multiplier
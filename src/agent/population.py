@@ -0,0 +1,113 @@
+# src/agent/population.py
+import numpy as np
+
+# Causes of death stored in the archive (index = code).
+DEATH_CAUSES = ("unknown", "starvation")
+
+DEATH_RECORD_DTYPE = np.dtype([
+    ('time', np.int64),    # pygame ticks at death
+    ('x', np.float32),     # Position that died.
+    ('y', np.float32),
+    ('cause', np.uint8),   # Index into DEATH_CAUSES
+    ('age', np.int32),
+    ('group', np.int32),
+])
+
+class DeathArchive:
+    """
+    Bounded ring buffer of death records (time, position, cause, age, group).
+
+    Once full, the oldest records are overwritten; `total` keeps counting every death.
+    """
+
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self._records = np.zeros(capacity, dtype=DEATH_RECORD_DTYPE)
+        self._next = 0  # Next slot to write.
+        self.total = 0  # Deaths recorded since creation.
+
+    def record(self, time, x, y, cause="unknown", age=0, group=-1):
+        """Stores one death, overwriting the oldest record when the archive is full."""
+        code = DEATH_CAUSES.index(cause) if cause in DEATH_CAUSES else 0
+        self._records[self._next] = (time, x, y, code, age, -1 if group is None else group)
+        self._next = (self._next + 1) % self.capacity
+        self.total += 1
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def records(self):
+        """Returns the stored records, oldest first, as a NumPy structured array."""
+        if self.total < self.capacity:
+            return self._records[:self.total].copy()
+        return np.concatenate((self._records[self._next:], self._records[:self._next]))
+
+    def counts_by_cause(self):
+        """Returns {cause name: number of stored records}."""
+        counts = np.bincount(self.records()['cause'], minlength=len(DEATH_CAUSES))
+        return {cause: int(count) for cause, count in zip(DEATH_CAUSES, counts)}
+
+class Population:
+    """
+    Holds the live agents and recycles the slots of dead ones.
+
+    `agents` only ever contains living agents, so iterating, rendering and the sidebar
+    cost scales with the live population. Every agent gets an integer `slot` that stays
+    fixed for its lifetime (usable as a SpatialHash id); slots freed by deaths are
+    handed to new agents before the slot range grows. Agents also get an `agent_id`, counting
+    up from 0 and never reused, that identifies them in logs across the whole run.
+    """
+
+    def __init__(self, agents=(), archive_capacity=1000):
+        self.agents = []  # Living agents, in the order they were added.
+        self.slots = []  # slot -> agent, or None when the slot is free
+        self._free_slots = []
+        self.next_id = 0  # agent_id of the next new agent.
+        self.deaths = DeathArchive(archive_capacity)
+        for agent in agents:
+            self.add(agent)
+
+    def add(self, agent):
+        """Adds an agent, reusing a free slot if there is one. Returns the slot."""
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self.slots[slot] = agent
+        else:
+            slot = len(self.slots)
+            self.slots.append(agent)
+        agent.slot = slot
+        if getattr(agent, "agent_id", None) is None:
+            agent.agent_id = self.next_id
+            self.next_id += 1
+        self.agents.append(agent)
+        return slot
+
+    def reap(self, current_time):
+        """
+        Moves dead agents into the death archive and frees their slots.
+        Returns the agents that were removed.
+        """
+        dead = [agent for agent in self.agents if not agent.is_alive()]
+        if not dead:
+            return dead
+
+        for agent in dead:
+            # Agents that ran out of energy mid-move never reached the death bookkeeping in update().
+            if agent.death_time is None:
+                agent.death_time = current_time
+                agent.death_x = agent.x
+                agent.death_y = agent.y
+            cause = getattr(agent, 'death_cause', None) or "starvation"
+            self.deaths.record(agent.death_time, agent.death_x, agent.death_y, cause, agent.age, agent.group)
+            self.slots[agent.slot] = None
+            self._free_slots.append(agent.slot)
+            agent.slot = None
+
+        self.agents = [agent for agent in self.agents if agent.slot is not None]
+        return dead
+
+    def __iter__(self):
+        return iter(self.agents)
+
+    def __len__(self):
+        return len(self.agents)
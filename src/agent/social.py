@@ -0,0 +1,291 @@
+# src/agent/social.py
+import numpy as np
+
+DEFAULT_CELL_SIZE = 4.0  # Tiles per hash cell, roughly the radius of a typical social query.
+
+class SpatialHash:
+    """
+    Uniform-grid spatial hash for agent-agent neighbor queries.
+
+    Agents are identified by integer ids (e.g. their index or slot in the population).
+    Positions and groups are kept in flat NumPy arrays so distance checks are vectorized,
+    and each integer cell (cx, cy) maps to the set of ids inside it. `groups_version` changes
+    whenever an agent's group does, so results derived from the groups can be cached.
+    """
+
+    def __init__(self, cell_size=DEFAULT_CELL_SIZE, capacity=64):
+        self.cell_size = float(cell_size)
+        self.cells = {}  # (cx, cy) -> set of agent ids
+        self.positions = np.zeros((capacity, 2), dtype=np.float64)
+        self.groups = np.full(capacity, -1, dtype=np.int64)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.cell_of = np.zeros((capacity, 2), dtype=np.int64)  # Cell each id is filed under.
+        self.count = 0
+        self.groups_version = 0
+        # Bounding box of cells that have ever been occupied; bounds k-nearest searches.
+        self.min_cell = np.zeros(2, dtype=np.int64)
+        self.max_cell = np.zeros(2, dtype=np.int64)
+
+    def _cell(self, x, y):
+        """Returns the integer cell containing (x, y)."""
+        return int(np.floor(x / self.cell_size)), int(np.floor(y / self.cell_size))
+
+    def _extend_bounds(self, cells):
+        """Grows the occupied-cell bounding box to include the given (n, 2) cells."""
+        cells = np.asarray(cells, dtype=np.int64).reshape(-1, 2)
+        if len(cells):
+            if not self.cells and self.count == 0:
+                self.min_cell = cells.min(axis=0)
+                self.max_cell = cells.max(axis=0)
+            else:
+                self.min_cell = np.minimum(self.min_cell, cells.min(axis=0))
+                self.max_cell = np.maximum(self.max_cell, cells.max(axis=0))
+
+    def _ensure_capacity(self, size):
+        """Grows the per-id arrays so that ids up to size - 1 fit."""
+        capacity = len(self.active)
+        if size <= capacity:
+            return
+        new_capacity = max(size, capacity * 2)
+        extra = new_capacity - capacity
+        self.positions = np.concatenate((self.positions, np.zeros((extra, 2))))
+        self.groups = np.concatenate((self.groups, np.full(extra, -1, dtype=np.int64)))
+        self.active = np.concatenate((self.active, np.zeros(extra, dtype=bool)))
+        self.cell_of = np.concatenate((self.cell_of, np.zeros((extra, 2), dtype=np.int64)))
+
+    def rebuild(self, positions, groups=None):
+        """
+        Rebuilds the hash from scratch.
+
+        Args:
+            positions (array-like): (n, 2) array of (x, y); row i belongs to agent id i.
+            groups (array-like, optional): Group of each agent, or None for no groups.
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        n = len(positions)
+        self._ensure_capacity(n)
+        self.positions[:n] = positions
+        self.groups[:] = -1
+        if groups is not None:
+            self.groups[:n] = groups
+        self.groups_version += 1
+        self.active[:] = False
+        self.active[:n] = True
+        self.count = n
+
+        # Sort ids by cell so each cell's members are one contiguous slice.
+        cells = np.floor(positions / self.cell_size).astype(np.int64)
+        self.cell_of[:n] = cells
+        self.cells = {}
+        if n == 0:
+            return
+        self.min_cell = cells.min(axis=0)
+        self.max_cell = cells.max(axis=0)
+        order = np.lexsort((cells[:, 1], cells[:, 0]))
+        sorted_cells = cells[order]
+        boundaries = np.flatnonzero(np.any(sorted_cells[1:] != sorted_cells[:-1], axis=1)) + 1
+        starts = np.concatenate(([0], boundaries))
+        ends = np.concatenate((boundaries, [n]))
+        for start, end in zip(starts, ends):
+            cx, cy = sorted_cells[start]
+            self.cells[(int(cx), int(cy))] = set(order[start:end].tolist())
+
+    def insert(self, agent_id, x, y, group=-1):
+        """Adds an agent to the hash."""
+        if agent_id < len(self.active) and self.active[agent_id]:
+            self.remove(agent_id)
+        self._ensure_capacity(agent_id + 1)
+        cell = self._cell(x, y)
+        self._extend_bounds(cell)
+        self.positions[agent_id] = (x, y)
+        group = -1 if group is None else group
+        if self.groups[agent_id] != group:
+            self.groups[agent_id] = group
+            self.groups_version += 1
+        self.active[agent_id] = True
+        self.cell_of[agent_id] = cell
+        self.cells.setdefault(cell, set()).add(agent_id)
+        self.count += 1
+
+    def remove(self, agent_id):
+        """Removes an agent from the hash (no-op if it isn't present)."""
+        if agent_id >= len(self.active) or not self.active[agent_id]:
+            return
+        cell = (int(self.cell_of[agent_id, 0]), int(self.cell_of[agent_id, 1]))
+        members = self.cells[cell]
+        members.discard(agent_id)
+        if not members:
+            del self.cells[cell]
+        self.active[agent_id] = False
+        self.count -= 1
+
+    def move(self, agent_id, x, y):
+        """Updates one agent's position, only touching the cell sets if it changed cell."""
+        if agent_id >= len(self.active) or not self.active[agent_id]:
+            self.insert(agent_id, x, y)  # Not in the hash yet.
+            return
+        self.positions[agent_id] = (x, y)
+        cell = self._cell(x, y)
+        old_cell = (int(self.cell_of[agent_id, 0]), int(self.cell_of[agent_id, 1]))
+        if cell != old_cell:
+            self._extend_bounds(cell)
+            members = self.cells[old_cell]
+            members.discard(agent_id)
+            if not members:
+                del self.cells[old_cell]
+            self.cells.setdefault(cell, set()).add(agent_id)
+            self.cell_of[agent_id] = cell
+
+    def update_positions(self, positions, groups=None):
+        """
+        Moves every agent at once; row i of `positions` is agent id i.
+        Only agents that crossed a cell boundary are re-filed. Ids that were not in the hash
+        (e.g. the population grew) are inserted, and ids from n up are removed. With `groups`,
+        the agents' groups are refreshed too; without, inserted ids get no group (-1).
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        n = len(positions)
+        self._ensure_capacity(n)
+        for agent_id in np.flatnonzero(self.active[n:]).tolist():
+            self.remove(n + agent_id)
+        self.positions[:n] = positions
+        if groups is not None and not np.array_equal(self.groups[:n], groups):
+            self.groups[:n] = groups
+            self.groups_version += 1
+        cells = np.floor(positions / self.cell_size).astype(np.int64)
+
+        added = np.flatnonzero(~self.active[:n])
+        if len(added):
+            if groups is None and (self.groups[added] != -1).any():
+                self.groups[added] = -1  # Not the group of the slot's previous agent.
+                self.groups_version += 1
+            self._extend_bounds(cells[added])
+            for agent_id in added.tolist():
+                self.cells.setdefault((int(cells[agent_id, 0]), int(cells[agent_id, 1])), set()).add(agent_id)
+            self.cell_of[added] = cells[added]
+            self.active[added] = True
+            self.count += len(added)
+
+        changed = np.flatnonzero(np.any(cells != self.cell_of[:n], axis=1))
+        self._extend_bounds(cells[changed])
+        for agent_id in changed.tolist():
+            old_cell = (int(self.cell_of[agent_id, 0]), int(self.cell_of[agent_id, 1]))
+            members = self.cells[old_cell]
+            members.discard(agent_id)
+            if not members:
+                del self.cells[old_cell]
+            cell = (int(cells[agent_id, 0]), int(cells[agent_id, 1]))
+            self.cells.setdefault(cell, set()).add(agent_id)
+        self.cell_of[changed] = cells[changed]
+
+    def _candidates(self, x, y, radius):
+        """Returns the ids in every cell overlapping the square around (x, y)."""
+        cx0, cy0 = self._cell(x - radius, y - radius)
+        cx1, cy1 = self._cell(x + radius, y + radius)
+        ids = []
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(self.cells):
+            # The query box covers more cells than are occupied; walk the occupied ones instead.
+            for (cx, cy), members in self.cells.items():
+                if cx0 <= cx <= cx1 and cy0 <= cy <= cy1:
+                    ids.extend(members)
+        else:
+            for cx in range(cx0, cx1 + 1):
+                for cy in range(cy0, cy1 + 1):
+                    members = self.cells.get((cx, cy))
+                    if members:
+                        ids.extend(members)
+        return np.fromiter(ids, dtype=np.int64, count=len(ids))
+
+    def _filter_group(self, ids, group, same_group):
+        """Keeps only ids in (or, with same_group=False, outside) the given group."""
+        if group is None:
+            return ids
+        if same_group:
+            return ids[self.groups[ids] == group]
+        return ids[self.groups[ids] != group]
+
+    def query_radius(self, x, y, radius, group=None, same_group=True, exclude=None):
+        """
+        Returns the ids of agents within `radius` of (x, y).
+
+        Args:
+            group (int, optional): Restrict results by group.
+            same_group (bool): If False, return agents *not* in `group` instead.
+            exclude (int, optional): An id to leave out (usually the querying agent).
+        """
+        ids = self._filter_group(self._candidates(x, y, radius), group, same_group)
+        if exclude is not None:
+            ids = ids[ids != exclude]
+        offsets = self.positions[ids] - (x, y)
+        dist_sq = np.einsum('ij,ij->i', offsets, offsets)
+        return ids[dist_sq <= radius * radius]
+
+    def query_rect(self, x0, y0, x1, y1):
+        """Returns the ids of agents with x0 <= x < x1 and y0 <= y < y1."""
+        ids = self._candidates((x0 + x1) / 2, (y0 + y1) / 2, max(x1 - x0, y1 - y0) / 2)
+        positions = self.positions[ids]
+        inside = (positions[:, 0] >= x0) & (positions[:, 0] < x1) & (positions[:, 1] >= y0) & (positions[:, 1] < y1)
+        return ids[inside]
+
+    def k_nearest(self, x, y, k, group=None, same_group=True, exclude=None):
+        """
+        Returns up to k ids nearest to (x, y), closest first, optionally restricted by group.
+
+        Searches an expanding square of cells until the k-th candidate is provably the k-th nearest.
+        """
+        if k <= 0 or not self.cells:
+            return np.empty(0, dtype=np.int64)
+
+        # Furthest any occupied cell can be, so the search knows when to stop expanding.
+        query_cell = np.array(self._cell(x, y))
+        max_cells = np.maximum(np.abs(self.min_cell - query_cell), np.abs(self.max_cell - query_cell)).max()
+        max_reach = (max_cells + 1) * self.cell_size
+
+        radius = self.cell_size
+        while True:
+            ids = self._filter_group(self._candidates(x, y, radius), group, same_group)
+            if exclude is not None:
+                ids = ids[ids != exclude]
+            offsets = self.positions[ids] - (x, y)
+            dist_sq = np.einsum('ij,ij->i', offsets, offsets)
+            if len(ids) > k:
+                nearest = np.argpartition(dist_sq, k - 1)[:k]
+            else:
+                nearest = np.arange(len(ids))
+            nearest = nearest[np.argsort(dist_sq[nearest], kind='stable')]
+
+            # Everything within `radius` has been seen, so the result is exact once the
+            # k-th distance fits inside it (or there is nothing left to search).
+            if (len(nearest) == k and dist_sq[nearest[-1]] <= radius * radius) or radius >= max_reach:
+                return ids[nearest]
+            radius *= 2
+
+def build_spatial_hash(agents, cell_size=DEFAULT_CELL_SIZE):
+    """Builds a spatial hash over a list of agents; each agent's id is its index in the list."""
+    spatial_hash = SpatialHash(cell_size, capacity=max(len(agents), 1))
+    positions = np.array([agent.get_position() for agent in agents], dtype=np.float64).reshape(-1, 2)
+    groups = np.array([-1 if agent.group is None else agent.group for agent in agents], dtype=np.int64)
+    spatial_hash.rebuild(positions, groups)
+    return spatial_hash
+
+def update_spatial_hash(spatial_hash, agents):
+    """
+    Refreshes the hash with the agents' current positions and groups (incremental for agents
+    that stayed put); agents added to or removed from the end of the list are handled too.
+    """
+    positions = np.array([agent.get_position() for agent in agents], dtype=np.float64).reshape(-1, 2)
+    groups = np.array([-1 if agent.group is None else agent.group for agent in agents], dtype=np.int64)
+    spatial_hash.update_positions(positions, groups)
+
+def find_neighbors(spatial_hash, agents, agent_id, radius):
+    """Returns the agents within `radius` of agents[agent_id], excluding itself."""
+    x, y = agents[agent_id].get_position()
+    return [agents[i] for i in spatial_hash.query_radius(x, y, radius, exclude=agent_id)]
+
+def find_nearest_group_members(spatial_hash, agents, agent_id, k, same_group=True):
+    """Returns the k agents nearest to agents[agent_id] in its own group (or in other groups)."""
+    agent = agents[agent_id]
+    x, y = agent.get_position()
+    group = -1 if agent.group is None else agent.group
+    ids = spatial_hash.k_nearest(x, y, k, group=group, same_group=same_group, exclude=agent_id)
+    return [agents[i] for i in ids]
@@ -31,7 +31,9 @@ def collect_resource(agent, resource_map, x, y):
         resource_map = deplete_resource(resource_map, x, y)  # Update resource map
         # Provide more energy gain for younger agents to help them survive
         age_factor = max(0.5, 1.0 - (agent.age / agent.max_age))  # Higher multiplier for younger agents
-        agent.energy += resource_amount * 75 * age_factor  # Increased base energy gain with age scaling
+        diet_factor = 0.5 + agent.get_gene("dietary_flexibility")  # x1.0 without a genome
+        agent.energy += resource_amount * 75 * age_factor * diet_factor  # Increased base energy gain with age scaling
+        agent.collected_resources += 1
         agent.last_ate = pygame.time.get_ticks()  # Update last ate time
 
         #Ensure is never over the max
@@ -0,0 +1,152 @@
+# src/agent_simulation.py
+import random
+import time
+import numpy as np
+from src.environment import terrain, resource
+from src.agent.agent import Agent
+from src.agent.population import Population
+
+class EpisodeTimeout(Exception):
+    """Raised when a headless episode runs past its wall-clock limit."""
+
+def seed_everything(seed):
+    """Seeds both random number generators the simulation draws from."""
+    random.seed(seed)
+    np.random.seed(seed % (2**32))
+
+class RandomScope:
+    """
+    A private pair of `random`/`np.random` states, swapped in with `with scope:`.
+
+    The simulation draws from the global generators; scoping them keeps several
+    simulations in one process from disturbing each other's random streams.
+    """
+
+    def __init__(self, seed):
+        outer = (random.getstate(), np.random.get_state())
+        seed_everything(seed)
+        self._state = (random.getstate(), np.random.get_state())
+        random.setstate(outer[0])
+        np.random.set_state(outer[1])
+
+    def __enter__(self):
+        self._outer = (random.getstate(), np.random.get_state())
+        random.setstate(self._state[0])
+        np.random.set_state(self._state[1])
+        return self
+
+    def __exit__(self, *exc_info):
+        self._state = (random.getstate(), np.random.get_state())
+        random.setstate(self._outer[0])
+        np.random.set_state(self._outer[1])
+
+class World:
+    """
+    The static part of a simulation: heightmap, terrain types and the initial resource map.
+
+    Episodes never modify a World, so one instance (or its arrays in shared memory)
+    can back any number of headless runs.
+    """
+
+    def __init__(self, heightmap, terrain_type_map, resource_map):
+        self.heightmap = heightmap
+        self.terrain_type_map = terrain_type_map
+        self.resource_map = resource_map
+
+    @classmethod
+    def generate(cls, width=30, height=30, num_resources=25, seed=None):
+        """Generates a new world; with a seed, the same world every time."""
+        if seed is not None:
+            seed_everything(seed)
+        heightmap, _, terrain_type_map = terrain.generate_heightmap(width=width, height=height)
+        resource_map, _ = resource.distribute_resources(heightmap, terrain_type_map, num_resources)
+        return cls(heightmap, terrain_type_map, resource_map)
+
+    def arrays(self):
+        """Returns the world's arrays by name (e.g. for SharedArrays)."""
+        return {
+            "heightmap": self.heightmap,
+            "terrain_type_map": self.terrain_type_map,
+            "resource_map": self.resource_map,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        return cls(arrays["heightmap"], arrays["terrain_type_map"], arrays["resource_map"])
+
+class HeadlessSimulation:
+    """
+    Runs agents on a World at a fixed step size, without pygame or wall-clock timers.
+
+    Everything random is drawn from generators seeded in `reset`, so the same
+    (world, genomes, seed) always produces the same episode.
+    """
+
+    def __init__(self, world, num_agents=1, genomes=None, seed=0, delta=0.1, num_groups=1):
+        self.world = world
+        self.num_agents = num_agents if genomes is None else len(genomes)
+        self.genomes = genomes
+        self.delta = delta
+        self.num_groups = num_groups
+        self.reset(seed)
+
+    def random_walkable_cell(self):
+        """Picks a random walkable cell from the seeded RNG."""
+        height, width = self.world.heightmap.shape
+        for _ in range(1000):
+            x = random.randint(0, width - 1)
+            y = random.randint(0, height - 1)
+            if terrain.is_walkable(self.world.heightmap, x, y, self.world.terrain_type_map):
+                return x, y
+        return x, y  # Give up on walkability rather than loop forever.
+
+    def reset(self, seed=0):
+        """Starts a new episode: fresh agents and a fresh copy of the world's resources."""
+        seed_everything(seed)
+        self.resource_map = self.world.resource_map.copy()
+        self.steps = 0
+        self.population = Population()
+        for i in range(self.num_agents):
+            x, y = self.random_walkable_cell()
+            genome = self.genomes[i] if self.genomes is not None else None
+            self.population.add(Agent(x=x, y=y, group=i % self.num_groups, genome=genome))
+        self.agents = list(self.population.agents)  # Every agent of the episode, dead or alive.
+
+    def step(self):
+        """Advances every living agent by one fixed step."""
+        for ag in self.population:
+            self.resource_map = ag.update(
+                self.world.heightmap,
+                self.world.terrain_type_map,
+                self.resource_map,
+                self.delta
+            )
+        self.population.reap(self.steps)
+        self.steps += 1
+        return len(self.population) > 0
+
+    def run(self, steps, time_limit=None):
+        """
+        Runs up to `steps` steps, stopping early once every agent is dead.
+        Returns the number of steps each agent survived.
+        """
+        start = time.perf_counter()
+        survived = np.zeros(len(self.agents), dtype=np.int64)
+        for _ in range(steps):
+            alive = np.array([ag.is_alive() for ag in self.agents])
+            survived += alive
+            if not alive.any() or not self.step():
+                break
+            if time_limit is not None and time.perf_counter() - start > time_limit:
+                raise EpisodeTimeout(f"Episode exceeded {time_limit}s after {self.steps} steps")
+        return survived
+
+def episode_fitness(agent, survived_steps, total_steps):
+    """Fitness of one agent: food collected plus the fraction of the episode it survived."""
+    return agent.collected_resources + survived_steps / max(total_steps, 1)
+
+def run_episode(world, genome=None, steps=500, seed=0, delta=0.1, time_limit=None):
+    """Runs a single-agent headless episode and returns the agent's fitness."""
+    simulation = HeadlessSimulation(world, genomes=[genome], seed=seed, delta=delta)
+    survived = simulation.run(steps, time_limit=time_limit)
+    return episode_fitness(simulation.agents[0], survived[0], steps)
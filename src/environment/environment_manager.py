@@ -0,0 +1,235 @@
+# src/environment/environment_manager.py
+import heapq
+import inspect
+import itertools
+import math
+import time as _time
+from src.environment import resource
+import numpy as np
+from src.environment.terrain import calculate_constrained_heights, update_constrained_heights
+from src.environment.river_generation import update_water_steps, add_rivers
+from src.environment.sunlight import Sunlight
+
+class ScheduledJob:
+    """
+    A periodic job run by the Scheduler.
+
+    `interval` is in simulation seconds, or a callable returning it (read each time the job is
+    rescheduled, so config changes apply from the next run). `callback(now)` either does its
+    work and returns, or returns a generator: the run is then resumed every frame for at most
+    `budget` wall-clock seconds until the generator is exhausted.
+    """
+
+    def __init__(self, name, interval, callback, budget=None):
+        self.name = name
+        self.interval = interval
+        self.callback = callback
+        self.budget = budget
+        self.due = 0.0
+        self.runs = 0  # Completed runs.
+        self.cancelled = False
+        self._steps = None  # Generator of the run in progress, if any.
+
+    def get_interval(self):
+        return self.interval() if callable(self.interval) else self.interval
+
+    @property
+    def in_progress(self):
+        return self._steps is not None
+
+class Scheduler:
+    """
+    Runs periodic jobs in simulation time, ordered by a priority queue of due times.
+
+    `advance(dt)` moves the clock and runs what is due. Jobs that missed several runs (e.g.
+    after a long frame) run once, not in a burst. With a `frame_budget` (wall-clock seconds),
+    due jobs that don't fit in this frame wait for the next one instead of stacking up; at least
+    one job still runs each frame so nothing starves.
+    """
+
+    def __init__(self, frame_budget=None):
+        self.time = 0.0
+        self.frame_budget = frame_budget
+        self.jobs = {}
+        self._queue = []  # (due time, sequence, job)
+        self._sequence = itertools.count()
+        self._in_progress = []
+
+    def every(self, name, interval, callback, budget=None, offset=None):
+        """Schedules `callback` every `interval` seconds; first run after `offset` (default: one interval)."""
+        self.cancel(name)  # Replaces a job of the same name.
+        job = ScheduledJob(name, interval, callback, budget)
+        job.due = self.time + (job.get_interval() if offset is None else offset)
+        self.jobs[name] = job
+        heapq.heappush(self._queue, (job.due, next(self._sequence), job))
+        return job
+
+    def cancel(self, name):
+        job = self.jobs.pop(name, None)
+        if job is not None:
+            job.cancelled = True  # Dropped lazily when it reaches the front of the queue.
+            if job in self._in_progress:
+                self._in_progress.remove(job)
+
+    def _reschedule(self, job):
+        job.runs += 1
+        interval = job.get_interval()
+        job.due += interval
+        if job.due <= self.time:  # Skip missed runs but keep the job's phase.
+            job.due += interval * (math.floor((self.time - job.due) / interval) + 1)
+        heapq.heappush(self._queue, (job.due, next(self._sequence), job))
+
+    def _resume(self, job):
+        """Runs a spread-out job for up to its budget; returns True once it has finished."""
+        start = _time.perf_counter()
+        for _ in job._steps:
+            if job.budget is not None and _time.perf_counter() - start >= job.budget:
+                return False
+        job._steps = None
+        self._in_progress.remove(job)
+        self._reschedule(job)
+        return True
+
+    def advance(self, dt):
+        """Advances simulation time by `dt` seconds and runs the jobs that are due."""
+        self.time += dt
+        deadline = None if self.frame_budget is None else _time.perf_counter() + self.frame_budget
+        ran = False
+
+        for job in list(self._in_progress):
+            self._resume(job)
+            ran = True
+
+        while self._queue and self._queue[0][0] <= self.time:
+            if ran and deadline is not None and _time.perf_counter() >= deadline:
+                break  # Out of budget; the rest stays due for the next frame.
+            _, _, job = heapq.heappop(self._queue)
+            if job.cancelled:
+                continue
+            result = job.callback(self.time)
+            ran = True
+            if inspect.isgenerator(result):
+                job._steps = result
+                self._in_progress.append(job)
+                self._resume(job)
+            else:
+                self._reschedule(job)
+
+class EnvironmentManager:
+    """
+    Owns the terrain, water, resources and sunlight, and updates them on a Scheduler.
+
+    Each subsystem runs at its own interval in simulation time. The water update, by far the
+    most expensive job, is resumed row by row across frames within `water_budget` seconds per
+    frame, so it never lands on a single frame. Other periodic work (e.g. agent aging) can be
+    added with `scheduler.every`. The cells whose height or terrain type changed are collected
+    for renderers, which fetch them with `take_changed_cells` instead of diffing whole maps.
+    The cached sunlight shadows are only dropped once erosion has lowered some cell by more
+    than `shadow_tolerance` (heightmap units) since they were computed.
+    """
+
+    def __init__(self, terrain, terrain_type_map, resource_map, num_resources=25, config=None, sunlight=None,
+                 water_flow=None, water_dryness=None, water_interval=5.0, water_budget=0.002,
+                 light_interval=1.0, frame_budget=0.004, water_params=None, tile_height=None,
+                 shadow_tolerance=0.01):
+        self.terrain = terrain
+        self.terrain_type_map = terrain_type_map
+        self.resource_map = resource_map
+        self.resource_locations = []
+        self.num_resources = num_resources
+        self.config = config if config is not None else {'simulation_speed': 0.1, 'food_respawn_interval': 3000}
+        self.sunlight = sunlight if sunlight is not None else Sunlight(terrain)
+        if water_flow is None:
+            water_flow, water_dryness = add_rivers(terrain, terrain_type_map)
+        self.water_flow = water_flow
+        self.water_dryness = water_dryness
+        self.water_params = water_params or {}
+        self.light_map = self.sunlight.light_map(0.0)
+        self.tile_height = tile_height
+        self.constrained_heights = None
+        if tile_height is not None:
+            self.constrained_heights = calculate_constrained_heights(terrain, tile_height)
+        self._eroded = np.zeros(terrain.shape, dtype=bool)
+        self._retyped = np.zeros(terrain.shape, dtype=bool)
+        self._changed = np.zeros(terrain.shape, dtype=bool)  # Since the last take_changed_cells.
+        self._has_changes = False
+        self._frame_dt = 0.0
+        self.shadow_tolerance = shadow_tolerance
+        self._shadow_heights = np.array(terrain, copy=True)  # Heights the cached shadows were computed for.
+
+        self.scheduler = Scheduler(frame_budget)
+        self.scheduler.every("water", water_interval, self._update_water, budget=water_budget)
+        self.scheduler.every("food_respawn", self._food_respawn_interval, self._respawn_food)
+        self.scheduler.every("sunlight", light_interval, self._update_light)
+
+    @property
+    def time(self):
+        return self.scheduler.time
+
+    def _food_respawn_interval(self):
+        # food_respawn_interval is in milliseconds at simulation speed 1.
+        return self.config['food_respawn_interval'] / self.config['simulation_speed'] / 1000.0
+
+    def _update_water(self, now):
+        # Water has always been stepped with the current frame's dt, not the time since the last update.
+        yield from update_water_steps(
+            self.terrain, self.terrain_type_map, self.water_flow, self.water_dryness, self._frame_dt,
+            eroded=self._eroded, retyped=self._retyped, **self.water_params
+        )
+        if self._eroded.any():
+            drift = np.abs(self.terrain[self._eroded] - self._shadow_heights[self._eroded]).max()
+            if drift > self.shadow_tolerance:  # Erosion now visibly moves the shadows.
+                self.sunlight.invalidate()
+                self._shadow_heights[...] = self.terrain
+            if self.constrained_heights is not None:
+                ys, xs = update_constrained_heights(self.constrained_heights, self.terrain, self.tile_height, self._eroded)
+                self._changed[ys, xs] = True
+            self._changed |= self._eroded
+            self._has_changes = True
+            self._eroded[:] = False
+        if self._retyped.any():
+            self._changed |= self._retyped
+            self._has_changes = True
+            self._retyped[:] = False
+
+    def _respawn_food(self, now):
+        self.resource_map, self.resource_locations = resource.respawn_resources(
+            self.terrain, self.terrain_type_map, self.num_resources
+        )
+
+    def _update_light(self, now):
+        self.light_map = self.sunlight.light_map(now)
+
+    def update_environment(self, dt):
+        """Advances the environment by `dt` simulation seconds."""
+        self._frame_dt = dt
+        self.scheduler.advance(dt)
+
+    def take_changed_cells(self):
+        """
+        Returns the (ys, xs) of the cells whose height, constrained height or terrain type
+        changed since the last call, and forgets them.
+        """
+        if not self._has_changes:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        ys, xs = np.nonzero(self._changed)
+        self._changed[:] = False
+        self._has_changes = False
+        return ys, xs
+
+    def get_environment_state(self):
+        """Returns the current terrain, water, resource and light arrays."""
+        return {
+            "time": self.time,
+            "terrain": self.terrain,
+            "terrain_type_map": self.terrain_type_map,
+            "resource_map": self.resource_map,
+            "water_flow": self.water_flow,
+            "light_map": self.light_map,
+            "constrained_heights": self.constrained_heights,
+            "sunlight_intensity": self.sunlight.intensity(self.time),
+        }
+
+    def is_within_bounds(self, x, y):
+        height, width = self.terrain.shape
+        return 0 <= x < width and 0 <= y < height
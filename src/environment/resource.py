@@ -42,14 +42,17 @@ def deplete_resource(resource_map, x, y, amount=1):
         resource_map[y, x] = max(0, resource_map[y, x] - amount)  # Ensure resource doesn't go negative
     return resource_map
 
-def regenerate_resource(resource_map, terrain, terrain_type_map, x, y, rate=0.1):
-    """Regenerates a resource at a given (x, y) coordinate (influenced by sunlight and terrain type)."""
+def regenerate_resource(resource_map, terrain, terrain_type_map, x, y, rate=0.1, light_map=None):
+    """
+    Regenerates a resource at a given (x, y) coordinate (influenced by sunlight and terrain type).
+
+    light_map is the per-cell light factor from Sunlight.light_map; full sunlight if None.
+    """
     if 0 <= x < resource_map.shape[1] and 0 <= y < resource_map.shape[0]:
         terrain_type = get_terrain_type(terrain_type_map, x, y)
         regeneration_rate = RESOURCE_GROWTH_RATES.get(terrain_type, 0.1)  # Default rate if terrain type not found
 
-        # Placeholder for sunlight influence - replace with actual calculation later
-        sunlight_factor = 1.0  # Replace with sunlight calculation
+        sunlight_factor = 1.0 if light_map is None else light_map[y, x]
 
         resource_map[y, x] = min(1, resource_map[y, x] + regeneration_rate * sunlight_factor)  # Resource cap at 1
 
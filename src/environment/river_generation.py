@@ -4,10 +4,21 @@ import numpy as np
 from .terrain import TERRAIN_WATER, TERRAIN_GRASS
 import math
 
-def update_water(terrain, terrain_type_map, water_flow, water_dryness, dt, dryness_threshold=5.0, erosion_rate=0.0005, diffusion_rate=0.1, momentum=0.5):
+def update_water(terrain, terrain_type_map, water_flow, water_dryness, dt, dryness_threshold=5.0, erosion_rate=0.0005, diffusion_rate=0.1, momentum=0.5, eroded=None, retyped=None):
     """
     Updates water flow, dryness, and erodes terrain under water cells.
     Includes water flow diffusion and momentum.
+    If given, the boolean array `eroded` is set to True where the terrain was lowered, and
+    `retyped` where water dried up and the cell's terrain type changed.
+    """
+    for _ in update_water_steps(terrain, terrain_type_map, water_flow, water_dryness, dt, dryness_threshold,
+                                erosion_rate, diffusion_rate, momentum, eroded, retyped):
+        pass
+
+def update_water_steps(terrain, terrain_type_map, water_flow, water_dryness, dt, dryness_threshold=5.0, erosion_rate=0.0005, diffusion_rate=0.1, momentum=0.5, eroded=None, retyped=None):
+    """
+    Same as update_water, but as a generator that yields after every row of each pass,
+    so a scheduler can spread one update across several frames.
     """
     h, w = terrain.shape
 
@@ -47,6 +58,7 @@ def update_water(terrain, terrain_type_map, water_flow, water_dryness, dt, dryne
                     new_flow[y, x] = (0, 0)  # No descent possible.
             else:
                 new_flow[y, x] = (0, 0)  # Non-water cells have no flow.
+        yield
 
     # 2. Diffusion:  Blend the flow vectors with neighbors to simulate diffusion.
     diffused_flow = np.zeros_like(water_flow)
@@ -63,6 +75,7 @@ def update_water(terrain, terrain_type_map, water_flow, water_dryness, dt, dryne
             if count > 0:
                 average_flow = total_flow / count
                 diffused_flow[y, x] = (1 - diffusion_rate) * new_flow[y, x] + diffusion_rate * average_flow
+        yield
 
     # 3. Apply Momentum: Combine new flow with the previous flow.
     for y in range(h):
@@ -72,6 +85,7 @@ def update_water(terrain, terrain_type_map, water_flow, water_dryness, dt, dryne
                                      momentum * water_flow[y, x][1] + (1 - momentum) * diffused_flow[y, x][1])
             else:
                 water_flow[y, x] = (0, 0)
+        yield
     # 4. Update dryness and erosion:
     for y in range(h):
         for x in range(w):
@@ -92,15 +106,20 @@ def update_water(terrain, terrain_type_map, water_flow, water_dryness, dt, dryne
                         terrain_type_map[y, x] = TERRAIN_GRASS
                         water_flow[y, x] = (0, 0)
                         water_dryness[y, x] = 0
+                        if retyped is not None:
+                            retyped[y, x] = True
                         continue
                 else:
                     water_dryness[y, x] = 0
 
                 # Erode the terrain slightly under water.
                 terrain[y, x] = max(0.0, terrain[y, x] - erosion_rate * dt)
+                if eroded is not None:
+                    eroded[y, x] = True
             else:
                 water_flow[y, x] = (0, 0)
                 water_dryness[y, x] = 0
+        yield
 
 def carve_river(heightmap, terrain_type_map, start, river_smooth_radius, branch_probability=0.2, min_length=10, visited=None):
     """
@@ -0,0 +1,138 @@
+# src/environment/sunlight.py
+import math
+from collections import OrderedDict
+import numpy as np
+
+DAY_LENGTH = 240.0  # Simulation seconds per day.
+MAX_ELEVATION = math.radians(70)  # Sun elevation at noon.
+AMBIENT_LIGHT = 0.2  # Light factor of shadowed cells and of the night.
+HEIGHT_SCALE = 10.0  # Heightmap units -> cell widths, for shadow lengths.
+
+def get_sunlight_angle(time, day_length=DAY_LENGTH):
+    """
+    Returns the sun's (azimuth, elevation) in radians at a simulation time.
+
+    The day starts at sunrise: the sun rises in the east (+x, azimuth 0), passes over the south
+    (+y) at noon and sets in the west. Elevation is negative during the night.
+    """
+    phase = (time % day_length) / day_length  # 0 = sunrise, 0.5 = sunset.
+    azimuth = 2 * math.pi * min(phase, 0.5)
+    elevation = MAX_ELEVATION * math.sin(2 * math.pi * phase)
+    return azimuth, elevation
+
+def calculate_sunlight_intensity(time, day_length=DAY_LENGTH):
+    """Returns the unshadowed sunlight intensity (0 at night, 1 with the sun overhead)."""
+    _, elevation = get_sunlight_angle(time, day_length)
+    return max(0.0, math.sin(elevation))
+
+def apply_shadow(terrain, azimuth, elevation, height_scale=HEIGHT_SCALE):
+    """
+    Returns a boolean (height, width) mask of the cells the terrain shadows from the sun.
+
+    A horizon sweep moves across the map one column (or row) at a time, against the light,
+    carrying the height of the highest shadow line reaching each cell: it is the larger of the
+    upstream cell's terrain and its horizon, lowered by tan(elevation) per cell travelled.
+    Each step is one vectorized interpolation over a whole column, so the cost is O(width * height).
+    """
+    if elevation <= 0:
+        return np.ones(terrain.shape, dtype=bool)
+    heights = np.asarray(terrain, dtype=np.float64) * height_scale
+    dx, dy = math.cos(azimuth), math.sin(azimuth)  # Direction towards the sun.
+    transposed = abs(dy) > abs(dx)
+    if transposed:  # Sweep along the dominant axis of the sun direction.
+        heights = heights.T
+        dx, dy = dy, dx
+    if dx < 0:  # Sweep towards -x; the sun is on the low side.
+        heights = heights[:, ::-1]
+    slope = dy / abs(dx)  # Row offset per column moved towards the sun.
+    drop = math.hypot(1.0, slope) * math.tan(elevation)
+
+    rows, columns = heights.shape
+    row_index = np.arange(rows, dtype=np.float64)
+    horizon = np.full(heights.shape, -np.inf)
+    # The last column faces the sun directly; sweep back from it.
+    for x in range(columns - 2, -1, -1):
+        upstream = np.maximum(heights[:, x + 1], horizon[:, x + 1])
+        shifted = np.interp(row_index + slope, row_index, upstream, left=-np.inf, right=-np.inf)
+        horizon[:, x] = shifted - drop
+
+    shadow = horizon > heights
+    if dx < 0:
+        shadow = shadow[:, ::-1]
+    return shadow.T if transposed else shadow
+
+class Sunlight:
+    """
+    Day/night cycle and terrain shadows for one heightmap.
+
+    Shadow masks depend only on the sun's angle, so the angle is quantized into
+    `azimuth_buckets` x `elevation_buckets` buckets and each bucket's mask is computed once and
+    kept in an LRU cache of `max_masks` entries. Looking up the per-cell light factor for any
+    time of day is then a cache hit and one `np.where`. Call `invalidate()` when the terrain changes.
+    """
+
+    def __init__(self, terrain, day_length=DAY_LENGTH, azimuth_buckets=64, elevation_buckets=16,
+                 max_masks=128, height_scale=HEIGHT_SCALE):
+        self.terrain = terrain
+        self.day_length = day_length
+        self.azimuth_buckets = azimuth_buckets
+        self.elevation_buckets = elevation_buckets
+        self.max_masks = max_masks
+        self.height_scale = height_scale
+        self._masks = OrderedDict()  # (azimuth bucket, elevation bucket) -> shadow mask
+        self.hits = 0
+        self.misses = 0
+
+    def angle(self, time):
+        return get_sunlight_angle(time, self.day_length)
+
+    def intensity(self, time):
+        return calculate_sunlight_intensity(time, self.day_length)
+
+    def _bucket(self, azimuth, elevation):
+        a = int(round(azimuth / (2 * math.pi) * self.azimuth_buckets)) % self.azimuth_buckets
+        e = min(int(elevation / MAX_ELEVATION * self.elevation_buckets), self.elevation_buckets - 1)
+        return a, e
+
+    def shadow_mask(self, time):
+        """Returns the (cached) shadow mask at a simulation time; all True at night."""
+        azimuth, elevation = self.angle(time)
+        if elevation <= 0:
+            return np.ones(self.terrain.shape, dtype=bool)
+        key = self._bucket(azimuth, elevation)
+        mask = self._masks.get(key)
+        if mask is not None:
+            self._masks.move_to_end(key)
+            self.hits += 1
+            return mask
+        self.misses += 1
+        a, e = key
+        # Use the bucket's centre elevation so every time in the bucket shares one mask.
+        mask = apply_shadow(
+            self.terrain,
+            a * 2 * math.pi / self.azimuth_buckets,
+            (e + 0.5) * MAX_ELEVATION / self.elevation_buckets,
+            self.height_scale,
+        )
+        mask.setflags(write=False)
+        self._masks[key] = mask
+        if len(self._masks) > self.max_masks:
+            self._masks.popitem(last=False)
+        return mask
+
+    def light_map(self, time):
+        """Returns the per-cell light factor (float32, AMBIENT_LIGHT..1) at a simulation time."""
+        lit = AMBIENT_LIGHT + (1.0 - AMBIENT_LIGHT) * self.intensity(time)
+        return np.where(self.shadow_mask(time), AMBIENT_LIGHT, lit).astype(np.float32)
+
+    def light_factor(self, time, x, y):
+        """Returns the light factor of one cell."""
+        if self.shadow_mask(time)[y, x]:
+            return AMBIENT_LIGHT
+        return AMBIENT_LIGHT + (1.0 - AMBIENT_LIGHT) * self.intensity(time)
+
+    def invalidate(self, terrain=None):
+        """Drops every cached mask, e.g. after erosion changed the heightmap."""
+        if terrain is not None:
+            self.terrain = terrain
+        self._masks.clear()
@@ -260,3 +260,53 @@ def is_walkable(heightmap, x, y, terrain_type_map, max_slope=0.3):
     elif terrain_type == TERRAIN_STONE:
         max_slope *= 0.8
     return slope <= max_slope
+
+# ------------------------------------------------------------------
+# Constrained (rendered) heights
+# ------------------------------------------------------------------
+NEIGHBOR_OFFSETS = [(-1, 0), (1, 0), (0, -1), (0, 1)]  # Clamping order: left, right, up, down.
+
+def height_scale_factor(width):
+    """Scale of the neighbour heights for a map width (assuming a square map):
+    factor = (1/300)*width^2 + (67/15)*width + 20."""
+    return (width**2) / 300.0 + (67.0 / 15.0) * width + 20.0
+
+def calculate_constrained_heights(heightmap, tile_height):
+    """
+    Calculates and returns a 2D array of constrained tile heights.
+
+    Each tile's height is clamped, neighbour by neighbour, to within `tile_height` of its scaled
+    neighbours' heights. Each clamp is one np.clip against a shifted copy of the map, with
+    unbounded limits where the neighbour is off the map.
+    """
+    height, width = heightmap.shape
+    scaled = np.pad(heightmap * height_scale_factor(width), 1, constant_values=np.nan)
+    constrained = np.array(heightmap, dtype=np.float64)
+    for dx, dy in NEIGHBOR_OFFSETS:
+        neighbor = scaled[1 + dy:1 + dy + height, 1 + dx:1 + dx + width]
+        lower = np.where(np.isnan(neighbor), -np.inf, neighbor - tile_height)
+        upper = np.where(np.isnan(neighbor), np.inf, neighbor + tile_height)
+        constrained = np.clip(constrained, lower, upper)
+    return constrained.astype(np.float32)
+
+def update_constrained_heights(constrained_heights, heightmap, tile_height, dirty):
+    """
+    Recomputes, in place, the constrained heights affected by the heightmap cells in the boolean
+    `dirty` mask: those cells and their four neighbours. Returns the (ys, xs) recomputed.
+    """
+    height, width = heightmap.shape
+    affected = dirty.copy()
+    affected[1:, :] |= dirty[:-1, :]
+    affected[:-1, :] |= dirty[1:, :]
+    affected[:, 1:] |= dirty[:, :-1]
+    affected[:, :-1] |= dirty[:, 1:]
+    ys, xs = np.nonzero(affected)
+    scale_factor = height_scale_factor(width)
+    constrained = heightmap[ys, xs].astype(np.float64)
+    for dx, dy in NEIGHBOR_OFFSETS:
+        nx, ny = xs + dx, ys + dy
+        inside = (0 <= nx) & (nx < width) & (0 <= ny) & (ny < height)
+        neighbor = heightmap[np.clip(ny, 0, height - 1), np.clip(nx, 0, width - 1)] * scale_factor
+        constrained = np.where(inside, np.clip(constrained, neighbor - tile_height, neighbor + tile_height), constrained)
+    constrained_heights[ys, xs] = constrained
+    return ys, xs
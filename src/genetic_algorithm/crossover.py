@@ -0,0 +1,47 @@
+# src/genetic_algorithm/crossover.py
+import numpy as np
+
+def uniform_crossover(genes, parents_a, parents_b, rng=None):
+    """
+    Builds one child per parent pair, taking each gene from either parent with equal probability.
+
+    Args:
+        genes (np.ndarray): (agents x genes) matrix of the parent generation.
+        parents_a, parents_b (np.ndarray): Row indices of the two parents of each child.
+
+    Returns:
+        np.ndarray: (children x genes) matrix.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    parents_a = np.asarray(parents_a)
+    parents_b = np.asarray(parents_b)
+    from_b = rng.random((len(parents_a), genes.shape[1])) < 0.5
+    return np.where(from_b, genes[parents_b], genes[parents_a])
+
+def k_point_crossover(genes, parents_a, parents_b, k=1, rng=None):
+    """
+    Builds one child per parent pair by cutting the gene sequence at k random points
+    and alternating between the parents at every cut.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    parents_a = np.asarray(parents_a)
+    parents_b = np.asarray(parents_b)
+    num_children, num_genes = len(parents_a), genes.shape[1]
+    k = min(k, num_genes - 1)
+    if k <= 0:
+        return genes[parents_a].copy()
+
+    # k distinct cut points in 1..num_genes-1 per child.
+    cuts = rng.random((num_children, num_genes - 1)).argsort(axis=1)[:, :k] + 1
+    # A gene comes from parent b when an odd number of cuts lie at or before it.
+    cuts_before = (np.arange(num_genes)[None, None, :] >= cuts[:, :, None]).sum(axis=1)
+    from_b = cuts_before % 2 == 1
+    return np.where(from_b, genes[parents_b], genes[parents_a])
+
+def single_point_crossover(genes, parents_a, parents_b, rng=None):
+    """Performs single-point crossover for every parent pair."""
+    return k_point_crossover(genes, parents_a, parents_b, k=1, rng=rng)
+
+def two_point_crossover(genes, parents_a, parents_b, rng=None):
+    """Performs two-point crossover for every parent pair."""
+    return k_point_crossover(genes, parents_a, parents_b, k=2, rng=rng)
@@ -0,0 +1,148 @@
+# src/genetic_algorithm/evaluation.py
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+import numpy as np
+from src.agent.genome import GenomePopulation
+from src.agent_simulation import World, run_episode, EpisodeTimeout
+from src.utils.shared_memory import SharedArrays
+
+# Set in each worker process by _init_worker; the world is attached once, not shipped per task.
+_worker_world = None
+_worker_arrays = None
+
+def episode_seed(base_seed, index):
+    """Seed for the episode of the genome at `index`; the same in serial and parallel runs."""
+    return int(np.random.SeedSequence([base_seed, index]).generate_state(1)[0])
+
+def _init_worker(world_spec):
+    """Attaches the worker to the shared, read-only world."""
+    global _worker_world, _worker_arrays
+    _worker_arrays = SharedArrays.attach(world_spec)
+    _worker_world = World.from_arrays(_worker_arrays.arrays)
+
+def evaluate_genomes(world, genes, schema, start_index, steps, base_seed, delta, time_limit, timeout_fitness):
+    """
+    Runs one episode per genome row and returns their fitness values.
+    A genome whose episode runs past `time_limit` seconds scores `timeout_fitness`.
+    """
+    population = GenomePopulation(genes, schema)
+    fitness = np.empty(len(population), dtype=np.float64)
+    for i in range(len(population)):
+        seed = episode_seed(base_seed, start_index + i)
+        try:
+            fitness[i] = run_episode(world, population[i], steps=steps, seed=seed, delta=delta, time_limit=time_limit)
+        except EpisodeTimeout:
+            fitness[i] = timeout_fitness
+    return fitness
+
+def _evaluate_chunk(genes, schema, start_index, steps, base_seed, delta, time_limit, timeout_fitness):
+    return evaluate_genomes(_worker_world, genes, schema, start_index, steps, base_seed, delta, time_limit, timeout_fitness)
+
+class FitnessEvaluator:
+    """
+    Evaluates a GenomePopulation by running one fixed-length headless episode per genome
+    across a pool of worker processes.
+
+    The world is placed in shared memory once and attached read-only by every worker.
+    Genomes are shipped in chunks of rows, and each episode is seeded from (seed, genome index),
+    so results match `evaluate_serial` exactly regardless of worker count or chunking.
+    A chunk that doesn't finish in time (a wedged worker) scores `timeout_fitness`, and the
+    pool is replaced so the next evaluation doesn't wait on the stuck worker.
+    """
+
+    def __init__(self, world, steps=500, seed=0, delta=0.1, max_workers=None, chunk_size=None,
+                 timeout=None, timeout_fitness=float("nan")):
+        """
+        Args:
+            world (World): The environment every episode runs on.
+            steps (int): Steps per episode.
+            seed (int): Base seed; episode seeds are derived from it and the genome index.
+            max_workers (int, optional): Worker processes (defaults to the CPU count).
+            chunk_size (int, optional): Genomes per task (defaults to ~4 tasks per worker).
+            timeout (float, optional): Wall-clock seconds allowed per episode.
+            timeout_fitness (float): Fitness given to genomes whose episode timed out.
+        """
+        self.world = world
+        self.steps = steps
+        self.seed = seed
+        self.delta = delta
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.timeout_fitness = timeout_fitness
+        self._shared_world = None
+        self._executor = None
+
+    def _start(self):
+        if self._shared_world is None:
+            self._shared_world = SharedArrays(self.world.arrays())
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(self._shared_world.spec,)
+            )
+
+    def _recycle(self):
+        """
+        Drops the pool after a chunk timed out; the next evaluation starts a fresh one.
+
+        A running chunk can't be cancelled, so the pool's workers are terminated where the
+        executor supports it (Python 3.14+). Otherwise the pool is shut down without waiting
+        and its stuck worker exits once its episodes hit their time limit.
+        """
+        executor, self._executor = self._executor, None
+        terminate = getattr(executor, "terminate_workers", None)
+        if terminate is not None:
+            terminate()
+        else:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _chunks(self, size):
+        chunk_size = self.chunk_size or max(1, math.ceil(size / (self.max_workers * 4)))
+        return [(start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)]
+
+    def evaluate_serial(self, population):
+        """Evaluates every genome in this process (the reference result)."""
+        return evaluate_genomes(self.world, population.genes, population.schema, 0, self.steps,
+                                self.seed, self.delta, self.timeout, self.timeout_fitness)
+
+    def evaluate(self, population):
+        """Evaluates every genome in the worker pool and returns a fitness vector."""
+        self._start()
+        fitness = np.full(len(population), self.timeout_fitness, dtype=np.float64)
+        futures = []
+        for start, end in self._chunks(len(population)):
+            future = self._executor.submit(
+                _evaluate_chunk, population.genes[start:end], population.schema, start,
+                self.steps, self.seed, self.delta, self.timeout, self.timeout_fitness
+            )
+            futures.append((start, end, future))
+
+        timed_out = False
+        for start, end, future in futures:
+            # Episodes enforce their own time limit; this only guards against a wedged worker.
+            wait = None if self.timeout is None else self.timeout * (end - start) * 2 + 5
+            try:
+                fitness[start:end] = future.result(timeout=wait)
+            except FutureTimeoutError:
+                timed_out = True  # Keeps the default timeout_fitness for this chunk.
+        if timed_out:
+            self._recycle()
+        return fitness
+
+    def close(self):
+        """Shuts down the workers and frees the shared world."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        if self._shared_world is not None:
+            self._shared_world.close()
+            self._shared_world = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,48 @@
+# src/genetic_algorithm/genetic_algorithm.py
+import numpy as np
+from src.agent.genome import GenomePopulation
+from src.genetic_algorithm import selection, crossover, mutation
+
+SELECTION_METHODS = {
+    "tournament": selection.tournament_selection,
+    "roulette": selection.roulette_wheel_selection,
+    "rank": selection.rank_selection,
+}
+
+def evolve(population, fitness, mutation_rate=0.05, sigma=0.1, num_elites=1,
+           selection_method="tournament", crossover_points=None, rng=None):
+    """
+    Performs one generation of the genetic algorithm on a whole GenomePopulation.
+
+    Args:
+        population (GenomePopulation): The current generation.
+        fitness (array-like): One fitness value per individual (higher is better).
+        mutation_rate (float): Probability that any single gene mutates.
+        sigma (float): Mutation strength, as a fraction of each gene's range.
+        num_elites (int): Fittest individuals copied unchanged into the next generation.
+        selection_method (str): "tournament", "roulette" or "rank".
+        crossover_points (int, optional): k for k-point crossover; None for uniform crossover.
+
+    Returns:
+        GenomePopulation: The next generation, the same size as `population`.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    fitness = np.asarray(fitness)
+    size = len(population)
+    num_elites = min(num_elites, size)
+    num_children = size - num_elites
+
+    select = SELECTION_METHODS[selection_method]
+    parents_a = select(fitness, num_children, rng=rng)
+    parents_b = select(fitness, num_children, rng=rng)
+    if crossover_points is None:
+        children = crossover.uniform_crossover(population.genes, parents_a, parents_b, rng=rng)
+    else:
+        children = crossover.k_point_crossover(population.genes, parents_a, parents_b, crossover_points, rng=rng)
+
+    offspring = GenomePopulation(children, population.schema)
+    mutation.mutate_population(offspring, mutation_rate, sigma=sigma, rng=rng)
+
+    elites = np.argpartition(-fitness, num_elites - 1)[:num_elites] if num_elites else np.empty(0, dtype=int)
+    genes = np.concatenate((population.genes[elites], offspring.genes))
+    return GenomePopulation(genes, population.schema)
@@ -0,0 +1,164 @@
+# src/genetic_algorithm/island_model.py
+import multiprocessing as mp
+import numpy as np
+from src.agent.genome import GenomePopulation, GeneSchema
+from src.agent_simulation import World
+from src.genetic_algorithm.genetic_algorithm import evolve
+from src.genetic_algorithm.evaluation import evaluate_genomes
+from src.utils.shared_memory import SharedArrays
+
+TOPOLOGIES = ("ring", "random")
+
+# Columns of the per-island statistics array.
+STAT_BEST, STAT_MEAN, STAT_STD = 0, 1, 2
+
+def migration_sources(num_islands, topology, seed, epoch):
+    """
+    Returns, for each island, the island it receives migrants from at a migration epoch.
+    Every island computes the same answer, so no coordination is needed beyond the barrier.
+    """
+    if topology == "ring":
+        return [(i - 1) % num_islands for i in range(num_islands)]
+    # Random topology: a fresh random cycle through all islands each epoch, so no island
+    # receives its own migrants (unless it is the only one).
+    rng = np.random.default_rng([seed, epoch])
+    order = rng.permutation(num_islands)
+    sources = [0] * num_islands
+    for position, island in enumerate(order):
+        sources[island] = int(order[(position - 1) % num_islands])
+    return sources
+
+def _island_worker(island, params, spec, barrier):
+    """Evolves one island; exchanges migrants through the shared mailbox every `migration_interval` generations."""
+    shared = SharedArrays.attach(spec)
+    try:
+        _run_island(island, params, shared, barrier)
+    except BaseException:
+        barrier.abort()  # Release the other islands instead of leaving them waiting on us.
+        raise
+    finally:
+        shared.close()
+
+def _run_island(island, params, shared, barrier):
+    schema = params["schema"]
+    rng = np.random.default_rng([params["seed"], island])
+    world = World.generate(*params["world_size"], params["num_resources"], seed=params["seed"] + island)
+    population = GenomePopulation.random(params["island_size"], schema, rng=rng)
+    num_migrants = params["num_migrants"]
+    mailbox = shared["mailbox"]
+    mailbox_fitness = shared["mailbox_fitness"]
+    stats = shared["stats"]
+
+    for generation in range(params["generations"]):
+        episode_seed_base = params["seed"] * 1_000_003 + island * 10_007 + generation
+        fitness = evaluate_genomes(world, population.genes, schema, 0, params["steps"],
+                                   episode_seed_base, params["delta"], None, float("nan"))
+        stats[island, generation] = (np.nanmax(fitness), np.nanmean(fitness), np.nanstd(fitness))
+
+        if num_migrants and (generation + 1) % params["migration_interval"] == 0:
+            epoch = (generation + 1) // params["migration_interval"]
+            # Post our best genomes, wait for everyone, then take the source island's.
+            best = np.argsort(fitness)[::-1][:num_migrants]
+            mailbox[island] = population.genes[best]
+            mailbox_fitness[island] = fitness[best]
+            barrier.wait(timeout=params["barrier_timeout"])
+            source = migration_sources(params["num_islands"], params["topology"], params["seed"], epoch)[island]
+            worst = np.argsort(fitness)[:num_migrants]
+            population.genes[worst] = mailbox[source]
+            fitness[worst] = mailbox_fitness[source]
+            barrier.wait(timeout=params["barrier_timeout"])  # Nobody overwrites a mailbox still being read.
+
+        if generation + 1 < params["generations"]:
+            population = evolve(population, fitness, mutation_rate=params["mutation_rate"],
+                                num_elites=params["num_elites"], rng=rng)
+
+    shared["final_genes"][island] = population.genes
+    shared["final_fitness"][island] = fitness
+
+class IslandModel:
+    """
+    Island-model genetic algorithm: one worker process per island, each evolving its own
+    subpopulation against its own headless world. Every `migration_interval` generations
+    the top `num_migrants` genomes of each island replace the worst of its neighbor,
+    along a ring or a random topology. Migrants and statistics travel through shared memory.
+    """
+
+    def __init__(self, num_islands=4, island_size=50, generations=20, migration_interval=5,
+                 num_migrants=2, topology="ring", steps=300, world_size=(30, 30), num_resources=25,
+                 mutation_rate=0.05, num_elites=1, delta=0.1, seed=0, schema=None, barrier_timeout=600):
+        if topology not in TOPOLOGIES:
+            raise ValueError(f"Unknown topology: {topology}. Expected one of {TOPOLOGIES}")
+        self.schema = schema if schema is not None else GeneSchema()
+        self.num_islands = num_islands
+        self.params = {
+            "schema": self.schema,
+            "num_islands": num_islands,
+            "island_size": island_size,
+            "generations": generations,
+            "migration_interval": max(1, migration_interval),
+            "num_migrants": min(num_migrants, island_size),
+            "topology": topology,
+            "steps": steps,
+            "world_size": world_size,
+            "num_resources": num_resources,
+            "mutation_rate": mutation_rate,
+            "num_elites": num_elites,
+            "delta": delta,
+            "seed": seed,
+            "barrier_timeout": barrier_timeout,
+        }
+
+    def run(self):
+        """
+        Runs every island to completion.
+
+        Returns:
+            dict: "stats" (islands x generations x [best, mean, std]), "populations"
+            (one GenomePopulation per island), "fitness" (islands x island_size),
+            plus "best_genes"/"best_fitness" of the overall fittest genome.
+        """
+        p = self.params
+        num_genes = len(self.schema)
+        shared = SharedArrays.allocate({
+            "mailbox": ((self.num_islands, p["num_migrants"], num_genes), np.float32),
+            "mailbox_fitness": ((self.num_islands, p["num_migrants"]), np.float64),
+            "stats": ((self.num_islands, p["generations"], 3), np.float64),
+            "final_genes": ((self.num_islands, p["island_size"], num_genes), np.float32),
+            "final_fitness": ((self.num_islands, p["island_size"]), np.float64),
+        })
+        try:
+            barrier = mp.Barrier(self.num_islands)
+            workers = [
+                mp.Process(target=_island_worker, args=(island, p, shared.spec, barrier), daemon=True)
+                for island in range(self.num_islands)
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            failed = [island for island, worker in enumerate(workers) if worker.exitcode != 0]
+            if failed:
+                raise RuntimeError(f"Island worker(s) {failed} failed")
+
+            stats = shared["stats"].copy()
+            final_genes = shared["final_genes"].copy()
+            final_fitness = shared["final_fitness"].copy()
+        finally:
+            shared.close()
+
+        best_island, best_index = np.unravel_index(np.nanargmax(final_fitness), final_fitness.shape)
+        return {
+            "stats": stats,
+            "populations": [GenomePopulation(genes, self.schema) for genes in final_genes],
+            "fitness": final_fitness,
+            "best_genes": final_genes[best_island, best_index],
+            "best_fitness": float(final_fitness[best_island, best_index]),
+        }
+
+def summarize_stats(stats):
+    """Aggregates per-island statistics into per-generation best/mean across all islands."""
+    return {
+        "best": stats[:, :, STAT_BEST].max(axis=0),
+        "mean": stats[:, :, STAT_MEAN].mean(axis=0),
+        "island_best": stats[:, -1, STAT_BEST],
+    }
@@ -0,0 +1,46 @@
+# src/genetic_algorithm/mutation.py
+import numpy as np
+
+def mutation_mask(shape, mutation_rate, rng):
+    """Returns a boolean mask selecting each gene independently with probability mutation_rate."""
+    return rng.random(shape) < mutation_rate
+
+def gaussian_mutation(genes, mutation_rate, sigma=0.1, low=None, high=None, rng=None):
+    """
+    Adds Gaussian noise to randomly selected genes of a whole population, in place.
+
+    Args:
+        genes (np.ndarray): (agents x genes) matrix.
+        mutation_rate (float): Probability that any single gene mutates.
+        sigma (float or array): Standard deviation of the noise (per gene if an array).
+        low, high (array, optional): Bounds to clip mutated genes to.
+
+    Returns:
+        np.ndarray: The boolean mask of genes that were mutated.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    mask = mutation_mask(genes.shape, mutation_rate, rng)
+    noise = rng.standard_normal(genes.shape, dtype=np.float32) * np.asarray(sigma, dtype=np.float32)
+    genes += noise * mask
+    if low is not None or high is not None:
+        np.clip(genes, low, high, out=genes)
+    return mask
+
+def uniform_mutation(genes, mutation_rate, low, high, rng=None):
+    """
+    Replaces randomly selected genes with a fresh uniform value within [low, high], in place.
+    Returns the boolean mask of genes that were mutated.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    mask = mutation_mask(genes.shape, mutation_rate, rng)
+    fresh = rng.uniform(low, high, genes.shape).astype(genes.dtype)
+    np.copyto(genes, fresh, where=mask)
+    return mask
+
+def mutate_population(population, mutation_rate, sigma=0.1, rng=None):
+    """Applies Gaussian mutation to a GenomePopulation, scaled to and clipped within each gene's bounds."""
+    schema = population.schema
+    return gaussian_mutation(
+        population.genes, mutation_rate, sigma=sigma * (schema.high - schema.low),
+        low=schema.low, high=schema.high, rng=rng
+    )
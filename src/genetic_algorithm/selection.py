@@ -0,0 +1,34 @@
+# src/genetic_algorithm/selection.py
+import numpy as np
+
+def tournament_selection(fitness, num_selected, tournament_size=3, rng=None):
+    """
+    Runs `num_selected` tournaments at once; each picks `tournament_size` random
+    individuals and keeps the fittest. Returns the winners' indices.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    fitness = np.asarray(fitness)
+    contenders = rng.integers(0, len(fitness), (num_selected, tournament_size))
+    winners = np.argmax(fitness[contenders], axis=1)
+    return contenders[np.arange(num_selected), winners]
+
+def roulette_wheel_selection(fitness, num_selected, rng=None):
+    """
+    Selects indices with probability proportional to fitness.
+    Fitness is shifted to be non-negative first; if every weight is zero, selection is uniform.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    weights = np.asarray(fitness, dtype=np.float64)
+    weights = weights - min(weights.min(), 0.0)
+    cumulative = np.cumsum(weights)
+    total = cumulative[-1]
+    if total <= 0:
+        return rng.integers(0, len(weights), num_selected)
+    picks = rng.random(num_selected) * total
+    return np.minimum(np.searchsorted(cumulative, picks, side='right'), len(weights) - 1)
+
+def rank_selection(fitness, num_selected, rng=None):
+    """Selects indices with probability proportional to fitness rank (worst = 1)."""
+    ranks = np.empty(len(fitness), dtype=np.float64)
+    ranks[np.argsort(fitness, kind='stable')] = np.arange(1, len(fitness) + 1)
+    return roulette_wheel_selection(ranks, num_selected, rng=rng)
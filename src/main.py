@@ -5,49 +5,36 @@ import os
 # Add the project root to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+# --headless renders without a window, through SDL's dummy video driver (e.g. to record on a
+# server). It has to be chosen before primer_vis starts pygame, hence before the imports.
+if "--headless" in sys.argv:
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+
+import argparse
+
 import numpy as np
 import pygame
 import random
 
 from environment import terrain, resource
+from environment.terrain import calculate_constrained_heights  # Also used by primer_vis.
+from environment.environment_manager import EnvironmentManager
 from agent import agent
+from agent.population import Population
+from utils.timestep import FixedTimestep, snapshot_positions, interpolate_positions
 from visualization import primer_vis  # Now Pygame visualization
+from visualization.frame_recorder import FrameRecorder, FORMATS
+
+SIM_STEP = 1 / 600  # Simulated time per step: 1/60 s of wall time at the default speed of 0.1.
+MAX_STEPS_PER_FRAME = 12  # Enough for simulation_speed 1 at 50 FPS.
+
+def main(record_dir=None, record_format="raw", max_frames=None):
+    """
+    Main simulation loop.
 
-# Import our water update and river-adding functions
-from environment.river_generation import update_water, add_rivers
-
-def calculate_constrained_heights(terrain, tile_height):
-    """Calculates and returns a 2D array of constrained tile heights."""
-    height, width = terrain.shape
-    constrained_heights = np.zeros_like(terrain, dtype=np.float32)
-    max_height_diff = tile_height
-
-    for y in range(height):
-        for x in range(width):
-            height_value = terrain[y, x] * 1  # Scale factor
-
-            # Enforce Height Constraints
-            constrained_height = height_value
-            neighbors = [(x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)]
-            # Calculate scaling factor based on map width (assuming a square map):
-            # Using the quadratic: factor = (1/300)*width^2 + (67/15)*width + 20
-            scale_factor = (width**2) / 300.0 + (67.0 / 15.0) * width + 20.0
-            for nx, ny in neighbors:
-                if 0 <= nx < width and 0 <= ny < height:
-                    neighbor_height_value = terrain[ny, nx] * scale_factor  # Scale the raw heightmap value
-                    diff = constrained_height - neighbor_height_value
-                    if diff > max_height_diff:
-                        constrained_height = neighbor_height_value + max_height_diff
-                    elif diff < -max_height_diff:
-                        constrained_height = neighbor_height_value - max_height_diff
-
-            constrained_heights[y, x] = constrained_height
-
-
-    return constrained_heights
-
-def main():
-    """Main simulation loop."""
+    With a `record_dir`, every rendered frame is also saved there (see FrameRecorder). With
+    `max_frames`, the simulation stops after rendering that many frames.
+    """
     # --- Simulation Parameters ---
     mapconfig = 30
     width = mapconfig
@@ -76,21 +63,27 @@ def main():
         primer_vis.terrain_renderer.TILE_WIDTH, primer_vis.terrain_renderer.TILE_HEIGHT
     )
 
-    # --- Calculate Constrained Heights (ONCE) ---
-    constrained_heights = calculate_constrained_heights(_terrain, primer_vis.terrain_renderer.TILE_HEIGHT)
-
-    # --- Initialize Water Simulation Data ---
-    water_flow = np.zeros((_terrain.shape[0], _terrain.shape[1], 2), dtype=np.float32)
-    water_dryness = np.zeros((_terrain.shape[0], _terrain.shape[1]), dtype=np.float32)
-    diffusion_rate = 0.1  # Rate at which water spreads
-    momentum = 0.5  # How much water retains its previous direction
-    water_update_interval = 5.0  # seconds
-    last_water_update = pygame.time.get_ticks()  # in milliseconds
-    dryness_threshold = 5.0  # seconds before isolated water dries
-    erosion_rate = 0.0005   # How quickly terrain erodes under water
+    # --- Initialize Environment Manager (water, food respawn, sunlight, constrained heights) ---
+    environment = EnvironmentManager(
+        _terrain,
+        _terrain_type_map,
+        resource_map,
+        num_resources=num_resources,
+        config=config,
+        water_flow=np.zeros((_terrain.shape[0], _terrain.shape[1], 2), dtype=np.float32),
+        water_dryness=np.zeros((_terrain.shape[0], _terrain.shape[1]), dtype=np.float32),
+        water_interval=5.0,  # seconds
+        water_params={
+            'dryness_threshold': 5.0,  # seconds before isolated water dries
+            'erosion_rate': 0.0005,    # How quickly terrain erodes under water
+            'diffusion_rate': 0.1,     # Rate at which water spreads
+            'momentum': 0.5,           # How much water retains its previous direction
+        },
+        tile_height=primer_vis.terrain_renderer.TILE_HEIGHT,  # Constrained heights follow erosion.
+    )
 
     # --- Initialize Agents ---
-    agents = []
+    population = Population()
     num_groups = 2
     group_letters = [chr(i) for i in range(ord('A'), ord('A') + num_groups)]
     group_colors = {}
@@ -109,84 +102,111 @@ def main():
 
         new_agent = agent.Agent(x=x, y=y, group=group_id)
         new_agent.color = group_colors[group_id]
-        agents.append(new_agent)
+        population.add(new_agent)
 
-    for ag in agents:
+    for ag in population:
         ag.age = 0
 
+    # Update age every X seconds.
+    def age_agents(now):
+        living = population.agents
+        for ag in living:
+            ag.age += 1
+        for ag, max_energy in zip(living, agent.calculate_max_energies(living)):
+            ag.max_energy = float(max_energy)
+            ag.adjust_energy_level()
+
+    environment.scheduler.every("aging", lambda: config["aging_interval"] / 1000.0, age_agents)
+
+    def step(wall_dt):
+        """Advances the agents by one fixed step (`wall_dt` seconds at the current speed)."""
+        # Update Agents and Environment
+        # Base speed of 2 tiles per second, properly scaled with simulation speed
+        delta = wall_dt * config['simulation_speed']  # Always SIM_STEP
+        for ag in population:
+            # Pass water_flow so water affects movement.
+            environment.resource_map = ag.update(
+                _terrain,
+                _terrain_type_map,
+                environment.resource_map,
+                delta,
+                water_flow=environment.water_flow
+            )
+
+        # Archive agents that died this step and free their slots.
+        population.reap(pygame.time.get_ticks())
+
     # --- Simulation Loop ---
     running = True
-    last_food_respawn = pygame.time.get_ticks()
-    last_aging = pygame.time.get_ticks()
 
     # Create a Clock object for managing frame rate.
     clock = pygame.time.Clock()
 
+    # The simulation runs in fixed steps of SIM_STEP simulated time, 0..N per frame: a higher
+    # simulation_speed runs more steps rather than bigger ones, and slow frames don't slow it down.
+    timestep = FixedTimestep(SIM_STEP, max_steps=MAX_STEPS_PER_FRAME)
+    previous_positions = snapshot_positions(population.agents)
+    recorder = FrameRecorder(record_dir, record_format) if record_dir is not None else None
+    frames = 0
+
     while running:
-        dt = clock.tick(60) / 1000.0  # Delta time in seconds, capped at 60 FPS.
+        frame_time = clock.tick(60) / 1000.0  # Seconds since the last frame, capped at 60 FPS.
 
         # Process events. If a quit event is detected, break immediately.
-        if primer_vis.handle_events(config, dt):
+        if primer_vis.handle_events(config, frame_time):
             break
 
-        # --- Water Simulation Update (every 5 seconds) ---
-        current_time = pygame.time.get_ticks()
-        if current_time - last_water_update >= water_update_interval * 1000:
-            update_water(
-                _terrain,
-                _terrain_type_map,
-                water_flow,
-                water_dryness,
-                dt,
-                dryness_threshold=dryness_threshold,
-                erosion_rate=erosion_rate,
-                diffusion_rate=diffusion_rate,  # Add diffusion rate
-                momentum=momentum               # Add momentum
-            )
-            last_water_update = current_time
+        speed = config['simulation_speed']
+        steps = timestep.advance(frame_time, rate=speed)
 
-        # Update Agents and Environment
-        # Base speed of 2 tiles per second, properly scaled with simulation speed
-        delta = dt * config['simulation_speed']  # Remove the 2.0 multiplier since it's handled in movement.py
-        for ag in agents:
-            if ag.is_alive():
-                # Pass water_flow so water affects movement.
-                resource_map = ag.update(
-                    _terrain,
-                    _terrain_type_map,
-                    resource_map,
-                    delta,
-                    water_flow=water_flow
-                )
-
-        # Delayed food respawn logic
-        current_time = pygame.time.get_ticks()
-        if current_time - last_food_respawn >= config['food_respawn_interval'] / config['simulation_speed']:
-            resource_map, resource_locations = resource.respawn_resources(_terrain, _terrain_type_map, num_resources)
-            last_food_respawn = current_time
-
-        # Update age every X seconds.
-        if current_time - last_aging >= config["aging_interval"]:
-            for ag in agents:
-                if ag.is_alive():
-                    ag.age += 1
-                    ag.max_energy = ag.calculate_max_energy()
-                    ag.adjust_energy_level()
-            last_aging = current_time
-
-        # Update Pygame Display.
+        # --- Environment Update (water, food respawn, sunlight and aging run on the scheduler) ---
+        # Once per frame for all of this frame's steps, so the scheduler's per-frame budgets hold
+        # however many steps the frame runs.
+        environment.update_environment(steps * SIM_STEP / speed)
+
+        for _ in range(steps):
+            previous_positions = snapshot_positions(population.agents)
+            step(SIM_STEP / speed)
+
+        if not timestep.should_render():
+            continue  # Behind: spend this frame's time on simulation steps.
+
+        # Update Pygame Display, with agents drawn between the last two steps.
         primer_vis.update_display(
             _terrain,
             _terrain_type_map,
-            resource_map,
-            agents,
+            environment.resource_map,
+            population.agents,
             config,
             group_letters,
             terrain_sprites,
-            constrained_heights #Pass the constrained heights value.
+            environment.constrained_heights, # Kept current by the environment manager.
+            deaths=population.deaths,
+            positions=interpolate_positions(population.agents, previous_positions, timestep.alpha),
+            terrain_color_map=_terrain_color_map,
+            changed_cells=environment.take_changed_cells()  # Since the last rendered frame.
         )
-
+        if recorder is not None:
+            recorder.capture(primer_vis.screen)  # Dropped rather than waited for if the writers lag.
+        frames += 1
+        if max_frames is not None and frames >= max_frames:
+            running = False
+
+    if recorder is not None:
+        recorder.close()
+        print(f"Recorded {recorder.written} frames to {record_dir} ({recorder.dropped} dropped).")
     primer_vis.close()  # Close pygame when finished.
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Evolving agents simulation.")
+    parser.add_argument("--headless", action="store_true", help="Render without a window (SDL dummy video driver).")
+    parser.add_argument("--record", metavar="DIR", help="Save the rendered frames to DIR.")
+    parser.add_argument("--record-format", choices=FORMATS, default="raw",
+                        help="raw: raw video chunks (keeps up at 60 FPS); png: one PNG per frame "
+                             "(slow to encode, most frames are dropped on few CPUs).")
+    parser.add_argument("--frames", type=int, help="Stop after rendering this many frames.")
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args()
+    main(record_dir=args.record, record_format=args.record_format, max_frames=args.frames)
\ No newline at end of file
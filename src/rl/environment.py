@@ -0,0 +1,144 @@
+# src/rl/environment.py
+import random
+import numpy as np
+from src.agent.agent import Agent
+from src.agent import movement, vision
+from src.agent_simulation import World, RandomScope
+from src.environment import terrain, resource
+
+try:
+    from gym import spaces  # Optional: only needed to hand the env to gym/stable-baselines3.
+except ImportError:
+    spaces = None
+
+# Discrete actions: stay, then the 8 neighboring directions.
+ACTIONS = np.array([(0, 0), (1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)])
+
+VIEW_RADIUS = 2  # Observation window is (2r+1) x (2r+1) cells around the agent.
+
+def observation_size(view_radius=VIEW_RADIUS):
+    """Length of one observation vector: resource patch, relative height patch, energy and age."""
+    side = 2 * view_radius + 1
+    return 2 * side * side + 2
+
+class SimulationEnv:
+    """
+    An RL environment of `num_agents` agents acting in one world.
+
+    `step` takes one discrete action per agent and returns stacked NumPy arrays
+    (observations, rewards, dones, infos), so a single env with N agents is already
+    a batch. Agents whose episode ends are reset individually and their final
+    observation is kept in `infos[i]["terminal_observation"]`, as VecEnvs expect.
+    """
+
+    def __init__(self, world=None, num_agents=1, max_steps=500, delta=0.1, seed=0,
+                 view_radius=VIEW_RADIUS, num_resources=25, respawn_interval=300):
+        self.world = world if world is not None else World.generate(seed=seed)
+        self.num_agents = num_agents
+        self.max_steps = max_steps
+        self.delta = delta
+        self.view_radius = view_radius
+        self.num_resources = num_resources
+        self.respawn_interval = respawn_interval
+        self.obs_size = observation_size(view_radius)
+        if spaces is not None:
+            self.observation_space = spaces.Box(-np.inf, np.inf, (self.obs_size,), dtype=np.float32)
+            self.action_space = spaces.Discrete(len(ACTIONS))
+        else:
+            self.observation_space = None
+            self.action_space = None
+
+        # Window offsets, used to gather every agent's patch in one fancy-indexing call.
+        offsets = np.arange(-view_radius, view_radius + 1)
+        self._offset_y, self._offset_x = np.meshgrid(offsets, offsets, indexing="ij")
+        self._padded_heights = np.pad(self.world.heightmap, view_radius, mode="edge")
+        self._seed = seed
+        self.reset(seed)
+
+    def _spawn_agent(self):
+        height, width = self.world.heightmap.shape
+        for _ in range(1000):
+            x = random.randint(0, width - 1)
+            y = random.randint(0, height - 1)
+            if terrain.is_walkable(self.world.heightmap, x, y, self.world.terrain_type_map):
+                break
+        return Agent(x=x, y=y)
+
+    def reset(self, seed=None):
+        """Resets the world and every agent; returns (num_agents, obs_size) observations."""
+        if seed is not None:
+            self._seed = seed
+        self._random = RandomScope(self._seed)  # Keeps envs sharing a process independent.
+        self.resource_map = self.world.resource_map.copy()
+        with self._random:
+            self.agents = [self._spawn_agent() for _ in range(self.num_agents)]
+        self.episode_steps = np.zeros(self.num_agents, dtype=np.int64)
+        self.total_steps = 0
+        return self.observe()
+
+    def observe(self):
+        """Builds the observations of every agent at once."""
+        r = self.view_radius
+        xs = np.array([int(agent.x) for agent in self.agents])
+        ys = np.array([int(agent.y) for agent in self.agents])
+        rows = ys[:, None, None] + r + self._offset_y
+        cols = xs[:, None, None] + r + self._offset_x
+        padded_resources = np.pad(self.resource_map, r)
+        resource_patch = padded_resources[rows, cols].reshape(self.num_agents, -1)
+        height_patch = self._padded_heights[rows, cols] - self._padded_heights[ys + r, xs + r][:, None, None]
+        energy = np.array([agent.energy / agent.max_energy for agent in self.agents])
+        age = np.array([agent.age / agent.max_age for agent in self.agents])
+        return np.concatenate(
+            (resource_patch, height_patch.reshape(self.num_agents, -1), energy[:, None], age[:, None]),
+            axis=1
+        ).astype(np.float32)
+
+    def step(self, actions):
+        """
+        Applies one action per agent.
+
+        Returns:
+            tuple: observations (num_agents, obs_size) float32, rewards (num_agents,) float32,
+            dones (num_agents,) bool, infos (list of dicts).
+        """
+        with self._random:
+            return self._step(actions)
+
+    def _step(self, actions):
+        actions = np.asarray(actions).reshape(self.num_agents)
+        rewards = np.zeros(self.num_agents, dtype=np.float32)
+        dones = np.zeros(self.num_agents, dtype=bool)
+        for i, agent in enumerate(self.agents):
+            dx, dy = ACTIONS[actions[i]]
+            collected_before = agent.collected_resources
+            if dx or dy:
+                movement.move(agent, dx, dy, self.world.heightmap, self.world.terrain_type_map, self.delta)
+            cx, cy = int(round(agent.x)), int(round(agent.y))
+            if resource.get_resource_amount(self.resource_map, cx, cy) > 0:
+                self.resource_map = vision.collect_resource(agent, self.resource_map, cx, cy)
+            rewards[i] = agent.collected_resources - collected_before + 0.01
+            if not agent.is_alive():
+                rewards[i] -= 1.0
+                dones[i] = True
+
+        self.episode_steps += 1
+        self.total_steps += 1
+        dones |= self.episode_steps >= self.max_steps
+        if self.respawn_interval and self.total_steps % self.respawn_interval == 0:
+            self.resource_map, _ = resource.respawn_resources(
+                self.world.heightmap, self.world.terrain_type_map, self.num_resources
+            )
+
+        observations = self.observe()
+        infos = [{} for _ in range(self.num_agents)]
+        if dones.any():
+            for i in np.flatnonzero(dones):
+                infos[i]["terminal_observation"] = observations[i].copy()
+                infos[i]["episode_steps"] = int(self.episode_steps[i])
+                self.agents[i] = self._spawn_agent()
+                self.episode_steps[i] = 0
+            observations = self.observe()
+        return observations, rewards, dones, infos
+
+    def close(self):
+        pass
@@ -0,0 +1,197 @@
+# src/rl/replay_buffer.py
+import json
+import os
+import numpy as np
+
+META_FILE = "meta.json"
+
+class SumTree:
+    """
+    Binary tree of priority sums over a fixed number of leaves, stored in one flat array.
+
+    Node i has children 2i and 2i + 1; leaves start at `offset`. Updating a batch of leaves and
+    finding the leaves for a batch of prefix sums are both vectorized, O(batch * log n).
+    """
+
+    def __init__(self, capacity, tree=None):
+        self.capacity = capacity
+        self.offset = 1 << max(capacity - 1, 1).bit_length()  # Leaf count, a power of two.
+        self.depth = self.offset.bit_length() - 1
+        self.tree = np.zeros(2 * self.offset, dtype=np.float64) if tree is None else tree
+
+    @property
+    def total(self):
+        return float(self.tree[1])
+
+    def get(self, indices):
+        return self.tree[self.offset + np.asarray(indices)]
+
+    def update(self, indices, priorities):
+        """Sets the priorities of the given leaves and refreshes their ancestors level by level."""
+        nodes = self.offset + np.asarray(indices, dtype=np.int64)
+        self.tree[nodes] = priorities
+        for _ in range(self.depth):
+            nodes = np.unique(nodes // 2)
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+
+    def find(self, values):
+        """Returns the leaf index for each prefix-sum value in [0, total)."""
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        for _ in range(self.depth):
+            left = 2 * nodes
+            go_right = values >= self.tree[left]
+            values -= np.where(go_right, self.tree[left], 0.0)
+            nodes = left + go_right
+        return np.minimum(nodes - self.offset, self.capacity - 1)
+
+class ReplayBuffer:
+    """
+    Ring buffer of transitions stored in fixed-dtype NumPy memmaps under `directory`.
+
+    Observations, actions, rewards, next observations and dones each live in their own `.npy`
+    file, so only the pages that are touched are held in RAM and buffers far larger than memory
+    work. Batches are inserted with one slice assignment per field; once full, the oldest
+    transitions are overwritten.
+
+    With `prioritized=True`, a SumTree (also memmapped) holds each transition's priority ** alpha,
+    and `sample` draws proportionally to it. `flush()` writes the write position and size next to
+    the arrays; opening a directory that already holds a buffer resumes it.
+    """
+
+    def __init__(self, directory, capacity=1_000_000, obs_shape=(), obs_dtype=np.float32,
+                 action_shape=(), action_dtype=np.int64, prioritized=False, alpha=0.6, epsilon=1e-6):
+        self.directory = directory
+        meta_path = os.path.join(directory, META_FILE)
+        resume = os.path.exists(meta_path)
+        if resume:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if meta["capacity"] != capacity or tuple(meta["obs_shape"]) != tuple(obs_shape):
+                raise ValueError(
+                    f"Replay buffer in {directory} has capacity {meta['capacity']} and observation shape "
+                    f"{tuple(meta['obs_shape'])}, not {capacity} and {tuple(obs_shape)}"
+                )
+        else:
+            os.makedirs(directory, exist_ok=True)
+            meta = {"position": 0, "size": 0, "max_priority": 1.0}
+
+        self.capacity = capacity
+        self.obs_shape = tuple(obs_shape)
+        self.prioritized = prioritized
+        self.alpha = alpha
+        self.epsilon = epsilon
+        self.position = meta["position"]  # Next slot to write.
+        self.size = meta["size"]
+        self.max_priority = meta["max_priority"]
+
+        fields = {
+            "observations": (self.obs_shape, obs_dtype),
+            "actions": (tuple(action_shape), action_dtype),
+            "rewards": ((), np.float32),
+            "next_observations": (self.obs_shape, obs_dtype),
+            "dones": ((), np.bool_),
+        }
+        self.arrays = {name: self._open(name, (capacity,) + shape, dtype, resume)
+                       for name, (shape, dtype) in fields.items()}
+        self.tree = None
+        if prioritized:
+            leaves = SumTree(capacity).offset
+            had_priorities = os.path.exists(os.path.join(directory, "priorities.npy"))
+            self.tree = SumTree(capacity, self._open("priorities", (2 * leaves,), np.float64, resume))
+            if resume and not had_priorities and self.size:
+                self.tree.update(np.arange(self.size), self.max_priority ** alpha)
+
+    def _open(self, name, shape, dtype, resume):
+        path = os.path.join(self.directory, name + ".npy")
+        if resume and os.path.exists(path):
+            return np.lib.format.open_memmap(path, mode="r+")
+        return np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+
+    def __len__(self):
+        return self.size
+
+    def add(self, observations, actions, rewards, next_observations, dones):
+        """Inserts a batch of transitions (leading axis = batch) and returns their slots."""
+        batch = {
+            "observations": observations, "actions": actions, "rewards": rewards,
+            "next_observations": next_observations, "dones": dones,
+        }
+        n = len(rewards)
+        if n > self.capacity:  # Only the newest `capacity` transitions would survive anyway.
+            batch = {name: np.asarray(values)[-self.capacity:] for name, values in batch.items()}
+            n = self.capacity
+        slots = (self.position + np.arange(n)) % self.capacity
+
+        # At most two contiguous runs: up to the end of the ring, then from the start.
+        first = min(n, self.capacity - self.position)
+        for name, values in batch.items():
+            values = np.asarray(values)
+            array = self.arrays[name]
+            array[self.position:self.position + first] = values[:first]
+            array[:n - first] = values[first:]
+
+        if self.tree is not None:
+            self.tree.update(slots, self.max_priority ** self.alpha)
+        self.position = int((self.position + n) % self.capacity)
+        self.size = min(self.size + n, self.capacity)
+        return slots
+
+    def sample(self, batch_size, rng=None, beta=0.4):
+        """
+        Samples a batch of transitions.
+
+        Uniform unless the buffer is prioritized, in which case indices are drawn by stratified
+        proportional sampling and `weights` holds the normalized importance-sampling weights.
+
+        Returns:
+            dict: The transition fields, plus `indices` and `weights`.
+        """
+        if self.size == 0:
+            raise ValueError("Cannot sample from an empty replay buffer")
+        rng = np.random.default_rng() if rng is None else rng
+        if self.tree is None:
+            indices = rng.integers(0, self.size, batch_size)
+            weights = np.ones(batch_size, dtype=np.float32)
+        else:
+            total = self.tree.total
+            segment = total / batch_size
+            values = (np.arange(batch_size) + rng.random(batch_size)) * segment
+            indices = self.tree.find(np.minimum(values, np.nextafter(total, 0)))
+            probabilities = self.tree.get(indices) / total
+            weights = (self.size * probabilities) ** -beta
+            weights = (weights / weights.max()).astype(np.float32)
+
+        # Memmap fancy indexing reads in file order fastest.
+        order = np.argsort(indices)
+        indices, weights = indices[order], weights[order]
+        batch = {name: np.asarray(array[indices]) for name, array in self.arrays.items()}
+        batch["indices"] = indices
+        batch["weights"] = weights
+        return batch
+
+    def update_priorities(self, indices, priorities):
+        """Sets new priorities (e.g. absolute TD errors) for previously sampled transitions."""
+        if self.tree is None:
+            raise ValueError("update_priorities requires a prioritized replay buffer")
+        priorities = np.abs(np.asarray(priorities, dtype=np.float64)) + self.epsilon
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+        self.tree.update(indices, priorities ** self.alpha)
+
+    def flush(self):
+        """Writes the arrays and the ring state to disk so the buffer can be resumed."""
+        for array in self.arrays.values():
+            array.flush()
+        if self.tree is not None:
+            self.tree.tree.flush()
+        meta = {
+            "capacity": self.capacity, "obs_shape": list(self.obs_shape),
+            "position": self.position, "size": self.size, "max_priority": self.max_priority,
+        }
+        with open(os.path.join(self.directory, META_FILE), "w") as f:
+            json.dump(meta, f)
+
+    def close(self):
+        self.flush()
+        self.arrays = {}
+        self.tree = None
@@ -0,0 +1,75 @@
+# src/rl/training.py
+from functools import partial
+from src.rl.environment import SimulationEnv
+from src.rl.vec_env import SyncVecEnv, SubprocVecEnv, SharedMemoryVecEnv
+
+def make_vec_env(num_worlds=4, agents_per_world=1, mode="sync", world=None, seed=0, **env_kwargs):
+    """
+    Creates a vectorized environment of `num_worlds` SimulationEnvs with `agents_per_world` agents each.
+
+    Args:
+        mode (str): "sync" to step every world in this process, "subproc" for one process per world,
+            "shared" for one process per world exchanging data through shared memory.
+        world (World, optional): Shared world; each env generates its own (seeded) world if None.
+    """
+    env_fns = [
+        partial(SimulationEnv, world=world, num_agents=agents_per_world, seed=seed + i, **env_kwargs)
+        for i in range(num_worlds)
+    ]
+    if mode == "sync":
+        return SyncVecEnv(env_fns)
+    if mode == "subproc":
+        return SubprocVecEnv(env_fns)
+    if mode == "shared":
+        return SharedMemoryVecEnv(env_fns)
+    raise ValueError(f"Unknown vec env mode: {mode}")
+
+def to_sb3_vec_env(vec_env):
+    """Wraps one of our vec envs in a stable-baselines3 VecEnv (requires stable-baselines3 and gym)."""
+    from stable_baselines3.common.vec_env import VecEnv
+
+    class SB3VecEnv(VecEnv):
+        def __init__(self, inner):
+            self.inner = inner
+            super().__init__(inner.num_envs, inner.observation_space, inner.action_space)
+
+        def reset(self):
+            return self.inner.reset()
+
+        def step_async(self, actions):
+            self.inner.step_async(actions)
+
+        def step_wait(self):
+            return self.inner.step_wait()
+
+        def close(self):
+            self.inner.close()
+
+        def get_attr(self, attr_name, indices=None):
+            return [getattr(self.inner, attr_name)] * len(self._get_indices(indices))
+
+        def set_attr(self, attr_name, value, indices=None):
+            setattr(self.inner, attr_name, value)
+
+        def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+            return [getattr(self.inner, method_name)(*method_args, **method_kwargs)]
+
+        def env_is_wrapped(self, wrapper_class, indices=None):
+            return [False] * len(self._get_indices(indices))
+
+        def seed(self, seed=None):
+            return [None] * self.num_envs
+
+    return SB3VecEnv(vec_env)
+
+def train_ppo(total_timesteps=100_000, num_worlds=4, agents_per_world=8, mode="subproc", **ppo_kwargs):
+    """Trains a PPO policy on the batched simulation and returns the model."""
+    from stable_baselines3 import PPO
+
+    vec_env = to_sb3_vec_env(make_vec_env(num_worlds, agents_per_world, mode=mode))
+    model = PPO("MlpPolicy", vec_env, **ppo_kwargs)
+    try:
+        model.learn(total_timesteps=total_timesteps)
+    finally:
+        vec_env.close()
+    return model
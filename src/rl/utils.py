@@ -0,0 +1,85 @@
+# src/rl/utils.py
+import numpy as np
+from src.utils.shared_memory import SharedArrays
+
+# Commands the learner posts in the buffer's control block before releasing the workers.
+COMMAND_STEP = 1
+COMMAND_RESET = 2
+COMMAND_CLOSE = 3
+
+class SharedRolloutBuffer:
+    """
+    Rollout storage in shared memory, written in place by env worker processes.
+
+    Layout (T = n_steps, N = num_envs):
+        observations (T + 1, N, obs_size)  slot t holds the observations *before* action t
+        actions      (T, N)                written by the learner
+        rewards      (T, N), dones (T, N)  written by the workers for step t
+        terminal_observations (N, obs_size)  last observation of envs that just finished
+
+    With n_steps=1 it is simply a per-step observation buffer. The learner reads every
+    array as a NumPy view, so nothing is pickled or copied between processes.
+    """
+
+    def __init__(self, num_envs, obs_size, n_steps=1, _shared=None):
+        self.num_envs = num_envs
+        self.obs_size = obs_size
+        self.n_steps = n_steps
+        if _shared is None:
+            _shared = SharedArrays.allocate({
+                "observations": ((n_steps + 1, num_envs, obs_size), np.float32),
+                "actions": ((n_steps, num_envs), np.int64),
+                "rewards": ((n_steps, num_envs), np.float32),
+                "dones": ((n_steps, num_envs), np.bool_),
+                "terminal_observations": ((num_envs, obs_size), np.float32),
+                "control": ((2,), np.int64),  # [command, step index]
+            })
+        self._shared = _shared
+        self.observations = _shared["observations"]
+        self.actions = _shared["actions"]
+        self.rewards = _shared["rewards"]
+        self.dones = _shared["dones"]
+        self.terminal_observations = _shared["terminal_observations"]
+        self.control = _shared["control"]
+
+    @property
+    def spec(self):
+        """Picklable description used by `attach` in worker processes."""
+        return (self.num_envs, self.obs_size, self.n_steps, self._shared.spec)
+
+    @classmethod
+    def attach(cls, spec):
+        num_envs, obs_size, n_steps, shared_spec = spec
+        return cls(num_envs, obs_size, n_steps, _shared=SharedArrays.attach(shared_spec))
+
+    @property
+    def step_index(self):
+        return int(self.control[1])
+
+    def post(self, command, step_index=None):
+        """Learner side: sets the command (and step) the workers will execute next."""
+        if step_index is not None:
+            self.control[1] = step_index
+        self.control[0] = command
+
+    def write_step(self, rows, observations, rewards, dones, infos):
+        """Worker side: stores one env's step results into its rows of the current slot."""
+        t = self.step_index
+        self.observations[t + 1, rows] = observations
+        self.rewards[t, rows] = rewards
+        self.dones[t, rows] = dones
+        for i, info in enumerate(infos):
+            if "terminal_observation" in info:
+                self.terminal_observations[rows.start + i] = info["terminal_observation"]
+
+    def write_reset(self, rows, observations):
+        """Worker side: stores one env's initial observations into the current slot."""
+        self.observations[self.step_index, rows] = observations
+
+    def wrap(self):
+        """Starts a new rollout: the last observations become slot 0."""
+        self.observations[0] = self.observations[self.n_steps]
+        self.control[1] = 0
+
+    def close(self):
+        self._shared.close()
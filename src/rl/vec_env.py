@@ -0,0 +1,246 @@
+# src/rl/vec_env.py
+import multiprocessing as mp
+import numpy as np
+from src.rl.utils import SharedRolloutBuffer, COMMAND_STEP, COMMAND_RESET, COMMAND_CLOSE
+from src.utils.shared_memory import prepare_workers
+
+class SyncVecEnv:
+    """
+    Steps several SimulationEnvs in this process and stacks their results.
+
+    Each env contributes `env.num_agents` rows, so `num_envs` is the total number of
+    agents across all worlds. `step(actions)` takes one action per row and returns
+    stacked observations, rewards and dones, following the stable-baselines3 VecEnv
+    conventions (auto-reset, `terminal_observation` in infos).
+    """
+
+    def __init__(self, env_fns):
+        self.envs = [fn() for fn in env_fns]
+        self._setup([env.num_agents for env in self.envs], self.envs[0])
+
+    def _setup(self, agents_per_env, first_env):
+        self.agents_per_env = agents_per_env
+        self.num_envs = sum(agents_per_env)
+        self._bounds = np.cumsum([0] + agents_per_env)
+        self.observation_space = first_env.observation_space
+        self.action_space = first_env.action_space
+        self.obs_size = first_env.obs_size
+        self._actions = None
+
+    def _split(self, actions):
+        actions = np.asarray(actions).reshape(self.num_envs)
+        return [actions[self._bounds[i]:self._bounds[i + 1]] for i in range(len(self.agents_per_env))]
+
+    def reset(self):
+        return np.concatenate([env.reset() for env in self.envs])
+
+    def step_async(self, actions):
+        self._actions = actions
+
+    def step_wait(self):
+        results = [env.step(actions) for env, actions in zip(self.envs, self._split(self._actions))]
+        return _stack_results(results)
+
+    def step(self, actions):
+        self.step_async(actions)
+        return self.step_wait()
+
+    def close(self):
+        for env in self.envs:
+            env.close()
+
+def _stack_results(results):
+    observations, rewards, dones, infos = zip(*results)
+    return (
+        np.concatenate(observations),
+        np.concatenate(rewards),
+        np.concatenate(dones),
+        [info for env_infos in infos for info in env_infos],
+    )
+
+def _subproc_worker(remote, parent_remote, env_fn):
+    """Runs one env in a child process, serving commands from the pipe."""
+    parent_remote.close()
+    env = env_fn()
+    try:
+        while True:
+            command, data = remote.recv()
+            if command == "step":
+                remote.send(env.step(data))
+            elif command == "reset":
+                remote.send(env.reset())
+            elif command == "spec":
+                remote.send((env.num_agents, env.obs_size, env.observation_space, env.action_space))
+            elif command == "close":
+                break
+            else:
+                raise ValueError(f"Unknown command: {command}")
+    except (KeyboardInterrupt, EOFError):
+        pass
+    finally:
+        env.close()
+        remote.close()
+
+class _EnvSpec:
+    """Stand-in for the first env, so SubprocVecEnv can share SyncVecEnv's setup."""
+
+    def __init__(self, obs_size, observation_space, action_space):
+        self.obs_size = obs_size
+        self.observation_space = observation_space
+        self.action_space = action_space
+
+class SubprocVecEnv(SyncVecEnv):
+    """
+    Like SyncVecEnv, but each SimulationEnv runs in its own process.
+
+    `step_async` sends every worker its actions before any result is awaited, so the
+    worlds step in parallel. `env_fns` must be picklable under the chosen start method.
+    """
+
+    def __init__(self, env_fns, start_method=None):
+        context = mp.get_context(start_method)
+        self.remotes, self.work_remotes = zip(*[context.Pipe() for _ in env_fns])
+        self.processes = []
+        for work_remote, remote, env_fn in zip(self.work_remotes, self.remotes, env_fns):
+            process = context.Process(target=_subproc_worker, args=(work_remote, remote, env_fn), daemon=True)
+            process.start()
+            self.processes.append(process)
+            work_remote.close()
+        self.closed = False
+
+        for remote in self.remotes:
+            remote.send(("spec", None))
+        specs = [remote.recv() for remote in self.remotes]
+        _, obs_size, observation_space, action_space = specs[0]
+        self._setup([spec[0] for spec in specs], _EnvSpec(obs_size, observation_space, action_space))
+
+    def reset(self):
+        for remote in self.remotes:
+            remote.send(("reset", None))
+        return np.concatenate([remote.recv() for remote in self.remotes])
+
+    def step_async(self, actions):
+        for remote, env_actions in zip(self.remotes, self._split(actions)):
+            remote.send(("step", env_actions))
+
+    def step_wait(self):
+        return _stack_results([remote.recv() for remote in self.remotes])
+
+    def close(self):
+        if self.closed:
+            return
+        for remote in self.remotes:
+            remote.send(("close", None))
+        for process in self.processes:
+            process.join()
+        self.closed = True
+
+def _shared_memory_worker(remote, parent_remote, env_fn, barrier):
+    """
+    Runs one env in a child process. After a one-time handshake over the pipe, every step is
+    driven through the shared rollout buffer: wait at the barrier, execute the posted command
+    writing results straight into shared memory, then meet the learner at the barrier again.
+    """
+    parent_remote.close()
+    env = env_fn()
+    buffer = None
+    try:
+        remote.send((env.num_agents, env.obs_size, env.observation_space, env.action_space))
+        buffer_spec, rows = remote.recv()
+        buffer = SharedRolloutBuffer.attach(buffer_spec)
+        while True:
+            barrier.wait()
+            command = int(buffer.control[0])
+            if command == COMMAND_STEP:
+                actions = buffer.actions[buffer.step_index, rows]
+                buffer.write_step(rows, *env.step(actions))
+            elif command == COMMAND_RESET:
+                buffer.write_reset(rows, env.reset())
+            elif command == COMMAND_CLOSE:
+                break
+            barrier.wait()
+    except BaseException:
+        barrier.abort()  # Don't leave the learner waiting on a dead worker.
+        raise
+    finally:
+        env.close()
+        if buffer is not None:
+            buffer.close()
+        remote.close()
+
+class SharedMemoryVecEnv(SyncVecEnv):
+    """
+    Subprocess VecEnv whose workers exchange data only through a SharedRolloutBuffer.
+
+    The learner writes actions into the buffer, releases the workers with a barrier and
+    waits for them at a second barrier; observations, rewards and dones are then read as
+    zero-copy views of the slot the workers just filled. With `n_steps` > 1 consecutive
+    steps fill consecutive rollout slots, so a whole rollout is collected without copies
+    (`buffer` exposes it); the buffer wraps to slot 0 automatically once full.
+
+    Returned arrays are views into shared memory and are overwritten when their slot is
+    reused, so copy anything that must outlive the rollout.
+    """
+
+    def __init__(self, env_fns, n_steps=1, start_method=None):
+        context = mp.get_context(start_method)
+        prepare_workers()  # The buffer is created after the workers start.
+        self.barrier = context.Barrier(len(env_fns) + 1)
+        self.remotes, work_remotes = zip(*[context.Pipe() for _ in env_fns])
+        self.processes = []
+        for work_remote, remote, env_fn in zip(work_remotes, self.remotes, env_fns):
+            process = context.Process(
+                target=_shared_memory_worker, args=(work_remote, remote, env_fn, self.barrier), daemon=True
+            )
+            process.start()
+            self.processes.append(process)
+            work_remote.close()
+        self.closed = False
+
+        specs = [remote.recv() for remote in self.remotes]
+        _, obs_size, observation_space, action_space = specs[0]
+        self._setup([spec[0] for spec in specs], _EnvSpec(obs_size, observation_space, action_space))
+
+        self.buffer = SharedRolloutBuffer(self.num_envs, obs_size, n_steps)
+        for i, remote in enumerate(self.remotes):
+            remote.send((self.buffer.spec, slice(self._bounds[i], self._bounds[i + 1])))
+
+    def _run(self, command):
+        """Posts a command and waits for every worker to finish it."""
+        self.buffer.post(command)
+        self.barrier.wait()
+        if command != COMMAND_CLOSE:
+            self.barrier.wait()
+
+    def reset(self):
+        self.buffer.wrap()
+        self._run(COMMAND_RESET)
+        return self.buffer.observations[0]
+
+    def step_async(self, actions):
+        t = self.buffer.step_index
+        if t == self.buffer.n_steps:
+            self.buffer.wrap()
+            t = 0
+        self.buffer.actions[t] = np.asarray(actions).reshape(self.num_envs)
+        self.buffer.post(COMMAND_STEP)
+        self.barrier.wait()
+
+    def step_wait(self):
+        self.barrier.wait()
+        t = self.buffer.step_index
+        dones = self.buffer.dones[t]
+        infos = [{} for _ in range(self.num_envs)]
+        for i in np.flatnonzero(dones):
+            infos[i]["terminal_observation"] = self.buffer.terminal_observations[i]
+        self.buffer.control[1] = t + 1
+        return self.buffer.observations[t + 1], self.buffer.rewards[t], dones, infos
+
+    def close(self):
+        if self.closed:
+            return
+        self._run(COMMAND_CLOSE)
+        for process in self.processes:
+            process.join()
+        self.buffer.close()
+        self.closed = True
@@ -1,9 +1,14 @@
 # # src/utils/data_logging.py
+import atexit
 import csv
+import itertools
 import json
+import threading
+import numpy as np
+from src.utils.snapshots import SnapshotReader
 
 def log_data(data, filename, format='csv'):
-    """Logs data to a file (CSV or JSON)."""
+    """Logs data to a file (CSV or JSON). Opens the file per call; use SimulationLogger for many rows."""
     try:
         if format == 'csv':
             with open(filename, 'a', newline='') as csvfile:  # Append mode
@@ -31,10 +36,117 @@ def log_data(data, filename, format='csv'):
         print(f"Error logging data: {e}")
         return False
 
-def load_data(filename, format='csv'):
-    """Loads data from a file (CSV or JSON)."""
-    try:
+class SimulationLogger:
+    """
+    Logs rows (dicts) to a file kept open, in the same CSV or JSON-lines format as `log_data`.
+
+    Rows are buffered in memory and written in batches: by a background thread every
+    `flush_interval` seconds, or as soon as `max_rows` rows are waiting. `close()` (also run at
+    interpreter exit, or by leaving a `with` block) writes what is left and closes the file.
+    CSV columns are taken from the file's header if it already has one, else from the first
+    row, which then becomes the header.
+    """
+
+    def __init__(self, filename, format='csv', max_rows=1000, flush_interval=1.0):
+        if format not in ('csv', 'json'):
+            raise ValueError(f"Unsupported data format: {format}")
+        self.filename = filename
+        self.format = format
+        self.max_rows = max_rows
+        self.flush_interval = flush_interval
+        self.header = None
         if format == 'csv':
+            try:
+                with open(filename, 'r', newline='') as csvfile:
+                    self.header = next(csv.reader(csvfile), None)  # Appending: keep its columns.
+            except FileNotFoundError:
+                pass
+        self._file = open(filename, 'a', newline='')  # Append mode
+        self._writer = csv.writer(self._file) if format == 'csv' else None
+        self._rows = []
+        self._lock = threading.Lock()  # Guards _rows.
+        self._write_lock = threading.Lock()  # Keeps batches in order.
+        self._wake = threading.Event()
+        self._closed = False
+        self.rows_written = 0
+        self._thread = threading.Thread(target=self._run, name="SimulationLogger", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def log(self, data):
+        """Queues one row (a copy of it, so the caller may reuse the dict); it is written by the next flush."""
+        self.log_many((data,))
+
+    def log_many(self, rows):
+        """Queues several rows at once."""
+        rows = [dict(row) for row in rows]
+        with self._lock:
+            if self._closed:
+                raise ValueError(f"SimulationLogger for {self.filename} is closed")
+            self._rows.extend(rows)
+            full = len(self._rows) >= self.max_rows
+        if full:
+            self._wake.set()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """Writes the buffered rows to the file now; returns False if writing failed."""
+        with self._write_lock:
+            with self._lock:
+                rows, self._rows = self._rows, []
+            if not rows or self._file.closed:
+                return True
+            try:
+                if self.format == 'csv':
+                    if self.header is None:
+                        self.header = list(rows[0].keys())
+                        self._writer.writerow(self.header)
+                    self._writer.writerows([row.get(key, '') for key in self.header] for row in rows)
+                else:
+                    self._file.write(''.join(json.dumps(row) + '\n' for row in rows))  # One entry per line
+                self._file.flush()
+                self.rows_written += len(rows)
+                return True
+            except Exception as e:
+                print(f"Error logging data: {e}")
+                return False
+
+    def close(self):
+        """Writes the remaining rows and closes the file."""
+        with self._lock:  # Rows logged from now on are refused, not lost.
+            if self._closed:
+                return
+            self._closed = True
+        self._wake.set()
+        self._thread.join()
+        self.flush()
+        self._file.close()
+        atexit.unregister(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def load_data(filename, format='csv', columns=None, start=None, stop=None):
+    """
+    Loads data from a file (CSV or JSON) as a list of dicts.
+
+    With format='npz', `filename` is a snapshot directory (see utils.snapshots) and the result
+    is a NumPy structured array, optionally of just some `columns` and of the ticks in
+    [start, stop).
+    """
+    try:
+        if format == 'npz':
+            return SnapshotReader(filename).read(columns, start, stop)
+
+        elif format == 'csv':
             with open(filename, 'r') as csvfile:
                 reader = csv.DictReader(csvfile)
                 data = list(reader)
@@ -62,28 +174,155 @@ def load_data(filename, format='csv'):
         print(f"Error loading data: {e}")
         return None
 
-def visualize_data(filename, format='csv'):
-    """Visualizes data using Matplotlib (example: resource collection over time)."""
+def _to_array(values):
+    """Converts a column of values to an array; strings (from CSV) become ints or floats if they all parse."""
+    if not values or not isinstance(values[0], str):
+        return np.array(values)
+    for dtype in (np.int64, np.float64):
+        try:
+            return np.array(values, dtype=dtype)
+        except (ValueError, TypeError):
+            continue
+    return np.array(values)
+
+def iter_data(filename, format='csv', columns=None, chunk_rows=100_000):
+    """
+    Reads a log (CSV, JSON lines, or an npz snapshot directory) in batches of up to `chunk_rows`
+    rows, yielding each batch as a dict of NumPy column arrays, so a file of any size is read in
+    bounded memory. `columns` selects the columns to keep (default: all).
+    """
+    if format == 'npz':
+        for block in SnapshotReader(filename).iter_chunks(columns):
+            yield {name: block[name] for name in block.dtype.names}
+
+    elif format == 'csv':
+        with open(filename, 'r', newline='') as csvfile:
+            reader = csv.reader(csvfile)
+            header = next(reader, None)
+            if header is None:
+                return
+            names = list(header if columns is None else columns)
+            missing = set(names) - set(header)
+            if missing:
+                raise KeyError(f"Missing columns in {filename}: {sorted(missing)}")
+            positions = [header.index(name) for name in names]
+            while True:
+                rows = list(itertools.islice(reader, chunk_rows))
+                if not rows:
+                    return
+                yield {name: _to_array([row[position] for row in rows]) for name, position in zip(names, positions)}
+
+    elif format == 'json':
+        with open(filename, 'r') as jsonfile:
+            names = columns
+            while True:
+                lines = list(itertools.islice(jsonfile, chunk_rows))
+                if not lines:
+                    return
+                records = []
+                for line in lines:
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError as e:
+                        print(f"Error decoding JSON: {e}")
+                if not records:
+                    continue
+                if names is None:
+                    names = list(records[0].keys())
+                yield {name: _to_array([record[name] for record in records]) for name in names}
+
+    else:
+        raise ValueError(f"Unsupported data format: {format}")
+
+class MinMaxDownsampler:
+    """
+    Reduces a stream of (x, y) points to at most 2 * `buckets` points for plotting.
+
+    The x range is split into `buckets` equal buckets, and only the points with the lowest and
+    highest y of each bucket are kept, so spikes survive downsampling (unlike taking every n-th
+    point). Points can be added in batches, in any order: when a batch falls outside the
+    current range, the bucket width doubles (extending the range to the left or right) until it
+    fits. Doubled buckets are exactly pairs of old ones, so the kept points stay the true
+    extremes of their bucket.
+    """
+
+    def __init__(self, buckets=2000):
+        self.buckets = max(2, buckets + buckets % 2)  # Even, so the range can grow to the left.
+        self.x = np.empty(0, dtype=np.float64)
+        self.y = np.empty(0, dtype=np.float64)
+        self.count = 0  # Points added.
+        self._start = None
+        self._width = None
+
+    def add(self, x, y):
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        finite = np.isfinite(x) & np.isfinite(y)
+        x, y = x[finite], y[finite]
+        self.count += len(x)
+        if len(x) == 0:
+            return
+        low, high = float(x.min()), float(x.max())
+        if self._start is None:
+            self._start = low
+            self._width = (high - low) / self.buckets * 1.001 or 1.0  # All of the first batch fits.
+        while low < self._start:
+            self._start -= self.buckets * self._width  # The old range becomes the right half.
+            self._width *= 2
+        while high >= self._start + self.buckets * self._width:
+            self._width *= 2
+
+        x = np.concatenate((self.x, x))
+        y = np.concatenate((self.y, y))
+        bucket = np.minimum(((x - self._start) // self._width).astype(np.int64), self.buckets - 1)
+        order = np.lexsort((y, bucket))  # By bucket, then by y.
+        bucket = bucket[order]
+        starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+        ends = np.r_[starts[1:], len(bucket)] - 1
+        keep = np.unique(np.concatenate((order[starts], order[ends])))
+        keep = keep[np.argsort(x[keep], kind='stable')]
+        self.x, self.y = x[keep], y[keep]
+
+def downsample_minmax(x, y, buckets=2000):
+    """Returns the at most 2 * `buckets` points of (x, y) kept by a MinMaxDownsampler, sorted by x."""
+    downsampler = MinMaxDownsampler(buckets)
+    downsampler.add(x, y)
+    return downsampler.x, downsampler.y
+
+def visualize_data(filename, format='csv', x='time_step', y='collected_resources', buckets=2000, chunk_rows=100_000):
+    """
+    Visualizes data using Matplotlib (example: resource collection over time).
+
+    The file is streamed in chunks through a MinMaxDownsampler, so memory stays bounded
+    whatever its size; at most 2 * `buckets` points are plotted.
+    """
     import matplotlib.pyplot as plt
 
-    data = load_data(filename, format)
-    if not data:
+    downsampler = MinMaxDownsampler(buckets)
+    try:
+        for batch in iter_data(filename, format, columns=[x, y], chunk_rows=chunk_rows):
+            downsampler.add(batch[x], batch[y])
+    except FileNotFoundError:
+        print(f"File not found: {filename}")
+        return
+    except KeyError as e:
+        print(f"Missing key in data: {e}.  Data must have `{x}` and `{y}` keys.")
+        return
+    except Exception as e:
+        print(f"Error loading data: {e}")
+        return
+    if downsampler.count == 0:
         print("No data to visualize.")
         return
 
     try:
-        # Assuming data contains 'time_step' and 'collected_resources' keys
-        time_steps = [int(d['time_step']) for d in data]
-        collected_resources = [float(d['collected_resources']) for d in data]
-
-        plt.plot(time_steps, collected_resources)
-        plt.xlabel("Time Step")
-        plt.ylabel("Collected Resources")
-        plt.title("Resource Collection Over Time")
+        x_label, y_label = x.replace('_', ' ').title(), y.replace('_', ' ').title()  # e.g. "Time Step"
+        plt.plot(downsampler.x, downsampler.y)
+        plt.xlabel(x_label)
+        plt.ylabel(y_label)
+        plt.title(f"{y_label} Over {x_label}")
         plt.show()
 
-    except KeyError as e:
-        print(f"Missing key in data: {e}.  Data must have `time_step` and `collected_resources` keys.")
     except Exception as e:
         print(f"Error visualizing data: {e}")
 
@@ -0,0 +1,104 @@
+# src/utils/shared_memory.py
+import weakref
+from multiprocessing import shared_memory, resource_tracker
+import numpy as np
+
+def prepare_workers():
+    """
+    Starts this process's shared memory resource tracker before worker processes are created.
+
+    Workers inherit the running tracker; if they start their own instead, it unlinks every
+    block they attached to as soon as they exit. Call this before starting workers that will
+    attach to blocks created later.
+    """
+    resource_tracker.ensure_running()
+
+def _attach_block(name):
+    """Attaches to an existing shared memory block without registering it for cleanup in this process."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+def _map_block(block, size):
+    """
+    Returns a uint8 array over the first `size` bytes of a block, which closes the block once
+    it and every view of it have been freed.
+
+    Closing a block unmaps its memory, and NumPy arrays over `block.buf` don't stop that, so
+    closing it while views are still in use would leave them dangling. Arrays made from this one
+    keep it alive (it is their base), so the block is only closed after the last of them.
+    """
+    root = np.ndarray(size, dtype=np.uint8, buffer=block.buf)
+    weakref.finalize(root, block.close)
+    return root
+
+class SharedArrays:
+    """
+    A set of named NumPy arrays living in `multiprocessing.shared_memory` blocks.
+
+    The creating process owns the blocks and unlinks them on `close()`. Other processes
+    attach with `SharedArrays.attach(spec)`, where `spec` is the small picklable dict from
+    `.spec`, and get NumPy views onto the same memory (no copies, no pickling of the data).
+    Each process closes its handle on a block once `close()` was called and no view of the
+    block is left.
+    """
+
+    def __init__(self, arrays=None, _blocks=None, _spec=None):
+        self._blocks = {}
+        self.spec = {}  # name -> (block name, shape, dtype string)
+        self.arrays = {}
+        self._owner = _blocks is None
+        if _blocks is not None:
+            self._blocks = _blocks
+            self.spec = _spec
+            for name, (_, shape, dtype) in _spec.items():
+                dtype = np.dtype(dtype)
+                nbytes = int(np.prod(shape)) * dtype.itemsize
+                self.arrays[name] = _map_block(_blocks[name], nbytes).view(dtype).reshape(shape)
+            return
+
+        for name, array in (arrays or {}).items():
+            array = np.ascontiguousarray(array)
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            view = _map_block(block, array.nbytes).view(array.dtype).reshape(array.shape)
+            view[...] = array
+            self._blocks[name] = block
+            self.spec[name] = (block.name, array.shape, array.dtype.str)
+            self.arrays[name] = view
+
+    @classmethod
+    def allocate(cls, shapes):
+        """Creates zero-filled shared arrays from {name: (shape, dtype)}."""
+        return cls({name: np.zeros(shape, dtype=dtype) for name, (shape, dtype) in shapes.items()})
+
+    @classmethod
+    def attach(cls, spec):
+        """Attaches to arrays created in another process."""
+        blocks = {name: _attach_block(block_name) for name, (block_name, _, _) in spec.items()}
+        return cls(_blocks=blocks, _spec=spec)
+
+    def __getitem__(self, name):
+        return self.arrays[name]
+
+    def close(self):
+        """
+        Releases this process's handles; the owning process also unlinks the blocks.
+
+        Views already handed out stay valid until they are garbage collected; the blocks are
+        closed after the last of them.
+        """
+        self.arrays = {}  # The blocks no view uses any more are closed here.
+        for block in self._blocks.values():
+            if self._owner:
+                try:
+                    block.unlink()
+                except FileNotFoundError:
+                    pass  # Already removed (e.g. by a crashed worker's cleanup).
+        self._blocks = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
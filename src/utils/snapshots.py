@@ -0,0 +1,188 @@
+# src/utils/snapshots.py
+import json
+import os
+import numpy as np
+
+INDEX_FILE = "index.json"
+
+# Per-tick agent state: the columns of simulation_data.csv.
+AGENT_SNAPSHOT_DTYPE = np.dtype([
+    ("time_step", np.int64),
+    ("agent_id", np.int64),
+    ("agent_x", np.float32),
+    ("agent_y", np.float32),
+    ("energy", np.float32),
+    ("collected_resources", np.int32),
+])
+
+def agent_snapshot(agents):
+    """
+    Returns the AGENT_SNAPSHOT_DTYPE columns (without time_step) for a list of agents. agent_id
+    is the run-wide id from Population.add (-1 for agents never added to a Population).
+    """
+    return {
+        "agent_id": [-1 if agent.agent_id is None else agent.agent_id for agent in agents],
+        "agent_x": [agent.x for agent in agents],
+        "agent_y": [agent.y for agent in agents],
+        "energy": [agent.energy for agent in agents],
+        "collected_resources": [agent.collected_resources for agent in agents],
+    }
+
+def _read_index(directory):
+    with open(os.path.join(directory, INDEX_FILE)) as f:
+        index = json.load(f)
+    index["dtype"] = np.dtype([(name, type_) for name, type_ in index["dtype"]])
+    return index
+
+class SnapshotWriter:
+    """
+    Appends per-tick rows (e.g. the state of every agent) to a columnar snapshot in `directory`.
+
+    Rows are buffered and written in chunks of `chunk_rows` rows, one `.npz` file per chunk
+    holding one array per column (compressed unless `compress=False`). `index.json` lists the
+    columns and dtypes and, for every chunk, its file, row count and first and last tick, so
+    SnapshotReader can load just the columns and chunks it needs. The index is rewritten after
+    each chunk; opening a directory that already holds a snapshot appends to it.
+    """
+
+    def __init__(self, directory, dtype=AGENT_SNAPSHOT_DTYPE, chunk_rows=65536, tick_column="time_step", compress=True):
+        self.directory = directory
+        self.dtype = np.dtype(dtype)
+        self.chunk_rows = chunk_rows
+        self.compress = compress
+        if os.path.exists(os.path.join(directory, INDEX_FILE)):
+            index = _read_index(directory)
+            if index["dtype"] != self.dtype:
+                raise ValueError(f"Snapshot in {directory} has columns {index['dtype']}, not {self.dtype}")
+            self.tick_column = index["tick_column"]
+            self.chunks = index["chunks"]
+        else:
+            os.makedirs(directory, exist_ok=True)
+            self.tick_column = tick_column
+            self.chunks = []
+        if self.tick_column not in self.dtype.names:
+            raise ValueError(f"Tick column {self.tick_column!r} is not one of {self.dtype.names}")
+        self._pending = []  # Structured arrays not written yet.
+        self._pending_rows = 0
+
+    def append(self, tick, rows):
+        """
+        Adds the rows of one tick: a structured array, or a dict of equally long columns. The
+        tick column is set to `tick`; other missing columns are 0.
+        """
+        if isinstance(rows, np.ndarray) and rows.dtype.names is not None:
+            count = len(rows)
+            columns = {name: rows[name] for name in rows.dtype.names}
+        else:
+            columns = rows
+            count = len(next(iter(columns.values()))) if columns else 0
+        block = np.zeros(count, dtype=self.dtype)
+        for name, values in columns.items():
+            block[name] = values
+        block[self.tick_column] = tick
+        self._pending.append(block)
+        self._pending_rows += count
+        while self._pending_rows >= self.chunk_rows:
+            self._write_chunk(self.chunk_rows)
+
+    def flush(self):
+        """Writes the buffered rows as a (possibly short) chunk."""
+        if self._pending_rows:
+            self._write_chunk(self._pending_rows)
+
+    def _write_chunk(self, rows):
+        pending = np.concatenate(self._pending)
+        chunk, rest = pending[:rows], pending[rows:]
+        self._pending = [rest] if len(rest) else []
+        self._pending_rows = len(rest)
+
+        name = f"chunk_{len(self.chunks):05d}.npz"
+        save = np.savez_compressed if self.compress else np.savez
+        with open(os.path.join(self.directory, name), "wb") as f:
+            save(f, **{column: chunk[column] for column in self.dtype.names})
+        ticks = chunk[self.tick_column]
+        self.chunks.append({"file": name, "rows": len(chunk),
+                            "first_tick": int(ticks.min()), "last_tick": int(ticks.max())})
+        self._write_index()
+
+    def _write_index(self):
+        index = {
+            "version": 1,
+            "dtype": [(name, self.dtype[name].str) for name in self.dtype.names],
+            "tick_column": self.tick_column,
+            "chunks": self.chunks,
+        }
+        path = os.path.join(self.directory, INDEX_FILE)
+        with open(path + ".tmp", "w") as f:
+            json.dump(index, f, indent=1)
+        os.replace(path + ".tmp", path)  # Readers never see a half-written index.
+
+    def close(self):
+        self.flush()
+        if not self.chunks:
+            self._write_index()  # An empty snapshot is still a snapshot.
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class SnapshotReader:
+    """
+    Reads a snapshot written by SnapshotWriter, loading only the chunks whose ticks overlap the
+    requested range and, in those, only the requested columns.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        index = _read_index(directory)
+        self.dtype = index["dtype"]
+        self.tick_column = index["tick_column"]
+        self.chunks = index["chunks"]
+
+    @property
+    def columns(self):
+        return self.dtype.names
+
+    def __len__(self):
+        return sum(chunk["rows"] for chunk in self.chunks)
+
+    def iter_chunks(self, columns=None, start=None, stop=None):
+        """
+        Yields one structured array per chunk with the given `columns` (default: all), holding
+        the rows with start <= tick < stop (either bound may be None).
+        """
+        columns = list(self.columns if columns is None else columns)
+        unknown = set(columns) - set(self.columns)
+        if unknown:
+            raise KeyError(f"Unknown snapshot columns: {sorted(unknown)}")
+        dtype = np.dtype([(name, self.dtype[name]) for name in columns])
+        for chunk in self.chunks:
+            if (start is not None and chunk["last_tick"] < start) or (stop is not None and chunk["first_tick"] >= stop):
+                continue
+            with np.load(os.path.join(self.directory, chunk["file"])) as data:  # Members load lazily.
+                block = np.empty(chunk["rows"], dtype=dtype)
+                for name in columns:
+                    block[name] = data[name]
+                partial = (start is not None and chunk["first_tick"] < start) or (stop is not None and chunk["last_tick"] >= stop)
+                if partial:  # The range starts or ends within this chunk.
+                    ticks = block[self.tick_column] if self.tick_column in columns else data[self.tick_column]
+                    keep = np.ones(len(ticks), dtype=bool)
+                    if start is not None:
+                        keep &= ticks >= start
+                    if stop is not None:
+                        keep &= ticks < stop
+                    block = block[keep]
+            yield block
+
+    def read(self, columns=None, start=None, stop=None):
+        """Returns the rows with start <= tick < stop as one structured array."""
+        blocks = list(self.iter_chunks(columns, start, stop))
+        if not blocks:
+            return np.empty(0, dtype=np.dtype([(name, self.dtype[name]) for name in (columns or self.columns)]))
+        return np.concatenate(blocks)
+
+    def column(self, name, start=None, stop=None):
+        """Returns one column as a plain array."""
+        return self.read([name], start, stop)[name]
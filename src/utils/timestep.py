@@ -0,0 +1,64 @@
+# src/utils/timestep.py
+import numpy as np
+
+class FixedTimestep:
+    """
+    Accumulator for running a simulation in fixed steps, independently of the frame rate.
+
+    Each frame adds its duration (times `rate`, e.g. a simulation speed) to the accumulator,
+    and `advance` returns how many whole steps of `step` fit in it, at most `max_steps`. The
+    leftover fraction of a step is `alpha`, used to interpolate the rendered state between the
+    last two steps. When the simulation falls behind (a frame needed more than `max_steps`),
+    `should_render` skips up to `max_skipped_frames` frames in a row so the time goes to
+    catching up; the backlog is capped at `max_steps` steps, so a long stall slows the
+    simulation down instead of making it spiral.
+    """
+
+    def __init__(self, step, max_steps=8, max_skipped_frames=3, max_frame_time=0.25):
+        self.step = step
+        self.max_steps = max_steps
+        self.max_skipped_frames = max_skipped_frames
+        self.max_frame_time = max_frame_time  # Longer frames (e.g. a dragged window) count as this.
+        self.accumulator = 0.0
+        self.steps = 0  # Steps taken since creation.
+        self.behind = False  # The last frame left a backlog of whole steps.
+        self.skipped_frames = 0
+
+    @property
+    def alpha(self):
+        """Fraction of a step between the last step and the current time (0..1)."""
+        return min(self.accumulator / self.step, 1.0)
+
+    def advance(self, frame_time, rate=1.0):
+        """Adds a frame's duration and returns the number of steps to run now."""
+        self.accumulator += min(frame_time, self.max_frame_time) * rate
+        steps = min(int(self.accumulator // self.step), self.max_steps)
+        self.accumulator -= steps * self.step
+        self.behind = self.accumulator >= self.step
+        if self.behind:
+            self.accumulator = min(self.accumulator, self.max_steps * self.step)
+        self.steps += steps
+        return steps
+
+    def should_render(self):
+        """Returns False for frames that should be skipped to catch up."""
+        if self.behind and self.skipped_frames < self.max_skipped_frames:
+            self.skipped_frames += 1
+            return False
+        self.skipped_frames = 0
+        return True
+
+def snapshot_positions(agents):
+    """Returns {id(agent): (x, y)} for interpolating from this state later."""
+    return {id(agent): agent.get_position() for agent in agents}
+
+def interpolate_positions(agents, previous, alpha):
+    """
+    Returns an (n, 2) array of the agents' positions `alpha` of the way from a snapshot to now.
+
+    Agents missing from the snapshot (born since) are at their current position.
+    """
+    current = np.array([agent.get_position() for agent in agents], dtype=np.float64).reshape(-1, 2)
+    before = np.array([previous.get(id(agent), position) for agent, position in zip(agents, current)],
+                      dtype=np.float64).reshape(-1, 2)
+    return before + (current - before) * alpha
@@ -84,14 +84,7 @@ def create_max_energy_graph(agent):
     # Get the list of ages, then get the max_energy to create a list.
     max_age = 100  # Test value.
     ages = np.arange(0, max_age)
-    max_energies = []
-
-    # Set the values, based on ages, with a scale of 1 to max.
-    for age in ages:
-        agent.age = age  # Change its age.
-        max_energy = agent.calculate_max_energy()  # Calculate the new value.
-        max_energies.append(max_energy)  # Append it to the array.
-        # agent.age = 0 #Reset back.
+    max_energies = agent.max_energy_curve(max_age - 1)  # Look up every age at once.
 
     # Create the plot.
     fig, ax = plt.subplots(figsize=(4, 4), dpi=100)  # set the size.
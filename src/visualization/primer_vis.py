@@ -1,10 +1,14 @@
 # src/visualization/primer_vis.py
+import math
 import sys  # Import sys to call sys.exit()
 import pygame
 from typing import Optional
 from src.environment import terrain as t, resource as r
-from src.visualization.vis_components import terrain_renderer, resource_renderer, agent_renderer, sidebar
+from src.visualization.vis_components import terrain_renderer, resource_renderer, agent_renderer, sidebar, overview_renderer
+from src.visualization.vis_components.render_queue import RenderQueue, OVERLAY_DEPTH
+from src.visualization.vis_components.dirty_frame import DirtyFrame
 from src.visualization.vis_components.zoom import ZoomManager
+from src.agent import social
 import src.main as main
 
 # --- Constants ---
@@ -23,11 +27,25 @@ font = pygame.font.Font(None, 24)
 from src.visualization.vis_components.position_manager import PositionManager
 position_manager: Optional[PositionManager] = None
 
-# Initialize Zoom Manager
-zoom_manager = ZoomManager(initial_scale=1.0)
-
-def update_display(terrain, terrain_type_map, resource_map, agents, config, group_letters, terrain_sprites, constrained_heights):
-    global position_manager
+# Initialize Zoom Manager (zooming out far switches to the overview renderer)
+zoom_manager = ZoomManager(initial_scale=1.0, min_scale=0.2)
+overview_mode = False  # Toggled with L; also used automatically when tiles get too small.
+
+# The game area, drawn onto the display surface directly and updated by dirty rectangles.
+game_frame = DirtyFrame(screen.subsurface((0, 0, GAME_WIDTH, SCREEN_HEIGHT)))
+
+# Spatial hash of the agents for culling, kept between frames and updated in place.
+agent_hash: Optional[social.SpatialHash] = None
+
+def update_display(terrain, terrain_type_map, resource_map, agents, config, group_letters, terrain_sprites, constrained_heights, deaths=None, positions=None, terrain_color_map=None, changed_cells=None):
+    """
+    Draws one frame; `positions` optionally overrides where agents are drawn (e.g. interpolated).
+    With a `terrain_color_map`, a minimap is drawn and the overview renderer can be used.
+    `changed_cells` are the (ys, xs) whose height or terrain type changed since the last frame
+    (EnvironmentManager.take_changed_cells); without them the terrain is taken to be static.
+    Only the rectangles that changed are pushed to the display; panning or zooming redraws it all.
+    """
+    global position_manager, agent_hash
     # If position_manager is not initialized, do it now using terrain dimensions.
     if position_manager is None:
         map_height, map_width = terrain.shape
@@ -38,39 +56,71 @@ def update_display(terrain, terrain_type_map, resource_map, agents, config, grou
             map_height=map_height
         )
     
-    screen.fill((0, 100, 200))  # Sky color background
-
     # Sync the position manager's zoom with the zoom manager.
     scale = zoom_manager.get_scale()
     position_manager.set_zoom(scale)
 
-    # Create a surface that matches the game area size.
-    game_surface = pygame.Surface((GAME_WIDTH, SCREEN_HEIGHT))
-
-    # Draw terrain, resources, and agents directly onto game_surface.
-    terrain_renderer.draw_terrain(
-        game_surface, terrain, terrain_type_map, position_manager, terrain_sprites, constrained_heights, scale=1.0
-    )
-    resource_renderer.draw_resources(
-        game_surface, resource_map, terrain, position_manager, terrain_sprites, scale=1.0
-    )
-    agent_renderer.draw_agents(
-        game_surface, agents, terrain, position_manager, terrain_sprites, scale=1.0
-    )
-
-    # Blit the game_surface at (0, 0) in the main screen.
-    screen.blit(game_surface, (0, 0))
+    # Every frame, so the cubes are current when switching back from the overview.
+    terrain_layer = terrain_renderer.get_terrain_layer(terrain_sprites)
+    if changed_cells is not None:
+        terrain_layer.update_cells(*changed_cells, terrain_type_map, constrained_heights)
 
-    # Draw sidebar.
-    sidebar.draw_sidebar(
+    overview = None
+    if terrain_color_map is not None:
+        overview = overview_renderer.update_overview(
+            terrain_color_map, terrain, terrain_type_map, resource_map, agents, positions, changed_cells
+        )
+    if overview is not None and (overview_mode or overview_renderer.use_overview(position_manager)):
+        # One pixel per cell, scaled: cubes would be (nearly) sub-pixel. Redrawn every frame.
+        game_frame.invalidate()
+        game_frame.surface.fill(overview_renderer.BACKGROUND_COLOR)
+        overview.draw_world(game_frame.surface, position_manager)
+        overview.draw_minimap(game_frame.surface, position_manager)
+        dirty = [game_frame.surface.get_rect().move(game_frame.offset)]
+    else:
+        # The terrain is the frame's background, redrawn only when the camera or the terrain changes.
+        terrain_layer.sync(terrain_type_map, constrained_heights, position_manager.zoom)
+        view = (position_manager.zoom, position_manager.base_x, position_manager.base_y, terrain_layer, terrain_layer.version)
+        if game_frame.set_view(view):
+            game_frame.background.fill((0, 0, 0))
+            terrain_layer.draw(game_frame.background, terrain_type_map, position_manager, constrained_heights)
+
+        # Only agents that changed cell are re-filed in the hash.
+        if agent_hash is None:
+            agent_hash = social.build_spatial_hash(agents)
+        else:
+            social.update_spatial_hash(agent_hash, agents)
+
+        # Everything else goes into one depth-sorted draw list; only what changed is redrawn.
+        queue = RenderQueue()
+        resource_renderer.draw_resources(
+            game_frame.surface, resource_map, terrain, position_manager, terrain_sprites, scale=1.0,
+            queue=queue, terrain_layer=terrain_layer
+        )
+        agent_renderer.draw_agents(
+            game_frame.surface, agents, terrain, position_manager, terrain_sprites, scale=1.0,
+            spatial_hash=agent_hash, positions=positions,
+            queue=queue, terrain_layer=terrain_layer
+        )
+        terrain_layer.add_occluders(queue, position_manager)
+        if overview is not None:
+            # Over everything; a new surface (so redrawn) only when the map or the viewport changed.
+            minimap, minimap_position = overview.minimap(position_manager, SCREEN_HEIGHT)
+            queue.add(minimap, minimap_position, OVERLAY_DEPTH, order=math.inf)
+        dirty = game_frame.draw(queue.take())
+
+    # The sidebar is redrawn (and pushed) only when its content changed.
+    if sidebar.draw_sidebar(
         screen, agents, font, config,
-        GAME_WIDTH, SCREEN_HEIGHT, SIDEBAR_WIDTH, group_letters, terrain_type_map
-    )
+        GAME_WIDTH, SCREEN_HEIGHT, SIDEBAR_WIDTH, group_letters, terrain_type_map, deaths=deaths
+    ):
+        dirty.append(pygame.Rect(GAME_WIDTH, 0, SIDEBAR_WIDTH, SCREEN_HEIGHT))
 
-    pygame.display.flip()
+    pygame.display.update(dirty)
 
 def handle_events(config, dt):
     """Handles events (quitting, key presses including Alt+F4, zoom, and continuous camera panning)."""
+    global overview_mode
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             pygame.quit()
@@ -93,6 +143,8 @@ def handle_events(config, dt):
                 config['simulation_speed'] = min(config['simulation_speed'] + 0.01, 1)
             elif event.key == pygame.K_2:
                 config['simulation_speed'] = max(config['simulation_speed'] - 0.01, 0.01)
+            elif event.key == pygame.K_l:
+                overview_mode = not overview_mode
         elif zoom_manager.handle_zoom(event):
             return False
 
@@ -145,6 +197,9 @@ if __name__ == '__main__':
         def calculate_max_energy(self):
             return 100 - self.age
 
+        def max_energy_curve(self):
+            return [100 - age for age in range(self.age + 1)]
+
         def is_alive(self):
             return self.energy > 0
 
@@ -168,12 +223,14 @@ if __name__ == '__main__':
         terrain_renderer.TILE_WIDTH, terrain_renderer.TILE_HEIGHT
     )
 
+    constrained_heights = main.calculate_constrained_heights(_terrain, terrain_renderer.TILE_HEIGHT) # The terrain doesn't change here.
+
     clock = pygame.time.Clock()
 
     while running:
         dt = clock.tick(60) / 1000.0
         # Process events; if a quit event is detected, the program will exit immediately.
         handle_events(config, dt)
-        constrained_heights = main.calculate_constrained_heights(_terrain, terrain_renderer.TILE_HEIGHT) #This is what is needed
-        update_display(_terrain, _terrain_type_map, resource_map, agents, config, group_letters, terrain_sprites, constrained_heights)
+        update_display(_terrain, _terrain_type_map, resource_map, agents, config, group_letters, terrain_sprites, constrained_heights,
+                       terrain_color_map=_terrain_color_map)
     close()
\ No newline at end of file
@@ -1,5 +1,9 @@
 # src/visualization/vis_components/agent_renderer.py
 import pygame
+import numpy as np
+from .text_cache import cache as text_cache
+from . import sprite_atlas
+from .render_queue import RenderQueue, OVERLAY_DEPTH
 
 AGENT_COLOR = (255, 0, 0)  # Red
 DEAD_AGENT_COLOR = (128, 128, 128)  # Gray color for dead agents
@@ -10,54 +14,117 @@ def grid_to_iso(grid_x, grid_y, height, tile_width, tile_height):
     screen_y = (grid_x + grid_y) * tile_height / 2 - height
     return screen_x, screen_y
 
-def draw_agents(screen, agents, terrain, position_manager, terrain_sprites, scale=1.0): # Added scale
-    """Draws the agents on the screen in isometric projection."""
-    font = pygame.font.Font(None, int(20*scale))  # Create a font for agent labels, scale size
+def group_label_indices(groups):
+    """Returns each agent's 1-based index within its group, in list order (the number in "A1", "B2")."""
+    groups = np.asarray(groups)
+    indices = np.zeros(len(groups), dtype=np.int64)
+    for group in np.unique(groups):
+        members = groups == group
+        indices[members] = np.arange(1, members.sum() + 1)
+    return indices
+
+class LabelIndexCache:
+    """Keeps the group_label_indices of a SpatialHash's agents until their groups change."""
+
+    def __init__(self):
+        self._key = None
+        self._indices = None
+
+    def get(self, spatial_hash, count):
+        """Returns the label indices of agent ids 0..count-1."""
+        key = (spatial_hash, spatial_hash.groups_version, count)
+        if key != self._key:
+            self._indices = group_label_indices(spatial_hash.groups[:count])
+            self._key = key
+        return self._indices
+
+label_cache = LabelIndexCache()
+
+def get_agent_sprite(color, alive, scale=1.0, atlas=None):
+    """Returns the body of an agent: upright for living agents, lying down for dead ones."""
+    atlas = atlas if atlas is not None else sprite_atlas.atlas
+    color = tuple(color) if alive else DEAD_AGENT_COLOR
+
+    def build(_zoom):  # Agents keep their size when zooming.
+        size = (int(10*scale), int(20*scale)) if alive else (int(20*scale), int(10*scale))
+        surface = pygame.Surface(size)
+        surface.fill(color)
+        return surface
+
+    return atlas.get(("agent", color, alive, scale), 1.0, build)
+
+def draw_agents(screen, agents, terrain, position_manager, terrain_sprites, scale=1.0, spatial_hash=None, positions=None,
+                queue=None, terrain_layer=None): # Added scale
+    """
+    Draws the agents on the screen in isometric projection.
+
+    With a spatial_hash built over `agents` (ids = list indices), only the agents inside the
+    visible cell range are drawn. `positions` (an (n, 2) array) overrides where the agents are
+    drawn, e.g. interpolated between two simulation steps. With a `terrain_layer`, agents stand
+    on the top of the cube they are on; with a `queue`, bodies are added to it depth-sorted
+    (hidden by terrain in front) and labels as an overlay, instead of being drawn right away.
+    """
+    font = text_cache.get_font(int(20*scale))  # Font for agent labels, scale size
     cell_size = position_manager.get_terrain_cell_size()
     tile_width = cell_size * 2 * scale #Scale size to position
     tile_height = cell_size * scale #Scale size to position
-    agent_size = position_manager.get_agent_size() * scale #Scale size
-
-    group_indices = {}  # Dictionary to track indices within each group
 
-    for agent in agents:
-        x, y = agent.get_position()
-        height_value = terrain[int(y), int(x)] * 20 * scale  # Scale height and agent
+    if spatial_hash is not None:
+        map_height, map_width = terrain.shape
+        if terrain_layer is not None:
+            min_height, max_height = (h * scale for h in terrain_layer.height_range)
+        else:
+            min_height, max_height = 0.0, float(terrain.max()) * 20 * scale
+        x0, y0, x1, y1 = position_manager.get_visible_cells(
+            map_width, map_height, tile_width, tile_height, min_height, max_height,
+            margin=int(tile_width + 40 * scale)  # Agent and label size
+        )
+        visible = np.sort(spatial_hash.query_rect(x0, y0, x1, y1))
+        # Labels are numbered over all agents, so culled agents keep their numbers.
+        group_indices = label_cache.get(spatial_hash, len(agents))
+    else:
+        visible = np.arange(len(agents))
+        group_indices = group_label_indices([agent.group for agent in agents])
+    if len(visible) == 0:
+        return
 
-        screen_x, screen_y = grid_to_iso(x, y, height_value, tile_width, tile_height) #Now scales to position
-        screen_x, screen_y = position_manager.get_render_position(screen_x, screen_y)
+    if positions is None:
+        positions = np.array([agents[i].get_position() for i in visible], dtype=np.float64).reshape(-1, 2)
+    else:
+        positions = np.asarray(positions, dtype=np.float64)[visible]
+    xs, ys = positions[:, 0], positions[:, 1]
 
-        # Draw a rectangle for the agent
-        agent_x = screen_x + tile_width / 2 - 5*scale #Scale size
-        agent_y = screen_y + tile_height / 2 - 10*scale #Scale size
+    if terrain_layer is not None:
+        feet_xs, feet_ys = terrain_layer.anchor(xs, ys, position_manager, scale)  # Top of the cube
+    else:
+        height_values = terrain[ys.astype(np.int64), xs.astype(np.int64)] * 20 * scale  # Scale height and agent
+        screen_xs, screen_ys = grid_to_iso(xs, ys, height_values, tile_width, tile_height) #Now scales to position
+        screen_xs, screen_ys = position_manager.get_render_position(screen_xs, screen_ys)
+        feet_xs = screen_xs + tile_width / 2
+        feet_ys = screen_ys + tile_height / 2 + 10*scale
 
+    local_queue = queue is None
+    if local_queue:
+        queue = RenderQueue()
+    outline = max(1, int(scale))
+    for i, x, y, foot_x, foot_y in zip(visible.tolist(), xs.tolist(), ys.tolist(), feet_xs.tolist(), feet_ys.tolist()):
+        agent = agents[i]
         # Use gray color for dead agents and draw them horizontally
-        agent_display_color = DEAD_AGENT_COLOR if not agent.is_alive() else agent.color
-        if agent.is_alive():
-            pygame.draw.rect(screen, agent_display_color, (int(agent_x), int(agent_y), int(10*scale), int(20*scale))) #Scale size
-        else:
-            # Draw dead agents horizontally (swapped width and height)
-            pygame.draw.rect(screen, agent_display_color, (int(agent_x), int(agent_y + 5*scale), int(20*scale), int(10*scale))) #Scale size
+        body = get_agent_sprite(agent.color, agent.is_alive(), scale)
+        body_x = int(foot_x) - body.get_width() // 2
+        body_y = int(foot_y) - body.get_height()
+        cell = (int(x), int(y))
+        queue.add(body, (body_x, body_y), cell[0] + cell[1], order=foot_y, cell=cell)
 
         # Create and render agent label (group letter + number)
         group_letter = chr(ord('A') + agent.group)  # Convert group number to letter (0->A, 1->B, etc)
-
-        # Get the index for this agent within its group
-        if agent.group not in group_indices:
-            group_indices[agent.group] = 1  # Start index at 1 for each group
-        else:
-            group_indices[agent.group] += 1
-        group_index = group_indices[agent.group] #Set the index
-
-        label_text = f"{group_letter}{group_index}"  # Create label text (e.g., "A1", "A2", "B1")
-        label_surface = font.render(label_text, True, (255, 255, 255))  # White text
+        label_text = f"{group_letter}{group_indices[i]}"  # Create label text (e.g., "A1", "A2", "B1")
+        # Label with its black outline for better visibility, rasterized once per label text
+        label_surface = text_cache.outlined(font, label_text, (255, 255, 255), (0, 0, 0), outline)
 
         # Position label above agent
-        label_x = int(agent_x) - label_surface.get_width() // 2 + 5*scale  # Center label horizontally and scale.
-        label_y = int(agent_y) - 20*scale  # Position above agent and scale.
-
-        # Draw label with black outline for better visibility
-        outline_positions = [(x,y) for x in [-1,1] for y in [-1,1]]
-        for dx, dy in outline_positions:
-            screen.blit(font.render(label_text, True, (0, 0, 0)), (int(label_x + dx*scale), int(label_y + dy*scale))) #Scale
-        screen.blit(label_surface, (label_x, label_y))
\ No newline at end of file
+        label_x = int(foot_x) - label_surface.get_width() // 2  # Center label horizontally
+        label_y = int(foot_y) - int(20*scale) - int(20*scale) - outline  # Above an upright agent
+        queue.add(label_surface, (label_x, label_y), OVERLAY_DEPTH, order=foot_y)
+    if local_queue:
+        queue.draw(screen)
@@ -0,0 +1,86 @@
+# src/visualization/vis_components/dirty_frame.py
+import pygame
+
+def merge_rects(rects):
+    """Returns rects covering the same area where no two overlap (overlapping ones are unioned)."""
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+def _blit_rect(blit):
+    surface, position = blit[0], blit[1]
+    size = blit[2][2:] if len(blit) > 2 else surface.get_size()
+    return pygame.Rect(position, size)
+
+class DirtyFrame:
+    """
+    A persistent frame that is only redrawn where it changed.
+
+    The static background (the terrain) is drawn into `background` when the view changes;
+    everything else is passed to `draw` each frame as a list of blits. Blits that were not
+    in the previous frame, and previous ones that are gone (an agent moved, a label changed),
+    mark their rects dirty: only there is the background restored and the blits overlapping
+    it drawn again, clipped to the dirty rects. `draw` returns the dirty rects in screen
+    coordinates, for `pygame.display.update`.
+    """
+
+    def __init__(self, surface):
+        self.surface = surface  # e.g. the game area of the display surface.
+        self.background = pygame.Surface(surface.get_size())
+        self.offset = surface.get_abs_offset()
+        self._view = None
+        self._drawn = {}  # Blit arguments on the surface -> their rect.
+        self._full = True
+        self.full_redraws = 0
+
+    def set_view(self, view):
+        """
+        Returns True when `view` (anything identifying what the background shows, e.g. the
+        camera and terrain version) changed: the background must then be redrawn, and the
+        next `draw` redraws everything.
+        """
+        if view == self._view:
+            return False
+        self._view = view
+        self.invalidate()
+        return True
+
+    def invalidate(self):
+        """Makes the next `draw` redraw the whole frame."""
+        self._full = True
+
+    def draw(self, blits):
+        """Brings the surface up to date with `blits` (in drawing order); returns the dirty screen rects."""
+        items = [(blit, _blit_rect(blit)) for blit in blits]
+        drawn = dict(items)
+        if self._full:
+            self._full = False
+            self.full_redraws += 1
+            self.surface.blit(self.background, (0, 0))
+            self.surface.blits(blits, doreturn=False)
+            self._drawn = drawn
+            return [self.surface.get_rect().move(self.offset)]
+
+        changed = [rect for blit, rect in self._drawn.items() if blit not in drawn]
+        changed += [rect for blit, rect in drawn.items() if blit not in self._drawn]
+        self._drawn = drawn
+        bounds = self.surface.get_rect()
+        dirty = merge_rects(rect for rect in (rect.clip(bounds) for rect in changed) if rect.width and rect.height)
+        if not dirty:
+            return []
+
+        clipped = [(self.background, rect, rect) for rect in dirty]
+        for blit, rect in items:
+            for index in rect.collidelistall(dirty):
+                part = rect.clip(dirty[index])
+                area_x, area_y = (blit[2][0], blit[2][1]) if len(blit) > 2 else (0, 0)
+                clipped.append((blit[0], part.topleft,
+                                (area_x + part.x - rect.x, area_y + part.y - rect.y, part.width, part.height)))
+        self.surface.blits(clipped, doreturn=False)
+        return [rect.move(self.offset) for rect in dirty]
@@ -0,0 +1,84 @@
+# src/visualization/vis_components/line_plot.py
+import pygame
+from .text_cache import cache as text_cache
+
+BACKGROUND_COLOR = (255, 255, 255)
+AXIS_COLOR = (0, 0, 0)
+LINE_COLOR = (31, 119, 180)  # Matplotlib's default blue
+MARGINS = (36, 8, 20, 22)  # Left, right, top, bottom space around the plot area.
+
+class LinePlot:
+    """
+    A line plot drawn with pygame that grows by appending points.
+
+    New points are drawn as new segments onto the existing surface. The whole plot is only
+    redrawn when a point falls outside the axes, which then grow by `headroom` so that it
+    stays rare (logarithmic in the data range). Both axes start at 0.
+    """
+
+    def __init__(self, width=400, height=200, title="", x_label="", y_label="",
+                 color=LINE_COLOR, font_size=16, headroom=1.2):
+        self.surface = pygame.Surface((width, height))
+        self.title = title
+        self.x_label = x_label
+        self.y_label = y_label
+        self.color = color
+        self.font = text_cache.get_font(font_size)
+        self.headroom = headroom
+        self.xs = []
+        self.ys = []
+        self.x_max = 1.0
+        self.y_max = 1.0
+        self._drawn = 0  # Points already on the surface.
+        self._stale = True  # Axes changed; redraw everything.
+        left, right, top, bottom = MARGINS
+        self.area = pygame.Rect(left, top, width - left - right, height - top - bottom)
+
+    def __len__(self):
+        return len(self.xs)
+
+    def extend(self, xs, ys):
+        """Appends points; x values are expected to be increasing."""
+        xs, ys = [float(x) for x in xs], [float(y) for y in ys]
+        if not xs:
+            return
+        self.xs.extend(xs)
+        self.ys.extend(ys)
+        if max(xs) > self.x_max:
+            self.x_max = max(xs) * self.headroom
+            self._stale = True
+        if max(ys) > self.y_max:
+            self.y_max = max(ys) * self.headroom
+            self._stale = True
+
+    def _to_screen(self, x, y):
+        return (self.area.left + x / self.x_max * (self.area.width - 1),
+                self.area.bottom - 1 - max(y, 0.0) / self.y_max * (self.area.height - 1))
+
+    def _draw_axes(self):
+        surface = self.surface
+        surface.fill(BACKGROUND_COLOR)
+        pygame.draw.rect(surface, AXIS_COLOR, self.area.inflate(2, 2), 1)
+        title = text_cache.render(self.font, self.title, AXIS_COLOR)
+        surface.blit(title, (self.area.centerx - title.get_width() // 2, 2))
+        x_label = text_cache.render(self.font, f"{self.x_label} (0-{self.x_max:.0f})", AXIS_COLOR)
+        surface.blit(x_label, (self.area.centerx - x_label.get_width() // 2, self.area.bottom + 4))
+        y_max = text_cache.render(self.font, f"{self.y_max:.0f}", AXIS_COLOR)
+        surface.blit(y_max, (self.area.left - y_max.get_width() - 3, self.area.top))
+        y_label = pygame.transform.rotate(text_cache.render(self.font, self.y_label, AXIS_COLOR), 90)
+        surface.blit(y_label, (2, self.area.centery - y_label.get_height() // 2))
+
+    def draw(self):
+        """Brings the surface up to date with the points and returns it."""
+        if self._stale:
+            self._draw_axes()
+            self._drawn = 0
+            self._stale = False
+        start = max(self._drawn - 1, 0)  # Connect to the last point already drawn.
+        if len(self.xs) - start >= 2:
+            points = [self._to_screen(x, y) for x, y in zip(self.xs[start:], self.ys[start:])]
+            pygame.draw.lines(self.surface, self.color, False, points)
+        elif len(self.xs) == 1 and self._drawn == 0:
+            self.surface.set_at([round(v) for v in self._to_screen(self.xs[0], self.ys[0])], self.color)
+        self._drawn = len(self.xs)
+        return self.surface
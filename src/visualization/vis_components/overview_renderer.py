@@ -0,0 +1,211 @@
+# src/visualization/vis_components/overview_renderer.py
+import math
+import numpy as np
+import pygame
+from src.environment import terrain as t
+from .resource_renderer import RESOURCE_COLOR
+from .agent_renderer import DEAD_AGENT_COLOR
+
+LOD_TILE_PIXELS = 8  # Below this tile width on screen, the world is drawn from the overview image.
+MINIMAP_SIZE = 160  # Longest side of the minimap, in pixels.
+MINIMAP_MARGIN = 10
+SHADE_MIN = 0.55  # Brightness of the lowest cells; the highest are drawn at full brightness.
+VIEWPORT_COLOR = (255, 255, 255)
+BACKGROUND_COLOR = (0, 100, 200)  # Sky colour around the map, so the image can be blitted opaque.
+
+TYPE_COLORS = {  # Colours of cells whose terrain type changed after generation (e.g. water dried up).
+    t.TERRAIN_SAND: t.COLOR_SAND,
+    t.TERRAIN_GRASS: t.COLOR_GRASS,
+    t.TERRAIN_STONE: t.COLOR_STONE,
+    t.TERRAIN_SNOW: t.COLOR_SNOW,
+    t.TERRAIN_WATER: t.COLOR_WATER,
+}
+
+class OverviewMap:
+    """
+    One colour per map cell, kept in pygame surfaces for the zoomed-out world view and the minimap.
+
+    Cell colours are the terrain colour map shaded by height, with resources and agents painted
+    on top. Each update rewrites only the cells that changed (the terrain cells it is told about,
+    the resource cells and the cells agents left or entered), through `pygame.surfarray` views of
+    two surfaces: a top-down one (one pixel per cell, for the minimap) and an isometric one
+    (two pixels per cell on the u = x - y, v = x + y lattice, so the cells tile like the cubes).
+    Drawing is then a subsurface scale and one blit, whatever the map size. `version` changes
+    whenever a cell's colour did, and the minimap is only re-rendered then or when the viewport
+    moved.
+    """
+
+    def __init__(self, terrain_color_map, heightmap, terrain_type_map):
+        height, width = heightmap.shape
+        self.width, self.height = width, height
+        self.terrain_color_map = terrain_color_map
+        self._heights = np.array(heightmap, copy=True)
+        self._types = np.array(terrain_type_map, copy=True)
+        self._generated_types = self._types.copy()  # The types terrain_color_map was made for.
+        self._height_range = (float(heightmap.min()), max(float(heightmap.max()), float(heightmap.min()) + 1e-9))
+        self._resources = np.zeros((height, width), dtype=bool)
+        self._resource_map = None  # The resource map the resource cells were taken from.
+        self._resource_ys = self._resource_xs = np.zeros(0, dtype=np.int64)
+        self._agent_xs = self._agent_ys = np.zeros(0, dtype=np.int64)
+        self.version = 0
+        self._minimap = None  # (key, surface, position) of the last minimap.
+
+        # (x, y) indexed, as surfarray expects.
+        self.base = self._shade(np.arange(width)[:, None], np.arange(height)[None, :])
+        self.colors = self.base.copy()
+        self.top_down = pygame.Surface((width, height))
+        pygame.surfarray.blit_array(self.top_down, self.colors)
+        self.iso = pygame.Surface((width + height, width + height - 1))
+        self.iso.fill(BACKGROUND_COLOR)  # Outside the diamond.
+        xs, ys = np.meshgrid(np.arange(width), np.arange(height), indexing="ij")
+        self._write_iso(xs.ravel(), ys.ravel())
+
+    def _shade(self, xs, ys):
+        low, high = self._height_range
+        light = SHADE_MIN + (1.0 - SHADE_MIN) * np.clip((self._heights[ys, xs] - low) / (high - low), 0.0, 1.0)
+        colors = self.terrain_color_map[ys, xs].astype(np.float32)
+        types = np.broadcast_to(self._types[ys, xs], light.shape)
+        retyped = types != self._generated_types[ys, xs]
+        if retyped.any():
+            colors[retyped] = [TYPE_COLORS.get(int(c), (0, 0, 0)) for c in types[retyped]]
+        return (colors * light[..., None]).astype(np.uint8)
+
+    def _write_iso(self, xs, ys):
+        pixels = pygame.surfarray.pixels3d(self.iso)
+        u = xs - ys + self.height - 1
+        v = xs + ys
+        colors = self.colors[xs, ys]
+        pixels[u, v] = colors
+        pixels[u + 1, v] = colors
+        del pixels  # Unlocks the surface.
+
+    def update(self, heightmap, terrain_type_map, resource_map, agents, positions=None, changed_cells=None):
+        """
+        Brings the surfaces up to date; returns the number of cells that changed.
+
+        `changed_cells` are the (ys, xs) whose height or terrain type changed since the last
+        update (e.g. from EnvironmentManager.take_changed_cells). The resource map is only
+        scanned when it is a new array (food respawned); in place, agents only collect from it,
+        so just the cells that held a resource are checked.
+        """
+        changed_ys, changed_xs = [], []
+        if changed_cells is not None and len(changed_cells[0]):
+            ys, xs = (np.asarray(cells, dtype=np.int64) for cells in changed_cells)
+            self._heights[ys, xs] = heightmap[ys, xs]
+            self._types[ys, xs] = terrain_type_map[ys, xs]
+            self.base[xs, ys] = self._shade(xs, ys)
+            changed_ys.append(ys)
+            changed_xs.append(xs)
+
+        if resource_map is not self._resource_map:
+            resource_ys, resource_xs = np.nonzero(resource_map > 0)
+            self._resource_map = resource_map
+        else:
+            kept = resource_map[self._resource_ys, self._resource_xs] > 0
+            resource_ys, resource_xs = self._resource_ys[kept], self._resource_xs[kept]
+        if not (np.array_equal(resource_ys, self._resource_ys) and np.array_equal(resource_xs, self._resource_xs)):
+            self._resources[self._resource_ys, self._resource_xs] = False
+            self._resources[resource_ys, resource_xs] = True
+            changed_ys += [self._resource_ys, resource_ys]
+            changed_xs += [self._resource_xs, resource_xs]
+            self._resource_ys, self._resource_xs = resource_ys, resource_xs
+
+        if positions is None:
+            positions = np.array([agent.get_position() for agent in agents], dtype=np.float64).reshape(-1, 2)
+        agent_xs = np.clip(np.asarray(positions[:, 0]).astype(np.int64), 0, self.width - 1)
+        agent_ys = np.clip(np.asarray(positions[:, 1]).astype(np.int64), 0, self.height - 1)
+        changed_ys += [self._agent_ys, agent_ys]  # Cells the agents left and the ones they are on now.
+        changed_xs += [self._agent_xs, agent_xs]
+        self._agent_xs, self._agent_ys = agent_xs, agent_ys
+
+        cells = np.unique(np.concatenate(changed_ys) * self.width + np.concatenate(changed_xs))
+        if len(cells) == 0:
+            return 0
+        ys, xs = np.divmod(cells, self.width)
+        previous = self.colors[xs, ys]
+        self.colors[xs, ys] = self.base[xs, ys]
+        on_resource = self._resources[ys, xs]
+        self.colors[xs[on_resource], ys[on_resource]] = RESOURCE_COLOR
+        if len(agent_xs):
+            self.colors[agent_xs, agent_ys] = [agent.color if agent.is_alive() else DEAD_AGENT_COLOR for agent in agents]
+
+        pixels = pygame.surfarray.pixels3d(self.top_down)
+        pixels[xs, ys] = self.colors[xs, ys]
+        if not np.array_equal(previous, self.colors[xs, ys]):
+            self.version += 1
+        del pixels
+        self._write_iso(xs, ys)
+        return len(xs)
+
+    def draw_world(self, screen, position_manager, scale=1.0):
+        """Draws the visible part of the isometric image, flat (height only shades it)."""
+        cell_size = position_manager.get_terrain_cell_size()
+        tile_width = cell_size * 2 * scale
+        tile_height = cell_size * scale
+        zoom = position_manager.zoom
+        pixel_width, pixel_height = tile_width / 2 * zoom, tile_height / 2 * zoom  # One iso image pixel on screen.
+        origin_x, origin_y = position_manager.get_render_position(-(self.height - 1) * tile_width / 2, 0)
+
+        image_width, image_height = self.iso.get_size()
+        screen_width, screen_height = screen.get_size()
+        u0 = max(0, math.floor(-origin_x / pixel_width))
+        u1 = min(image_width, math.ceil((screen_width - origin_x) / pixel_width))
+        v0 = max(0, math.floor(-origin_y / pixel_height))
+        v1 = min(image_height, math.ceil((screen_height - origin_y) / pixel_height))
+        if u1 <= u0 or v1 <= v0:
+            return
+        x0, y0 = round(origin_x + u0 * pixel_width), round(origin_y + v0 * pixel_height)
+        x1, y1 = round(origin_x + u1 * pixel_width), round(origin_y + v1 * pixel_height)
+        visible = self.iso.subsurface((u0, v0, u1 - u0, v1 - v0))
+        screen.blit(pygame.transform.scale(visible, (x1 - x0, y1 - y0)), (x0, y0))
+
+    def minimap(self, position_manager, screen_height, scale=1.0):
+        """
+        Returns the top-down minimap, outlined and with the viewport drawn on it, and its
+        top-left corner (bottom-left of a screen `screen_height` high). The surface is the same
+        object until the map's colours or the viewport change.
+        """
+        factor = MINIMAP_SIZE / max(self.width, self.height)
+        size = (max(1, round(self.width * factor)), max(1, round(self.height * factor)))
+        position = (MINIMAP_MARGIN - 1, screen_height - size[1] - MINIMAP_MARGIN - 1)
+
+        # The screen corners, back to (fractional) cells: world x gives x - y, world y gives x + y.
+        cell_size = position_manager.get_terrain_cell_size()
+        tile_width, tile_height = cell_size * 2 * scale, cell_size * scale
+        corners = []
+        for screen_x, screen_y in ((0, 0), (position_manager.game_width, 0),
+                                   (position_manager.game_width, position_manager.screen_height),
+                                   (0, position_manager.screen_height)):
+            world_x, world_y = position_manager.get_world_position(screen_x, screen_y)
+            u, v = 2 * world_x / tile_width, 2 * world_y / tile_height
+            x = min(max((u + v) / 2, 0), self.width)
+            y = min(max((v - u) / 2, 0), self.height)
+            corners.append((round(1 + x * factor), round(1 + y * factor)))
+
+        key = (self.version, size, tuple(corners))
+        if self._minimap is None or self._minimap[0] != key:
+            surface = pygame.Surface((size[0] + 2, size[1] + 2))
+            surface.blit(pygame.transform.scale(self.top_down, size), (1, 1))
+            pygame.draw.rect(surface, VIEWPORT_COLOR, surface.get_rect(), 1)
+            pygame.draw.lines(surface, VIEWPORT_COLOR, True, corners)
+            self._minimap = (key, surface)
+        return self._minimap[1], position
+
+    def draw_minimap(self, screen, position_manager, scale=1.0):
+        """Draws the minimap in the bottom-left corner; returns its rect."""
+        surface, position = self.minimap(position_manager, screen.get_height(), scale)
+        return screen.blit(surface, position)
+
+_overview = None  # Shared OverviewMap, rebuilt when the map changes.
+
+def use_overview(position_manager, scale=1.0):
+    """Returns True when tiles are too small on screen for the cubes to be worth drawing."""
+    return position_manager.get_terrain_cell_size() * 2 * scale * position_manager.zoom < LOD_TILE_PIXELS
+
+def update_overview(terrain_color_map, terrain, terrain_type_map, resource_map, agents, positions=None, changed_cells=None):
+    """Returns the shared OverviewMap, brought up to date (call once per frame, then draw from it)."""
+    global _overview
+    if _overview is None or _overview.terrain_color_map is not terrain_color_map or (_overview.height, _overview.width) != terrain.shape:
+        _overview = OverviewMap(terrain_color_map, terrain, terrain_type_map)
+    _overview.update(terrain, terrain_type_map, resource_map, agents, positions, changed_cells)
+    return _overview
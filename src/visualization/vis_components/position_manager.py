@@ -1,4 +1,5 @@
 # src/visualization/position_manager.py
+import math
 
 class PositionManager:
     def __init__(self, game_width, screen_height, map_width, map_height, vertical_offset=300):
@@ -38,6 +39,38 @@ class PositionManager:
 
         return screen_x, screen_y
 
+    def get_world_position(self, screen_x, screen_y):
+        """Inverse of get_render_position: converts screen coordinates back to world coordinates."""
+        world_x = (screen_x - self.game_width // 2) / self.zoom - self.base_x
+        world_y = (screen_y - self.screen_height // 2 + self.vertical_offset) / self.zoom - self.base_y
+        return world_x, world_y
+
+    def get_visible_diagonals(self, tile_width, tile_height, min_height=0.0, max_height=0.0, margin=0):
+        """
+        Returns the (u0, u1, v0, v1) ranges of x - y and x + y for grid cells that can appear on screen.
+
+        Inverts the isometric projection for the screen corners: world x fixes x - y and world
+        y fixes x + y. Cells are raised by `min_height` to `max_height` world units, and `margin`
+        screen pixels are added on every side for sprites drawn around a cell's anchor.
+        """
+        world_x0, world_y0 = self.get_world_position(-margin, -margin)
+        world_x1, world_y1 = self.get_world_position(self.game_width + margin, self.screen_height + margin)
+        u0, u1 = 2 * world_x0 / tile_width, 2 * world_x1 / tile_width
+        v0, v1 = 2 * (world_y0 + min_height) / tile_height, 2 * (world_y1 + max_height) / tile_height
+        return u0, u1, v0, v1
+
+    def get_visible_cells(self, map_width, map_height, tile_width, tile_height, min_height=0.0, max_height=0.0, margin=0):
+        """
+        Returns the (x0, y0, x1, y1) half-open range of grid cells that can appear on screen:
+        the bounding box of the visible diamond from get_visible_diagonals, clipped to the map.
+        """
+        u0, u1, v0, v1 = self.get_visible_diagonals(tile_width, tile_height, min_height, max_height, margin)
+        x0 = max(0, math.floor((u0 + v0) / 2))
+        x1 = min(map_width, math.ceil((u1 + v1) / 2) + 1)
+        y0 = max(0, math.floor((v0 - u1) / 2))
+        y1 = min(map_height, math.ceil((v1 - u0) / 2) + 1)
+        return x0, y0, max(x0, x1), max(y0, y1)
+
     def get_terrain_cell_size(self):
         """Get the size of terrain cells based on zoom level."""
         base_size = 20  # Base cell size in pixels
@@ -0,0 +1,44 @@
+# src/visualization/vis_components/render_queue.py
+import math
+from operator import itemgetter
+
+# Draw order of things at the same isometric depth.
+LAYER_BACKGROUND = 0  # Pre-baked terrain chunks.
+LAYER_TERRAIN = 1  # Single cubes, drawn again in front of objects they hide.
+LAYER_OBJECT = 2  # Resources and agents.
+OVERLAY_DEPTH = math.inf  # Labels are drawn over everything.
+
+class RenderQueue:
+    """
+    Collects (depth key, surface, position) for one frame and draws it with a single `Surface.blits`.
+
+    Depth is the isometric row x + y of the item's cell; items are drawn back to front, then by
+    layer, then by `order` (e.g. screen y) and finally in the order they were added. Items added
+    with a `cell` can be hidden by terrain in front of them: see TerrainLayer.add_occluders.
+    """
+
+    def __init__(self):
+        self._items = []  # (depth, layer, order, sequence, blit arguments)
+        self.occludable = []  # (screen rect, (x, y) cell) of items terrain may hide.
+
+    def __len__(self):
+        return len(self._items)
+
+    def add(self, surface, position, depth, layer=LAYER_OBJECT, order=0.0, cell=None, area=None):
+        """Queues `surface` at `position` (only its `area` part, if given, as with `Surface.blit`)."""
+        blit = (surface, position) if area is None else (surface, position, area)
+        self._items.append((depth, layer, order, len(self._items), blit))
+        if cell is not None:
+            self.occludable.append((surface.get_rect(topleft=position), cell))
+
+    def take(self):
+        """Returns the queued blit arguments in drawing order and empties the queue."""
+        self._items.sort(key=itemgetter(0, 1, 2, 3))
+        blits = [item[4] for item in self._items]
+        self._items.clear()
+        self.occludable.clear()
+        return blits
+
+    def draw(self, screen):
+        """Draws everything in depth order and empties the queue."""
+        screen.blits(self.take(), doreturn=False)
@@ -1,9 +1,14 @@
 # src/visualization/vis_components/resource_renderer.py
-import pygame
 import numpy as np  # Import numpy
 from . import pole_sprite  # Import the pole_sprite module
+from . import sprite_atlas
 
 RESOURCE_COLOR = (255, 255, 0)  # Yellow
+POLE_COLORS = {
+    "pole": (139, 69, 19),  # Brown
+    "top": (255, 255, 0),  # Yellow
+    "outline": (0, 0, 0)  # Black
+}
 
 def grid_to_iso(grid_x, grid_y, height, tile_width, tile_height):
     """Converts grid coordinates to isometric screen coordinates."""
@@ -11,45 +16,62 @@ def grid_to_iso(grid_x, grid_y, height, tile_width, tile_height):
     screen_y = (grid_x + grid_y) * tile_height / 2 - height
     return screen_x, screen_y
 
-def draw_resources(screen, resource_map, terrain, position_manager, terrain_sprites, scale=1.0):
+def draw_resources(screen, resource_map, terrain, position_manager, terrain_sprites, scale=1.0, queue=None, terrain_layer=None):
+    """
+    Draws a pole on every visible resource cell.
+
+    With a `terrain_layer`, poles stand on the top of their cube; with a `queue`, they are added
+    to it (depth-sorted, and hidden by terrain in front) instead of being drawn right away.
+    """
     resource_size = position_manager.get_resource_size() * scale  # Scale
     cell_size = position_manager.get_terrain_cell_size()
     tile_width = cell_size * 2 * scale  # Scale
     tile_height = cell_size * scale  # Scale
 
-    # Define colors (as you requested)
-    pole_color_profile = {
-        "pole": (139, 69, 19),  # Brown
-        "top": (255, 255, 0),  # Yellow
-        "outline": (0, 0, 0)  # Black
-    }
-
-    for (x, y), amount in np.ndenumerate(resource_map):
-        if amount > 0:  # If there's a resource at this location
-            height_value = terrain[y, x] # Get the height directly from the terrain
-            screen_x, screen_y = grid_to_iso(x, y, height_value, tile_width, tile_height)
-            screen_x, screen_y = position_manager.get_render_position(screen_x, screen_y)
-
-            # Calculate position
-            resource_x = int(screen_x + tile_width / 2)  # Tile's center X
-            resource_y = int(screen_y)  # screen_y already includes the height offset
-
-            # --- Pole Sprite Implementation ---
-            # Check if pole sprite exists with current tile_width and tile_height
-            pole_key = (tile_width, tile_height)
-            if pole_key not in pole_cache:
-                #Create the pole sprite.
-                pole_surface = pole_sprite.create_isometric_pole(int(tile_width), int(tile_height), pole_color_profile)
-                pole_cache[pole_key] = pole_surface
-            else:
-                pole_surface = pole_cache[pole_key]
-
-            # Blit the pole sprite onto the screen
-            # Adjust the blit position to account for the pole's height and to center it
-            blit_x = resource_x - pole_surface.get_width() // 2  # Center horizontally
-            blit_y = resource_y - pole_surface.get_height()  # Align top of pole with top of tile
+    # One pole sprite per quantized zoom level, shared through the sprite atlas.
+    pole_surface = get_pole_sprite(position_manager.zoom, scale)
+    pole_width, pole_height = pole_surface.get_size()
+
+    # Only look at the part of the map that can be on screen; the map itself is the spatial index.
+    map_height, map_width = resource_map.shape
+    if terrain_layer is not None:
+        min_height, max_height = (h * scale for h in terrain_layer.height_range)
+    else:
+        min_height, max_height = 0.0, float(terrain.max())
+    x0, y0, x1, y1 = position_manager.get_visible_cells(
+        map_width, map_height, tile_width, tile_height, min_height, max_height,
+        margin=int(tile_width + 3 * tile_height)  # Pole sprite size
+    )
+    ys, xs = np.nonzero(resource_map[y0:y1, x0:x1] > 0)
+    xs, ys = xs + x0, ys + y0
+
+    if terrain_layer is not None:
+        resource_xs, resource_ys = terrain_layer.anchor(xs, ys, position_manager, scale)  # Top of the cube
+    else:
+        height_values = terrain[ys, xs]  # Get the height directly from the terrain
+        screen_xs, screen_ys = grid_to_iso(xs, ys, height_values, tile_width, tile_height)
+        screen_xs, screen_ys = position_manager.get_render_position(screen_xs, screen_ys)
+        resource_xs = screen_xs + tile_width / 2  # Tile's center X
+        resource_ys = screen_ys  # screen_y already includes the height offset
+
+    for x, y, resource_x, resource_y in zip(xs.tolist(), ys.tolist(), resource_xs.tolist(), resource_ys.tolist()):
+        # --- Pole Sprite Implementation ---
+        # Adjust the blit position to account for the pole's height and to center it
+        blit_x = int(resource_x) - pole_width // 2  # Center horizontally
+        blit_y = int(resource_y) - pole_height  # Foot of the pole on the anchor
 
+        if queue is None:
             screen.blit(pole_surface, (blit_x, blit_y))
-            # --- End Pole Sprite Implementation ---
-            
-pole_cache = {} #Dictionary to store pole sprite to avoid recreating the pole sprite every frame
\ No newline at end of file
+        else:
+            queue.add(pole_surface, (blit_x, blit_y), x + y, order=resource_y, cell=(x, y))
+        # --- End Pole Sprite Implementation ---
+
+def get_pole_sprite(zoom, scale=1.0, atlas=None):
+    """Returns the pole sprite for a zoom level, built once per quantized zoom."""
+    atlas = atlas if atlas is not None else sprite_atlas.atlas
+
+    def build(quantized_zoom):
+        cell_size = 20 * quantized_zoom  # PositionManager.get_terrain_cell_size at that zoom.
+        return pole_sprite.create_isometric_pole(int(cell_size * 2 * scale), int(cell_size * scale), POLE_COLORS)
+
+    return atlas.get(("pole", scale), zoom, build)
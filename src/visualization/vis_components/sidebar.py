@@ -1,63 +1,42 @@
 import pygame
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_agg import FigureCanvasAgg
 import numpy as np #Import Numpy, required for visualization
 from src.environment.terrain import get_terrain_type, TERRAIN_SAND, TERRAIN_GRASS, TERRAIN_STONE, TERRAIN_SNOW, TERRAIN_WATER
 
 from .scrollbar import Scrollbar, SCROLLBAR_WIDTH # All the variables for now are here
+from .text_cache import cache as text_cache
+from .line_plot import LinePlot
 
 SIDEBAR_COLOR = (50, 50, 50)  # Dark gray
+BACKGROUND_COLOR = (0, 100, 200)  # Sky color, around the scrollbar.
 TEXT_COLOR = (255, 255, 255)  # White
+REFRESH_INTERVAL = 250  # Milliseconds between redraws of the agent stats when nothing else changed.
+
+INFO_HEIGHT = 130  # Simulation info at the top.
+GROUP_HEADER_HEIGHT = 60
+SECTION_HEIGHT = 450  # Increased height for better visibility
+ROW_HEIGHT = SECTION_HEIGHT + 10  # Added padding between sections
 
 # --- Scrollbar (Created ONCE) ---
 _scrollbar = None #Global variable, the scrollbar does not reset.
+_viewport_surface = None  # Reused surface the visible part of the sidebar is drawn on.
+_last_state = None  # Scroll position, settings and counts the sidebar was last drawn with.
+_last_refresh = None  # pygame ticks of the last redraw.
 
 def calculate_isometric_z(x, y):
     """Calculates a Z-position for isometric representation (placeholder)."""
     z = x * 0.5 + y * 0.5
     return z
 
-def create_max_energy_graph(agent):
-    """Creates a Pygame surface with a Matplotlib graph of max energy over age."""
-    # Only plot up to current age
-    ages = np.arange(0, agent.age + 1)
-    max_energies = []
-    original_age = agent.age
-
-    # Calculate energy values up to current age only
-    for age in ages:
-        agent.age = age
-        max_energy = agent.calculate_max_energy()
-        max_energies.append(max_energy)
-
-    agent.age = original_age
-
-    # Create the plot
-    fig, ax = plt.subplots(figsize=(4, 2), dpi=100)
-    ax.plot(ages, max_energies)
-    ax.set_xlabel("Age", fontsize=6)
-    ax.set_ylabel("Max Energy", fontsize=6)
-    ax.set_title("Max Energy Over Age", fontsize=6)
-
-    # Dynamic axes scaling
-    max_y = max(max_energies) if max_energies else 100
-    ax.set_ylim(0, max_y * 1.1)
-    ax.set_xlim(0, max(agent.age * 1.2, 1))  # Scale x-axis with some padding
-
-    fig.tight_layout()
-
-    # Draw the figure on a canvas
-    canvas = FigureCanvasAgg(fig)
-    canvas.draw()
-    s = canvas.tostring_argb()
-    size = canvas.get_width_height()
-
-    graph_surface = pygame.image.fromstring(s, size, "RGBA")
-
-    # Delete plot from memory
-    plt.close(fig)
-
-    return graph_surface
+def update_energy_plot(agent):
+    """Returns the agent's max energy over age plot, appending the ages it reached since the last call."""
+    plot = getattr(agent, "energy_plot", None)
+    if plot is None:
+        plot = agent.energy_plot = LinePlot(400, 200, "Max Energy Over Age", "Age", "Max Energy")
+    ages = int(agent.age) + 1  # Only plot up to current age
+    if ages > len(plot):
+        max_energies = np.asarray(agent.max_energy_curve())  # Table lookup for every age at once.
+        plot.extend(range(len(plot), ages), max_energies[len(plot):ages])
+    return plot.draw()
 
 def draw_agent_info(screen, agent, x, y, agent_index, font, group_letters, config, terrain_type_map):
     """Draws individual agent information."""
@@ -110,13 +89,13 @@ def draw_agent_info(screen, agent, x, y, agent_index, font, group_letters, confi
     speed_text = f"Speed: {current_speed:.2f} tiles/s (x{terrain_multiplier:.1f}) - {terrain_name}"
 
     # Render the text
-    name_surface = font.render(agent_name, True, text_color)
-    energy_surface = font.render(energy_text, True, text_color)
-    speed_surface = font.render(speed_text, True, text_color)
-    last_ate_surface = font.render(last_ate_text, True, text_color)
-    height_surface = font.render(height_text, True, text_color)
-    age_surface = font.render(age_text, True, text_color)
-    alive_surface = font.render(alive_text, True, text_color)
+    name_surface = text_cache.render(font, agent_name, text_color)
+    energy_surface = text_cache.render(font, energy_text, text_color)
+    speed_surface = text_cache.render(font, speed_text, text_color)
+    last_ate_surface = text_cache.render(font, last_ate_text, text_color)
+    height_surface = text_cache.render(font, height_text, text_color)
+    age_surface = text_cache.render(font, age_text, text_color)
+    alive_surface = text_cache.render(font, alive_text, text_color)
 
     # Blit the text onto the screen
     screen.blit(name_surface, (x, y))
@@ -129,77 +108,39 @@ def draw_agent_info(screen, agent, x, y, agent_index, font, group_letters, confi
 
     # Display death text if applicable
     if death_text:
-        death_surface = font.render(death_text, True, text_color)
-        death_pos_surface = font.render(death_pos_text, True, text_color)
+        death_surface = text_cache.render(font, death_text, text_color)
+        death_pos_surface = text_cache.render(font, death_pos_text, text_color)
         screen.blit(death_surface, (x, y + 175))
         if death_pos_text:
             screen.blit(death_pos_surface, (x, y + 200))
 
-def draw_sidebar(screen, agents, font, config, game_width, screen_height, sidebar_width, group_letters, terrain_type_map):
-    """Draws the sidebar with agent and simulation information."""
-
-    # --- Scrollbar (Created ONCE) ---
-    global _scrollbar # Now a global variable, does not reset.
-
-    # Create a surface to hold all sidebar content
-    total_height = calculate_total_height(agents, group_letters)
-    sidebar_surface = pygame.Surface((sidebar_width, total_height))
-    sidebar_surface.fill(SIDEBAR_COLOR)
-    y_offset = 20
-
-    # Display simulation info first
-    speed_text = f"Sim Speed: {config['simulation_speed']:.2f}"
-    speed_surface = font.render(speed_text, True, TEXT_COLOR)
-    sidebar_surface.blit(speed_surface, (10, y_offset))
-    y_offset += 30
-
-    respawn_text = f"Food Respawn: {config['food_respawn_interval'] / 1000:.2f}s (+/- keys)"
-    respawn_surface = font.render(respawn_text, True, TEXT_COLOR)
-    sidebar_surface.blit(respawn_surface, (10, y_offset))
-    y_offset += 30
-
-    aging_text = f"Aging Interval: {config['aging_interval'] / 1000:.2f}s (</> keys)"
-    aging_surface = font.render(aging_text, True, TEXT_COLOR)
-    sidebar_surface.blit(respawn_surface, (10, y_offset))
-    y_offset += 50
-
-    # Group agents
+def group_agents(agents):
+    """Returns {group: [agents]} with groups in order of first appearance."""
     grouped_agents = {}
     for agent in agents:
         if agent.group not in grouped_agents:
             grouped_agents[agent.group] = []
         grouped_agents[agent.group].append(agent)
+    return grouped_agents
 
-    # Display each group and its agents
-    group_indices = {}  # Dictionary to track indices within each group
-    for group_id, agent_list in grouped_agents.items():
-        group_color = agent_list[0].color
-        group_name = f"Group {group_letters[group_id]} (RGB{group_color})"
-        group_surface = font.render(group_name, True, group_color)
-        sidebar_surface.blit(group_surface, (10, y_offset + 35))
-        y_offset += 60
-        group_indices[group_id] = 0
-
-        for agent in agent_list: #Change to start by id from the group id.
-            section_height = 450  # Increased height for better visibility
-            pygame.draw.rect(sidebar_surface, (45, 45, 45), (5, y_offset, sidebar_width - 10, section_height))
-
-            draw_agent_info(sidebar_surface, agent, 10, y_offset + 10, group_indices[group_id], font, group_letters, config, terrain_type_map)
-            group_indices[group_id] += 1
+def draw_sidebar(screen, agents, font, config, game_width, screen_height, sidebar_width, group_letters, terrain_type_map, deaths=None):
+    """
+    Draws the sidebar with agent and simulation information (`deaths` is an optional DeathArchive).
+    Returns True if it was drawn, False if it was left as it was.
 
-            # Create/update and draw energy graph
-            if not hasattr(agent, "energy_graph") or agent.age != agent.last_graph_update:
-                agent.energy_graph = create_max_energy_graph(agent)
-                agent.last_graph_update = agent.age
+    The sidebar is virtualized: rows have fixed heights, so the agents in the scroll viewport
+    are found arithmetically and only those are drawn, onto a viewport-sized surface. It is
+    redrawn right away when it is scrolled or hovered, a setting changes or agents are born or
+    die; the ever-changing agent stats (age, energy) only every REFRESH_INTERVAL ms.
+    """
 
-            # Position graph below agent info with more padding
-            graph_y = y_offset + 150  # Adjusted padding before graph
-            sidebar_surface.blit(agent.energy_graph, (10, graph_y))
+    # --- Scrollbar (Created ONCE) ---
+    global _scrollbar, _viewport_surface, _last_state, _last_refresh # Now a global variable, does not reset.
 
-            y_offset += section_height + 10  # Added padding between sections
+    grouped_agents = group_agents(agents)
+    total_height = calculate_total_height(agents, group_letters, grouped_agents)
 
     #Handle scroll and others
-    global SCROLLBAR_WIDTH  # Adjust as needed
     scrollbar_x = game_width + sidebar_width - SCROLLBAR_WIDTH - 2
     sidebar_x = game_width # X position of sidebar
     sidebar_y = 0 # Y position of sidebar
@@ -207,7 +148,7 @@ def draw_sidebar(screen, agents, font, config, game_width, screen_height, sideba
     # --- Create Scrollbar only if it doesn't exist ---
     if _scrollbar is None:
         _scrollbar = Scrollbar(x=scrollbar_x, y=2, width= SCROLLBAR_WIDTH, height= screen_height)
-    _scrollbar.set_viewport_size(calculate_total_height(agents, group_letters), screen_height) #Now with the function
+    _scrollbar.set_viewport_size(total_height, screen_height)
 
     for event in pygame.event.get():
          _scrollbar.handle_event(event, total_height, screen_height, sidebar_x, sidebar_width, sidebar_y) #Scroll
@@ -215,26 +156,82 @@ def draw_sidebar(screen, agents, font, config, game_width, screen_height, sideba
     # Calculate thumb position
     thumb_y, thumb_height, is_over_scrollbar = _scrollbar.update(pygame.mouse.get_pos(), pygame.mouse.get_pressed()[0],total_height,screen_height, sidebar_x, sidebar_width)
 
+    state = (_scrollbar.get_scroll(), thumb_y, thumb_height, is_over_scrollbar, pygame.mouse.get_pressed()[0],
+             config['simulation_speed'], config['food_respawn_interval'], config['aging_interval'],
+             len(agents), None if deaths is None else deaths.total)
+    now = pygame.time.get_ticks()
+    if state == _last_state and now - _last_refresh < REFRESH_INTERVAL:
+        return False
+    _last_state, _last_refresh = state, now
+
+    screen.fill(BACKGROUND_COLOR, (sidebar_x, sidebar_y, sidebar_width, screen_height))
     _scrollbar.draw(screen, screen_height, is_over_scrollbar, pygame.mouse.get_pressed()[0])
 
-    # Blit the scrolled portion of the sidebar surface onto the screen
-    sidebar_rect = pygame.Rect(game_width, 0, sidebar_width - SCROLLBAR_WIDTH - 4, screen_height)
-    screen.blit(sidebar_surface, sidebar_rect, (0, -_scrollbar.get_scroll(), sidebar_width - SCROLLBAR_WIDTH - 4, screen_height))
+    # Only the visible part of the content, [top, top + screen_height), is drawn.
+    view_width = sidebar_width - SCROLLBAR_WIDTH - 4
+    if _viewport_surface is None or _viewport_surface.get_size() != (view_width, screen_height):
+        _viewport_surface = pygame.Surface((view_width, screen_height))
+    sidebar_surface = _viewport_surface
+    sidebar_surface.fill(SIDEBAR_COLOR)
+    top = int(-_scrollbar.get_scroll())
+    y_offset = 20 - top
 
-def calculate_total_height(agents, group_letters):
-    """Calculate the total height needed for the sidebar content."""
-    height = 100  # Initial height for simulation info
+    # Display simulation info first
+    speed_text = f"Sim Speed: {config['simulation_speed']:.2f}"
+    speed_surface = text_cache.render(font, speed_text, TEXT_COLOR)
+    sidebar_surface.blit(speed_surface, (10, y_offset))
+    y_offset += 30
 
-    # Group agents
-    grouped_agents = {}
-    for agent in agents:
-        if agent.group not in grouped_agents:
-            grouped_agents[agent.group] = []
-        grouped_agents[agent.group].append(agent)
+    respawn_text = f"Food Respawn: {config['food_respawn_interval'] / 1000:.2f}s (+/- keys)"
+    respawn_surface = text_cache.render(font, respawn_text, TEXT_COLOR)
+    sidebar_surface.blit(respawn_surface, (10, y_offset))
+    y_offset += 30
 
-    # Calculate height for each group
+    aging_text = f"Aging Interval: {config['aging_interval'] / 1000:.2f}s (</> keys)"
+    aging_surface = text_cache.render(font, aging_text, TEXT_COLOR)
+    sidebar_surface.blit(respawn_surface, (10, y_offset))
+    y_offset += 50
+
+    if deaths is not None:
+        deaths_text = f"Alive: {len(agents)}  Deaths: {deaths.total}"
+        deaths_surface = text_cache.render(font, deaths_text, TEXT_COLOR)
+        sidebar_surface.blit(deaths_surface, (10, y_offset - 20))
+
+    # Display each group and the agents of it that are in view
     for group_id, agent_list in grouped_agents.items():
-        height += 60  # Group header
-        height += len(agent_list) * (460)  # Agent sections with padding
+        if 0 <= y_offset + GROUP_HEADER_HEIGHT and y_offset < screen_height:
+            group_color = agent_list[0].color
+            group_name = f"Group {group_letters[group_id]} (RGB{group_color})"
+            group_surface = text_cache.render(font, group_name, group_color)
+            sidebar_surface.blit(group_surface, (10, y_offset + 35))
+        y_offset += GROUP_HEADER_HEIGHT
+
+        first = max(0, -y_offset // ROW_HEIGHT)
+        last = min(len(agent_list), -(-(screen_height - y_offset) // ROW_HEIGHT))
+        for index in range(first, last):
+            agent = agent_list[index]
+            row_y = y_offset + index * ROW_HEIGHT
+            pygame.draw.rect(sidebar_surface, (45, 45, 45), (5, row_y, sidebar_width - 10, SECTION_HEIGHT))
+
+            draw_agent_info(sidebar_surface, agent, 10, row_y + 10, index, font, group_letters, config, terrain_type_map)
+
+            # Position graph below agent info with more padding
+            sidebar_surface.blit(update_energy_plot(agent), (10, row_y + 150))
+
+        y_offset += len(agent_list) * ROW_HEIGHT
+
+    screen.blit(sidebar_surface, (game_width, 0))
+    return True
+
+def calculate_total_height(agents, group_letters, grouped_agents=None):
+    """Calculate the total height needed for the sidebar content."""
+    if grouped_agents is None:
+        grouped_agents = group_agents(agents)
+    height = INFO_HEIGHT  # Initial height for simulation info
+
+    # Calculate height for each group
+    for agent_list in grouped_agents.values():
+        height += GROUP_HEADER_HEIGHT  # Group header
+        height += len(agent_list) * ROW_HEIGHT  # Agent sections with padding
 
-    return height
\ No newline at end of file
+    return height
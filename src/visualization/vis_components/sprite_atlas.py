@@ -0,0 +1,68 @@
+# src/visualization/vis_components/sprite_atlas.py
+from collections import OrderedDict
+import pygame
+
+ZOOM_STEP = 0.05  # Sprites are built for zoom levels rounded to this step.
+DEFAULT_BUDGET = 32 * 1024 * 1024  # Bytes of sprite pixels kept in the atlas.
+
+def quantize_zoom(zoom, step=ZOOM_STEP):
+    """Rounds a zoom level to the atlas grid, so float drift (1.2000000000000002) shares one entry."""
+    return round(round(zoom / step) * step, 6)
+
+class SpriteAtlas:
+    """
+    Cache of zoom-dependent sprites, built on demand and evicted least-recently-used.
+
+    Entries are keyed on (name, quantized zoom), so repeated mouse-wheel steps reuse the
+    same surfaces instead of creating new ones, and the total pixel memory of the cached
+    surfaces stays under `budget` bytes.
+    """
+
+    def __init__(self, budget=DEFAULT_BUDGET, zoom_step=ZOOM_STEP):
+        self.budget = budget
+        self.zoom_step = zoom_step
+        self._sprites = OrderedDict()  # (name, zoom) -> surface
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name, zoom, factory):
+        """
+        Returns the sprite `name` at `zoom`, calling `factory(quantized_zoom)` to build it on a miss.
+        """
+        key = (name, quantize_zoom(zoom, self.zoom_step))
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self._sprites.move_to_end(key)
+            self.hits += 1
+            return sprite
+        self.misses += 1
+        sprite = factory(key[1])
+        self._sprites[key] = sprite
+        self.bytes += _surface_bytes(sprite)
+        while self.bytes > self.budget and len(self._sprites) > 1:
+            _, evicted = self._sprites.popitem(last=False)
+            self.bytes -= _surface_bytes(evicted)
+        return sprite
+
+    def scaled(self, name, base_sprite, zoom, factor):
+        """Returns `base_sprite` scaled by `factor(quantized_zoom)`, cached like `get`."""
+        def build(quantized_zoom):
+            f = factor(quantized_zoom)
+            size = (max(1, round(base_sprite.get_width() * f)), max(1, round(base_sprite.get_height() * f)))
+            if size == base_sprite.get_size():
+                return base_sprite
+            return pygame.transform.scale(base_sprite, size)  # Nearest neighbour keeps the pixel-art look.
+        return self.get(name, zoom, build)
+
+    def clear(self):
+        self._sprites.clear()
+        self.bytes = 0
+
+    def __len__(self):
+        return len(self._sprites)
+
+def _surface_bytes(surface):
+    return surface.get_pitch() * surface.get_height()
+
+atlas = SpriteAtlas()  # Shared by the renderers.
@@ -1,11 +1,18 @@
 # src/visualization/vis_components/terrain_renderer.py
+import math
+from collections import OrderedDict
 import pygame
 from src.visualization.vis_components import cube_sprite
+from src.visualization.vis_components import sprite_atlas
+from src.visualization.vis_components.render_queue import LAYER_BACKGROUND, LAYER_TERRAIN
 import numpy as np  # Import numpy
 
 # Extract the constants that are specifically used by this module.
 TILE_WIDTH = 40   # Adjust for desired tile size
 TILE_HEIGHT = 40  # Total height of the cube
+CHUNK_SIZE = 64   # Cells per side of one pre-baked terrain chunk (at most)
+CHUNK_PIXELS = 1024  # Target span of a baked chunk; zoomed-in chunks hold fewer cells
+OCCLUDER_REACH = 3  # Cells in front of an object (along x and y) checked for cubes hiding it
 
 # Define color for each type, now including water (type 4)
 TERRAIN_COLORS = {
@@ -60,22 +67,231 @@ def grid_to_iso(grid_x, grid_y, height, tile_width, tile_height):
     screen_y = (grid_x + grid_y) * tile_height / 2 - height
     return screen_x, screen_y
 
-def draw_terrain(screen, terrain, terrain_type_map, position_manager, terrain_sprites, constrained_heights, scale=1.0):
-    """Draws the terrain with subpixel positioning."""
-    height, width = terrain.shape
-    cell_size = position_manager.get_terrain_cell_size()
-    tile_width = cell_size * 2 * scale
-    tile_height = cell_size * scale
-
-    for y in range(height):
-        for x in range(width):
-            # Use the pre-calculated constrained height
-            screen_x, screen_y = grid_to_iso(x, y, constrained_heights[y, x] * scale, tile_width, tile_height)
-            screen_x, screen_y = position_manager.get_render_position(screen_x, screen_y)
-
-            # Get the terrain type and corresponding sprite
-            terrain_type = int(terrain_type_map[y, x].item())  # Ensure it's an integer
-            sprite = terrain_sprites[terrain_type]
-
-            # Blit the sprite onto the screen using floating-point coordinates and then rounding
-            screen.blit(sprite, (round(screen_x), round(screen_y)))
\ No newline at end of file
+class TerrainLayer:
+    """
+    Pre-baked static terrain, drawn with one blit per chunk instead of one per cell.
+
+    The map is split into square chunks of up to CHUNK_SIZE cells (fewer when zoomed in, so a
+    chunk spans at most CHUNK_PIXELS), each rendered once into its
+    own transparent surface in the same back-to-front order as a per-cell draw. Drawing the
+    chunks row by row keeps that order across chunk borders, since only horizontally
+    adjacent sprites overlap. Panning only moves where the chunks are blitted. Chunks are
+    re-baked when the zoom changes, or when the terrain types or heights of their cells
+    change (passed to `update_cells`, or flagged with `mark_dirty`).
+    Only chunks overlapping the visible part of the map are baked and drawn, and baked chunks
+    are kept up to `max_pixels` in total (least recently drawn evicted), so both frame cost
+    and memory depend on the viewport rather than the map size.
+
+    `terrain_sprites` are the zoom 1 sprites; the sprites for other zoom levels are scaled
+    copies taken from the shared sprite atlas.
+    """
+
+    def __init__(self, terrain_sprites, chunk_size=CHUNK_SIZE, max_pixels=64_000_000, atlas=None):
+        self.terrain_sprites = terrain_sprites
+        self.atlas = atlas if atlas is not None else sprite_atlas.atlas
+        self.sprites = terrain_sprites  # Sprites at the zoom the chunks are baked at.
+        self.max_chunk_size = chunk_size
+        self.chunk_size = chunk_size  # Cells per chunk at the current zoom.
+        self.max_pixels = max_pixels
+        self._pixels = 0  # Total area of the baked chunks.
+        self._chunks = OrderedDict()  # (chunk_x, chunk_y) -> (surface, (offset_x, offset_y))
+        self._key = None  # (zoom, scale) the chunks were baked at.
+        self._types = None  # Copies of the arrays the chunks were baked from.
+        self._heights = None
+        self._min_height = self._max_height = 0.0
+        self._sprite_size = max(max(sprite.get_size()) for sprite in terrain_sprites.values())
+        self.version = 0  # Bumped whenever what the chunks show changes.
+
+    def invalidate(self):
+        """Drops every baked chunk."""
+        self._chunks.clear()
+        self._pixels = 0
+        self.version += 1
+
+    def mark_dirty(self, xs, ys):
+        """Drops the chunks containing the given cells, so they are re-baked on the next draw."""
+        self.version += 1
+        for chunk in set(zip(np.asarray(xs) // self.chunk_size, np.asarray(ys) // self.chunk_size)):
+            self._drop((int(chunk[0]), int(chunk[1])))
+
+    def sync(self, terrain_type_map, constrained_heights, zoom, scale=1.0):
+        """
+        Invalidates everything when the zoom level or the map changed. Changes to single cells
+        are not looked for here; they are passed to `update_cells`.
+        """
+        if self._key != (zoom, scale) or self._types is None or self._types.shape != terrain_type_map.shape:
+            self.invalidate()
+            self._key = (zoom, scale)
+            # Cells are tile_width * zoom / 2 = 20 * zoom^2 * scale pixels apart horizontally.
+            spacing = 20 * zoom * zoom * scale
+            self.chunk_size = max(1, min(self.max_chunk_size, int(CHUNK_PIXELS / (2 * spacing))))
+            self.sprites = self._zoomed_sprites(zoom, scale)
+            self._sprite_size = max(max(sprite.get_size()) for sprite in self.sprites.values())
+            self._types = np.array(terrain_type_map, copy=True)
+            self._heights = np.array(constrained_heights, copy=True)
+            self._update_height_range()
+
+    def update_cells(self, ys, xs, terrain_type_map, constrained_heights):
+        """
+        Takes the current type and height of the given cells (e.g. from
+        EnvironmentManager.take_changed_cells) and re-bakes the chunks containing them.
+        """
+        if self._types is None or len(xs) == 0:
+            return  # Nothing baked yet; the first sync copies the whole map.
+        self.mark_dirty(xs, ys)
+        self._types[ys, xs] = terrain_type_map[ys, xs]
+        self._heights[ys, xs] = constrained_heights[ys, xs]
+        self._update_height_range()
+
+    def _zoomed_sprites(self, zoom, scale):
+        # Sprites span two cell spacings, which grow with zoom^2 (see sync).
+        return {
+            terrain_type: self.atlas.scaled(("terrain", sprite, scale), sprite, zoom, lambda z: z * z * scale)
+            for terrain_type, sprite in self.terrain_sprites.items()
+        }
+
+    def _update_height_range(self):
+        self._min_height = min(float(self._heights.min()), 0.0)
+        self._max_height = max(float(self._heights.max()), 0.0)
+
+    def _bake_chunk(self, chunk_x, chunk_y, tile_width, tile_height, zoom, scale):
+        size = self.chunk_size
+        height, width = self._types.shape
+        ys, xs = np.mgrid[chunk_y * size:min((chunk_y + 1) * size, height),
+                          chunk_x * size:min((chunk_x + 1) * size, width)]
+        # Sprite positions relative to the camera; get_render_position adds the pan offset later.
+        iso_x, iso_y = grid_to_iso(xs, ys, self._heights[ys, xs] * scale, tile_width, tile_height)
+        iso_x = iso_x * zoom
+        iso_y = iso_y * zoom
+        offset_x, offset_y = math.floor(iso_x.min()), math.floor(iso_y.min())
+        sprite_width = max(sprite.get_width() for sprite in self.sprites.values())
+        sprite_height = max(sprite.get_height() for sprite in self.sprites.values())
+        surface = pygame.Surface(
+            (math.ceil(iso_x.max()) - offset_x + sprite_width + 1, math.ceil(iso_y.max()) - offset_y + sprite_height + 1),
+            pygame.SRCALPHA
+        )
+        # Row-major order, the same back-to-front order as drawing cell by cell.
+        surface.blits([
+            (self.sprites[int(terrain_type)], (round(sx - offset_x), round(sy - offset_y)))
+            for terrain_type, sx, sy in zip(self._types[ys, xs].ravel(), iso_x.ravel(), iso_y.ravel())
+        ], doreturn=False)
+        return surface, (offset_x, offset_y)
+
+    def draw(self, screen, terrain_type_map, position_manager, constrained_heights, scale=1.0, queue=None):
+        """Draws the visible chunks, or adds them to `queue` as its background."""
+        zoom = position_manager.zoom
+        self.sync(terrain_type_map, constrained_heights, zoom, scale)
+        cell_size = position_manager.get_terrain_cell_size()
+        tile_width = cell_size * 2 * scale
+        tile_height = cell_size * scale
+        origin_x, origin_y = position_manager.get_render_position(0, 0)
+        origin_x, origin_y = round(origin_x), round(origin_y)
+
+        # Only chunks overlapping the visible diamond of cells are baked and drawn.
+        height, width = terrain_type_map.shape
+        u0, u1, v0, v1 = position_manager.get_visible_diagonals(
+            tile_width, tile_height, self._min_height * scale, self._max_height * scale, margin=self._sprite_size
+        )
+        x0, y0, x1, y1 = position_manager.get_visible_cells(
+            width, height, tile_width, tile_height, self._min_height * scale, self._max_height * scale,
+            margin=self._sprite_size
+        )
+        size = self.chunk_size
+        for chunk_y in range(y0 // size, math.ceil(y1 / size)):
+            for chunk_x in range(x0 // size, math.ceil(x1 / size)):
+                first_x, first_y = chunk_x * size, chunk_y * size
+                last_x, last_y = first_x + size - 1, first_y + size - 1
+                if first_x - last_y > u1 or last_x - first_y < u0 or first_x + first_y > v1 or last_x + last_y < v0:
+                    continue  # In the bounding box, but outside the diamond.
+                surface, (offset_x, offset_y) = self._get_chunk(chunk_x, chunk_y, tile_width, tile_height, zoom, scale)
+                if queue is None:
+                    screen.blit(surface, (origin_x + offset_x, origin_y + offset_y))
+                else:
+                    queue.add(surface, (origin_x + offset_x, origin_y + offset_y), -1, LAYER_BACKGROUND)
+
+    @property
+    def height_range(self):
+        """(min, max) of the heights the chunks were last synced with, including 0."""
+        return self._min_height, self._max_height
+
+    def _cube_positions(self, xs, ys, position_manager, scale):
+        """Screen positions of the cube sprites of cells (x, y), as drawn in the chunks."""
+        zoom = position_manager.zoom
+        cell_size = position_manager.get_terrain_cell_size()
+        origin_x, origin_y = position_manager.get_render_position(0, 0)
+        cells_x = np.clip(np.floor(xs).astype(np.int64), 0, self._heights.shape[1] - 1)
+        cells_y = np.clip(np.floor(ys).astype(np.int64), 0, self._heights.shape[0] - 1)
+        iso_x, iso_y = grid_to_iso(xs, ys, self._heights[cells_y, cells_x] * scale, cell_size * 2 * scale, cell_size * scale)
+        return round(origin_x) + np.round(iso_x * zoom), round(origin_y) + np.round(iso_y * zoom)
+
+    def anchor(self, xs, ys, position_manager, scale=1.0):
+        """
+        Screen positions of the centre of the top face of the cube under each (x, y) point.
+        Fractional points move across the cube tops, at the height of the cell they are in.
+        """
+        left, top = self._cube_positions(np.asarray(xs, dtype=np.float64), np.asarray(ys, dtype=np.float64),
+                                         position_manager, scale)
+        sprite_width, sprite_height = next(iter(self.sprites.values())).get_size()
+        return left + sprite_width // 2, top + sprite_height // 6
+
+    def add_occluders(self, queue, position_manager, scale=1.0, reach=OCCLUDER_REACH):
+        """
+        Adds to `queue` the parts of the cubes in front of its occludable items that overlap them
+        on screen, so they are drawn over what they hide. Each cube is clipped to the item's rect:
+        drawn whole, it would also cover the cubes in front of it.
+        """
+        if not queue.occludable or self._heights is None:
+            return
+        height, width = self._heights.shape
+        rects = np.array([(rect.left, rect.top, rect.right, rect.bottom) for rect, _ in queue.occludable])
+        cells = np.array([cell for _, cell in queue.occludable], dtype=np.int64)
+        dx, dy = np.meshgrid(np.arange(reach + 1), np.arange(reach + 1), indexing="ij")
+        dx, dy = dx.ravel()[1:], dy.ravel()[1:]  # Every cell in front, not the item's own.
+        xs, ys = cells[:, :1] + dx, cells[:, 1:] + dy
+        inside = (xs < width) & (ys < height)
+        xs, ys = np.minimum(xs, width - 1), np.minimum(ys, height - 1)
+        left, top = self._cube_positions(xs, ys, position_manager, scale)
+        sprite_width, sprite_height = next(iter(self.sprites.values())).get_size()
+        clip_left, clip_top = np.maximum(left, rects[:, :1]), np.maximum(top, rects[:, 1:2])
+        clip_right = np.minimum(left + sprite_width, rects[:, 2:3])
+        clip_bottom = np.minimum(top + sprite_height, rects[:, 3:4])
+        items, offsets = np.nonzero(inside & (clip_left < clip_right) & (clip_top < clip_bottom))
+        for x, y, cube_left, cube_top, clip_x0, clip_y0, clip_x1, clip_y1 in zip(*(
+            values[items, offsets].astype(np.int64).tolist()
+            for values in (xs, ys, left, top, clip_left, clip_top, clip_right, clip_bottom)
+        )):
+            area = (clip_x0 - cube_left, clip_y0 - cube_top, clip_x1 - clip_x0, clip_y1 - clip_y0)
+            queue.add(self.sprites[int(self._types[y, x])], (clip_x0, clip_y0), x + y, LAYER_TERRAIN, area=area)
+
+    def _get_chunk(self, chunk_x, chunk_y, tile_width, tile_height, zoom, scale):
+        key = (chunk_x, chunk_y)
+        chunk = self._chunks.get(key)
+        if chunk is not None:
+            self._chunks.move_to_end(key)
+            return chunk
+        chunk = self._bake_chunk(chunk_x, chunk_y, tile_width, tile_height, zoom, scale)
+        self._chunks[key] = chunk
+        self._pixels += chunk[0].get_width() * chunk[0].get_height()
+        while self._pixels > self.max_pixels and len(self._chunks) > 1:
+            self._drop(next(iter(self._chunks)))
+        return chunk
+
+    def _drop(self, key):
+        chunk = self._chunks.pop(key, None)
+        if chunk is not None:
+            self._pixels -= chunk[0].get_width() * chunk[0].get_height()
+
+_terrain_layer = None  # Shared TerrainLayer used by draw_terrain.
+
+def get_terrain_layer(terrain_sprites):
+    """Returns the shared TerrainLayer for `terrain_sprites`."""
+    global _terrain_layer
+    if _terrain_layer is None or _terrain_layer.terrain_sprites is not terrain_sprites:
+        _terrain_layer = TerrainLayer(terrain_sprites)
+    return _terrain_layer
+
+def draw_terrain(screen, terrain, terrain_type_map, position_manager, terrain_sprites, constrained_heights, scale=1.0, queue=None):
+    """Draws the terrain from the pre-baked terrain layer (into `queue`, if given) and returns the layer."""
+    terrain_layer = get_terrain_layer(terrain_sprites)
+    terrain_layer.draw(screen, terrain_type_map, position_manager, constrained_heights, scale, queue)
+    return terrain_layer
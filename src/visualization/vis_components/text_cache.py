@@ -0,0 +1,71 @@
+# src/visualization/vis_components/text_cache.py
+from collections import OrderedDict
+import pygame
+
+class TextCache:
+    """
+    LRU cache of rendered text surfaces.
+
+    Surfaces are keyed on (font, string, color), where a font object stands for its face and
+    size, so text that did not change since the last frame is blitted from the cache and only
+    changed values are rasterized again. Fonts themselves are cached per (name, size) by
+    `get_font`, and `outlined` returns labels with their outline already composed in.
+    """
+
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self._fonts = {}  # (name, size) -> pygame.font.Font
+        self._surfaces = OrderedDict()  # key -> surface
+        self.hits = 0
+        self.misses = 0
+
+    def get_font(self, size, name=None):
+        """Returns the font `name` (default font if None) at `size`, created once."""
+        key = (name, size)
+        font = self._fonts.get(key)
+        if font is None:
+            font = self._fonts[key] = pygame.font.Font(name, size)
+        return font
+
+    def _lookup(self, key, build):
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = self._surfaces[key] = build()
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def render(self, font, text, color, antialias=True):
+        """Same as `font.render(text, antialias, color)`, from the cache when possible."""
+        return self._lookup(("text", font, text, tuple(color), antialias),
+                            lambda: font.render(text, antialias, color))
+
+    def outlined(self, font, text, color, outline_color=(0, 0, 0), offset=1):
+        """
+        Returns `text` drawn over four copies of itself in `outline_color`, shifted diagonally
+        by `offset` pixels. The text itself starts at (offset, offset) in the returned surface.
+        """
+        def build():
+            fill = self.render(font, text, color)
+            outline = self.render(font, text, outline_color)
+            surface = pygame.Surface(
+                (fill.get_width() + 2 * offset, fill.get_height() + 2 * offset), pygame.SRCALPHA
+            )
+            for dx in (0, 2 * offset):
+                for dy in (0, 2 * offset):
+                    surface.blit(outline, (dx, dy))
+            surface.blit(fill, (offset, offset))
+            return surface
+        return self._lookup(("outlined", font, text, tuple(color), tuple(outline_color), offset), build)
+
+    def clear(self):
+        self._surfaces.clear()
+
+    def __len__(self):
+        return len(self._surfaces)
+
+cache = TextCache()  # Shared by the renderers.
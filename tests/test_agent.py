@@ -76,5 +76,43 @@ class TestAgent(unittest.TestCase):
 
         self.assertEqual(nearest_resource, (2,2)) #Check to see if it returns the correct cords.
 
+class TestMaxEnergyTable(unittest.TestCase):
+
+    def setUp(self):
+        self.agent = agent.Agent(x=5, y=5)
+
+    def test_table_matches_beta_pdf(self):
+        from scipy.special import beta as beta_function
+        table = agent.get_max_energy_table(2, 5, 100)
+        for age in (0, 10, 37, 100):
+            x = age / 100
+            expected = (x * (1 - x)**4) / beta_function(2, 5) * 90 + 10
+            self.assertAlmostEqual(table[age], expected)
+
+    def test_table_grows_past_max_age(self):
+        table = agent.get_max_energy_table(2, 5, 100, 150)
+        self.assertGreaterEqual(len(table), 150)
+
+    def test_noise_is_stable_per_age(self):
+        first = self.agent.calculate_max_energy()
+        self.assertEqual(self.agent.calculate_max_energy(), first) #Same age, same noise.
+        self.assertTrue(0 < first < 100)
+
+    def test_curve_matches_single_lookups(self):
+        self.agent.age = 20
+        curve = self.agent.max_energy_curve()
+        self.assertEqual(len(curve), 21)
+        for age in (0, 5, 20):
+            self.agent.age = age
+            self.assertAlmostEqual(curve[age], self.agent.calculate_max_energy())
+
+    def test_calculate_max_energies_batch(self):
+        agents = [agent.Agent(x=1, y=1) for _ in range(5)]
+        for i, ag in enumerate(agents):
+            ag.age = i * 7
+        batch = agent.calculate_max_energies(agents)
+        for ag, value in zip(agents, batch):
+            self.assertAlmostEqual(value, ag.calculate_max_energy())
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,114 @@
+# tests/test_data_logging.py
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from src.utils import data_logging
+
+ROW = {'time_step': 1, 'agent_x': 5, 'agent_y': 5, 'energy': 80, 'collected_resources': 2}
+
+class TestSimulationLogger(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_csv_matches_log_data(self):
+        expected = os.path.join(self.directory, 'expected.csv')
+        actual = os.path.join(self.directory, 'actual.csv')
+        for step in range(3):
+            data_logging.log_data(dict(ROW, time_step=step), expected)
+        with data_logging.SimulationLogger(actual) as logger:
+            for step in range(3):
+                logger.log(dict(ROW, time_step=step))
+        with open(expected) as a, open(actual) as b:
+            self.assertEqual(a.read(), b.read())
+
+    def test_rows_are_copied_when_logged(self):
+        filename = os.path.join(self.directory, 'data.csv')
+        row = dict(ROW)
+        with data_logging.SimulationLogger(filename) as logger:
+            logger.log(row)
+            row['time_step'] = 2  # The caller reuses its dict.
+            logger.log(row)
+        self.assertEqual([r['time_step'] for r in data_logging.load_data(filename)], ['1', '2'])
+
+    def test_json_lines(self):
+        filename = os.path.join(self.directory, 'data.json')
+        with data_logging.SimulationLogger(filename, format='json') as logger:
+            logger.log_many([dict(ROW, time_step=step) for step in range(4)])
+        self.assertEqual([row['time_step'] for row in data_logging.load_data(filename, 'json')], [0, 1, 2, 3])
+
+    def test_appends_with_existing_header(self):
+        filename = os.path.join(self.directory, 'data.csv')
+        data_logging.log_data(ROW, filename)
+        with data_logging.SimulationLogger(filename) as logger:
+            logger.log(dict(reversed(list(ROW.items())), time_step=2))  # Keys in another order.
+        rows = data_logging.load_data(filename)
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1]['time_step'], '2')
+        self.assertEqual(rows[1]['energy'], '80')
+
+    def test_flushes_in_background_when_full(self):
+        filename = os.path.join(self.directory, 'data.csv')
+        logger = data_logging.SimulationLogger(filename, max_rows=10, flush_interval=60)
+        for step in range(10):
+            logger.log(dict(ROW, time_step=step))
+        for _ in range(200):  # Written by the background thread, long before flush_interval.
+            if logger.rows_written == 10:
+                break
+            logger._thread.join(0.01)
+        self.assertEqual(logger.rows_written, 10)
+        logger.close()
+        with self.assertRaises(ValueError):
+            logger.log(ROW)
+
+class TestStreaming(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_iter_data_batches(self):
+        for format in ('csv', 'json'):
+            filename = os.path.join(self.directory, 'data.' + format)
+            with data_logging.SimulationLogger(filename, format=format) as logger:
+                logger.log_many([dict(ROW, time_step=step, energy=step / 2) for step in range(5)])
+            batches = list(data_logging.iter_data(filename, format, columns=['time_step', 'energy'], chunk_rows=2))
+            self.assertEqual([len(batch['time_step']) for batch in batches], [2, 2, 1])
+            self.assertEqual(set(batches[0]), {'time_step', 'energy'})
+            np.testing.assert_array_equal(np.concatenate([batch['energy'] for batch in batches]), np.arange(5) / 2)
+            self.assertEqual(batches[0]['time_step'].dtype, np.int64)
+
+    def test_iter_data_missing_column(self):
+        filename = os.path.join(self.directory, 'data.csv')
+        data_logging.log_data(ROW, filename)
+        with self.assertRaises(KeyError):
+            list(data_logging.iter_data(filename, columns=['time_step', 'nothing']))
+
+    def test_downsampling_keeps_extremes(self):
+        x = np.arange(100_000)
+        y = np.sin(x / 500.0)
+        y[31_337], y[77_777] = 10.0, -10.0
+        downsampler = data_logging.MinMaxDownsampler(buckets=50)
+        for start in (60_000, 0, 30_000):  # Out of order: the range grows both ways.
+            downsampler.add(x[start:start + 30_000], y[start:start + 30_000])
+        downsampler.add(x[90_000:], y[90_000:])
+        self.assertEqual(downsampler.count, len(x))
+        self.assertLessEqual(len(downsampler.x), 100)
+        self.assertTrue(np.all(np.diff(downsampler.x) >= 0))
+        self.assertIn((31_337, 10.0), zip(downsampler.x, downsampler.y))
+        self.assertIn((77_777, -10.0), zip(downsampler.x, downsampler.y))
+
+    def test_downsample_minmax_small_input(self):
+        x, y = data_logging.downsample_minmax([3, 1, 2], [30, 10, 20], buckets=10)
+        np.testing.assert_array_equal(x, [1, 2, 3])
+        np.testing.assert_array_equal(y, [10, 20, 30])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+# tests/test_dirty_frame.py
+import unittest
+import pygame
+from src.visualization.vis_components import dirty_frame
+
+class TestDirtyFrame(unittest.TestCase):
+
+    def setUp(self):
+        self.frame = dirty_frame.DirtyFrame(pygame.Surface((40, 30)))
+        self.frame.background.fill((0, 0, 255))
+        self.sprite = pygame.Surface((4, 4))
+        self.sprite.fill((255, 0, 0))
+
+    def test_merge_rects(self):
+        merged = dirty_frame.merge_rects([(0, 0, 4, 4), (10, 10, 2, 2), (3, 3, 4, 4), (6, 6, 5, 5)])
+        self.assertEqual(merged, [pygame.Rect(0, 0, 12, 12)])
+        self.assertEqual(len(dirty_frame.merge_rects([(0, 0, 2, 2), (5, 5, 2, 2)])), 2)
+
+    def test_first_draw_and_view_changes_are_full(self):
+        self.assertTrue(self.frame.set_view(1))
+        self.assertEqual(self.frame.draw([(self.sprite, (1, 1))]), [pygame.Rect(0, 0, 40, 30)])
+        self.assertFalse(self.frame.set_view(1))
+        self.assertEqual(self.frame.draw([(self.sprite, (1, 1))]), [])  # Nothing moved.
+        self.assertTrue(self.frame.set_view(2))
+        self.frame.draw([(self.sprite, (1, 1))])
+        self.assertEqual(self.frame.full_redraws, 2)
+
+    def test_moved_sprite_restores_background(self):
+        self.frame.set_view(1)
+        self.frame.draw([(self.sprite, (1, 1))])
+        dirty = self.frame.draw([(self.sprite, (20, 10))])
+        self.assertEqual(sorted(map(tuple, dirty)), [(1, 1, 4, 4), (20, 10, 4, 4)])
+        self.assertEqual(tuple(self.frame.surface.get_at((2, 2)))[:3], (0, 0, 255))
+        self.assertEqual(tuple(self.frame.surface.get_at((21, 11)))[:3], (255, 0, 0))
+
+    def test_overlapping_sprites_are_redrawn_in_order(self):
+        above = pygame.Surface((4, 4))
+        above.fill((0, 255, 0))
+        self.frame.set_view(1)
+        self.frame.draw([(self.sprite, (0, 0)), (above, (10, 10))])
+        # The red sprite moves under the green one, which is drawn after it and must stay on top.
+        self.frame.draw([(self.sprite, (8, 8)), (above, (10, 10))])
+        self.assertEqual(tuple(self.frame.surface.get_at((11, 11)))[:3], (0, 255, 0))
+        self.assertEqual(tuple(self.frame.surface.get_at((9, 9)))[:3], (255, 0, 0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+# tests/test_environment_manager.py
+import time
+import unittest
+import numpy as np
+from src.environment.environment_manager import Scheduler, EnvironmentManager
+from src.environment.terrain import calculate_constrained_heights, TERRAIN_GRASS, TERRAIN_WATER
+
+class TestScheduler(unittest.TestCase):
+
+    def test_jobs_run_at_their_intervals(self):
+        scheduler = Scheduler()
+        runs = {"fast": [], "slow": []}
+        scheduler.every("fast", 1.0, runs["fast"].append)
+        scheduler.every("slow", 2.5, runs["slow"].append)
+        for _ in range(40):
+            scheduler.advance(0.125)
+        self.assertEqual(len(runs["fast"]), 5)
+        self.assertEqual(len(runs["slow"]), 2)
+        self.assertAlmostEqual(runs["slow"][0], 2.5)
+
+    def test_missed_runs_are_not_burst(self):
+        scheduler = Scheduler()
+        runs = []
+        scheduler.every("job", 1.0, runs.append)
+        scheduler.advance(10.0) #One long frame.
+        scheduler.advance(0.1)
+        self.assertEqual(len(runs), 1)
+
+    def test_generator_jobs_are_spread_over_frames(self):
+        scheduler = Scheduler()
+        steps = []
+        def slow_job(now):
+            for i in range(5):
+                time.sleep(0.002)
+                steps.append(i)
+                yield
+        scheduler.every("slow", 1.0, slow_job, budget=0.001)
+        scheduler.advance(1.0)
+        self.assertEqual(len(steps), 1) #Over budget after one step.
+        self.assertTrue(scheduler.jobs["slow"].in_progress)
+        for _ in range(5): #The fifth frame finds the generator exhausted.
+            scheduler.advance(0.01)
+        self.assertEqual(steps, [0, 1, 2, 3, 4])
+        self.assertEqual(scheduler.jobs["slow"].runs, 1)
+
+    def test_frame_budget_defers_due_jobs(self):
+        scheduler = Scheduler(frame_budget=0.001)
+        runs = []
+        def job(now):
+            time.sleep(0.002)
+            runs.append(now)
+        scheduler.every("a", 1.0, job)
+        scheduler.every("b", 1.0, job)
+        scheduler.advance(1.0)
+        self.assertEqual(len(runs), 1)
+        scheduler.advance(0.01)
+        self.assertEqual(len(runs), 2)
+
+class TestEnvironmentManager(unittest.TestCase):
+
+    def test_update_environment(self):
+        size = 8
+        heights = np.linspace(0, 0.5, size * size).reshape(size, size)
+        types = np.full((size, size), TERRAIN_GRASS)
+        types[2:5, 2:5] = TERRAIN_WATER
+        config = {'simulation_speed': 1.0, 'food_respawn_interval': 2000}
+        manager = EnvironmentManager(heights, types, np.zeros((size, size)), num_resources=3, config=config,
+                                     water_budget=None)
+        for _ in range(60):
+            manager.update_environment(0.1)
+        self.assertEqual(len(manager.resource_locations), 3) #Food respawned at t=2s and 4s (maybe twice on a cell).
+        self.assertEqual(manager.scheduler.jobs["water"].runs, 1)
+        self.assertTrue(manager.water_flow[2:5, 2:5].any())
+        self.assertEqual(manager.get_environment_state()["light_map"].shape, (size, size))
+        self.assertFalse(manager.is_within_bounds(size, 0))
+
+    def test_constrained_heights_follow_erosion(self):
+        size = 8
+        heights = np.full((size, size), 0.5)
+        types = np.full((size, size), TERRAIN_GRASS)
+        types[2:5, 2:5] = TERRAIN_WATER
+        manager = EnvironmentManager(heights, types, np.zeros((size, size)), water_budget=None,
+                                     water_params={'erosion_rate': 0.5}, tile_height=40)
+        before = manager.constrained_heights.copy()
+        for _ in range(60):
+            manager.update_environment(0.1)
+        self.assertLess(heights[3, 3], 0.5)
+        self.assertFalse(np.array_equal(manager.constrained_heights, before))
+        np.testing.assert_array_equal(manager.constrained_heights, calculate_constrained_heights(heights, 40))
+
+        ys, xs = manager.take_changed_cells()
+        changed = np.zeros((size, size), dtype=bool)
+        changed[ys, xs] = True
+        self.assertTrue((changed | (manager.constrained_heights == before)).all()) #Every changed cell is reported.
+        self.assertTrue(changed[3, 3])
+        self.assertEqual(len(manager.take_changed_cells()[0]), 0)
+
+    def test_shadows_are_kept_until_erosion_adds_up(self):
+        size = 8
+        heights = np.full((size, size), 0.5)
+        types = np.full((size, size), TERRAIN_GRASS)
+        types[2:5, 2:5] = TERRAIN_WATER
+        manager = EnvironmentManager(heights, types, np.zeros((size, size)), water_budget=None, water_interval=1.0, light_interval=1000.0,
+                                     water_params={'erosion_rate': 0.01}, shadow_tolerance=0.025)
+        manager.sunlight.shadow_mask(60.0)  # Cached.
+        manager.update_environment(1.0)  # Eroded by 0.01.
+        self.assertEqual(len(manager.sunlight._masks), 1)
+        manager.update_environment(1.0)
+        manager.update_environment(1.0)  # 0.03 in total: past the tolerance.
+        self.assertEqual(len(manager.sunlight._masks), 0)
+
+    def test_dried_up_cells_are_reported(self):
+        size = 6
+        types = np.full((size, size), TERRAIN_GRASS)
+        types[2, 2] = TERRAIN_WATER  # No water neighbours: dries up.
+        manager = EnvironmentManager(np.full((size, size), 0.5), types, np.zeros((size, size)), water_budget=None,
+                                     water_interval=0.1, water_params={'dryness_threshold': 0.05})
+        for _ in range(3):
+            manager.update_environment(0.1)
+        self.assertEqual(types[2, 2], TERRAIN_GRASS)
+        ys, xs = manager.take_changed_cells()
+        self.assertIn((2, 2), set(zip(ys.tolist(), xs.tolist())))
+
+if __name__ == '__main__':
+    unittest.main()
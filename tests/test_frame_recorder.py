@@ -0,0 +1,111 @@
+# tests/test_frame_recorder.py
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import numpy as np
+import pygame
+from src.visualization import frame_recorder
+
+class TestFrameRecorder(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.surface = pygame.Surface((7, 5))
+        self.surface.fill((10, 200, 30))
+        self.surface.set_at((3, 2), (255, 0, 128))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_encode_png_round_trip(self):
+        pixels = np.transpose(pygame.surfarray.array3d(self.surface), (1, 0, 2)).copy()
+        path = os.path.join(self.directory, "frame.png")
+        with open(path, "wb") as file:
+            file.write(frame_recorder.encode_png(pixels))
+        loaded = pygame.image.load(path)
+        np.testing.assert_array_equal(pygame.surfarray.array3d(loaded), pygame.surfarray.array3d(self.surface))
+
+    def test_png_sequence(self):
+        with frame_recorder.FrameRecorder(self.directory, format="png") as recorder:
+            for _ in range(3):
+                self.assertTrue(recorder.capture(self.surface))
+        self.assertEqual(sorted(os.listdir(self.directory)), ["frame_000000.png", "frame_000001.png", "frame_000002.png"])
+        self.assertEqual(tuple(pygame.image.load(os.path.join(self.directory, "frame_000001.png")).get_at((3, 2)))[:3],
+                         (255, 0, 128))
+
+    def test_raw_chunks(self):
+        with frame_recorder.FrameRecorder(self.directory, format="raw", chunk_frames=2) as recorder:
+            for _ in range(3):
+                recorder.capture(self.surface)
+        with open(os.path.join(self.directory, "video.json")) as file:
+            info = json.load(file)
+        self.assertEqual((info["width"], info["height"], info["frames"]), (7, 5, 3))
+        self.assertEqual(os.path.getsize(os.path.join(self.directory, "frames_000.raw")), 2 * 7 * 5 * 4)
+        self.assertEqual(os.path.getsize(os.path.join(self.directory, "frames_001.raw")), 7 * 5 * 4)
+        self.assertEqual(info["pix_fmt"], "rgb0")
+        pixels = np.fromfile(os.path.join(self.directory, "frames_001.raw"), dtype=np.uint8).reshape(5, 7, 4)
+        self.assertEqual(tuple(pixels[2, 3, :3]), (255, 0, 128))
+
+    def test_drops_frames_when_writer_lags(self):
+        recorder = frame_recorder.FrameRecorder(self.directory, format="png", max_queue=2)
+        release = threading.Event()
+        write = recorder._write
+        recorder._write = lambda *frame: (release.wait(), write(*frame))  # A stalled writer.
+        results = [recorder.capture(self.surface) for _ in range(10)]
+        release.set()
+        recorder.close()
+        self.assertFalse(all(results))
+        self.assertEqual(recorder.captured, 10)
+        self.assertEqual(recorder.written + recorder.dropped, 10)
+        self.assertEqual(len(os.listdir(self.directory)), recorder.written)
+        self.assertEqual(recorder.dropped_frames, [i for i, kept in enumerate(results) if not kept])
+
+    def test_write_errors_do_not_stop_the_writers(self):
+        recorder = frame_recorder.FrameRecorder(self.directory, format="png", workers=1)
+        write = recorder._write
+        def flaky_write(index, data):
+            if index == 1:
+                raise ValueError("bad frame")
+            write(index, data)
+        recorder._write = flaky_write
+        for _ in range(3):
+            recorder.capture(self.surface)
+        recorder.close()
+        self.assertEqual(recorder.written, 2)
+        self.assertEqual(recorder.dropped_frames, [1])
+
+    def test_close_returns_when_the_writers_died(self):
+        recorder = frame_recorder.FrameRecorder(self.directory, max_queue=1, workers=1)
+        recorder._queue.put(None)  # The writer stops as if it had crashed.
+        recorder._threads[0].join()
+        recorder.capture(self.surface)  # Fills the queue.
+        recorder.close()
+        self.assertFalse(recorder._threads[0].is_alive())
+
+    def test_raw_records_dropped_frames(self):
+        recorder = frame_recorder.FrameRecorder(self.directory, format="raw", max_queue=2)
+        release = threading.Event()
+        write = recorder._write
+        recorder._write = lambda *frame: (release.wait(), write(*frame))
+        results = [recorder.capture(self.surface) for _ in range(6)]
+        release.set()
+        recorder.close()
+        with open(os.path.join(self.directory, "video.json")) as file:
+            info = json.load(file)
+        self.assertEqual(info["dropped_frames"], [i for i, kept in enumerate(results) if not kept])
+        self.assertEqual(info["frames"] + len(info["dropped_frames"]), info["captured"])
+        self.assertEqual(os.path.getsize(os.path.join(self.directory, "frames_000.raw")), info["frames"] * 7 * 5 * 4)
+
+    def test_png_workers(self):
+        with frame_recorder.FrameRecorder(self.directory, format="png", workers=3) as recorder:
+            self.assertEqual(len(recorder._threads), 3)
+            for _ in range(8):
+                recorder.capture(self.surface)
+        self.assertEqual(recorder.written + recorder.dropped, 8)
+        self.assertEqual(len(os.listdir(self.directory)), recorder.written)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+# tests/test_genetic_algorithm.py
+import unittest
+import numpy as np
+from src.agent.genome import GenomePopulation, GeneSchema
+from src.genetic_algorithm import mutation, crossover, selection
+from src.genetic_algorithm.genetic_algorithm import evolve
+from src.genetic_algorithm.evaluation import FitnessEvaluator
+from src.genetic_algorithm.island_model import IslandModel, migration_sources
+from src.agent_simulation import World
+
+class TestGenomePopulation(unittest.TestCase):
+
+    def test_random_population_respects_schema(self):
+        schema = GeneSchema({"a": (0.0, 1.0), "b": (-2.0, 2.0)})
+        population = GenomePopulation.random(1000, schema, rng=np.random.default_rng(0))
+        self.assertEqual(population.genes.shape, (1000, 2))
+        self.assertEqual(population.genes.dtype, np.float32)
+        self.assertTrue((population.column("b") >= -2).all() and (population.column("b") <= 2).all())
+        self.assertEqual(set(population[3].get_all_genes()), {"a", "b"})
+
+class TestOperators(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+        # Parent a is all zeros, parent b is all ones, so children show where each gene came from.
+        self.genes = np.array([[0.0] * 8, [1.0] * 8], dtype=np.float32)
+
+    def test_gaussian_mutation_only_touches_masked_genes(self):
+        genes = np.zeros((200, 4), dtype=np.float32)
+        mask = mutation.gaussian_mutation(genes, 0.1, sigma=1.0, rng=self.rng)
+        self.assertTrue((genes[~mask] == 0).all())
+        self.assertTrue(0.05 < mask.mean() < 0.15)
+
+    def test_k_point_crossover_alternates_segments(self):
+        parents_a = np.zeros(50, dtype=int)
+        parents_b = np.ones(50, dtype=int)
+        children = crossover.k_point_crossover(self.genes, parents_a, parents_b, k=2, rng=self.rng)
+        for child in children:
+            switches = np.count_nonzero(np.diff(child))
+            self.assertEqual(child[0], 0) #Always starts with parent a.
+            self.assertLessEqual(switches, 2)
+            self.assertGreaterEqual(switches, 1)
+
+    def test_uniform_crossover_mixes_parents(self):
+        children = crossover.uniform_crossover(self.genes, np.zeros(100, dtype=int), np.ones(100, dtype=int), rng=self.rng)
+        self.assertTrue(0.4 < children.mean() < 0.6)
+
+    def test_tournament_selection_favors_fitter(self):
+        fitness = np.arange(100, dtype=np.float64)
+        picks = selection.tournament_selection(fitness, 1000, tournament_size=4, rng=self.rng)
+        self.assertGreater(fitness[picks].mean(), fitness.mean())
+
+    def test_roulette_selection_skips_zero_fitness(self):
+        fitness = np.array([0.0, 0.0, 5.0, 0.0])
+        picks = selection.roulette_wheel_selection(fitness, 100, rng=self.rng)
+        self.assertTrue((picks == 2).all())
+
+    def test_evolve_keeps_size_and_elite(self):
+        population = GenomePopulation.random(500, rng=self.rng)
+        fitness = population.genes.sum(axis=1)
+        best = population.genes[np.argmax(fitness)].copy()
+        next_generation = evolve(population, fitness, num_elites=2, rng=self.rng)
+        self.assertEqual(len(next_generation), 500)
+        self.assertTrue((next_generation.genes == best).all(axis=1).any())
+
+class TestFitnessEvaluator(unittest.TestCase):
+
+    def setUp(self):
+        self.world = World.generate(12, 12, 10, seed=1)
+        self.population = GenomePopulation.random(6, rng=np.random.default_rng(2))
+
+    def test_parallel_matches_serial(self):
+        with FitnessEvaluator(self.world, steps=30, seed=5, max_workers=2, chunk_size=2) as evaluator:
+            serial = evaluator.evaluate_serial(self.population)
+            parallel = evaluator.evaluate(self.population)
+        np.testing.assert_array_equal(serial, parallel)
+        self.assertEqual(serial.shape, (6,))
+
+    def test_pool_is_restarted_after_recycling(self):
+        with FitnessEvaluator(self.world, steps=30, seed=5, max_workers=2, chunk_size=3) as evaluator:
+            first = evaluator.evaluate(self.population)
+            shared_world = evaluator._shared_world
+            evaluator._recycle()  # As after a timed-out chunk.
+            self.assertIsNone(evaluator._executor)
+            np.testing.assert_array_equal(evaluator.evaluate(self.population), first)
+            self.assertIs(evaluator._shared_world, shared_world) #The world isn't copied again.
+
+    def test_episode_timeout_scores_timeout_fitness(self):
+        evaluator = FitnessEvaluator(self.world, steps=10**6, timeout=0.01, timeout_fitness=-1.0)
+        fitness = evaluator.evaluate_serial(self.population)
+        self.assertTrue((fitness == -1.0).all())
+
+class TestIslandModel(unittest.TestCase):
+
+    def test_migration_sources(self):
+        self.assertEqual(migration_sources(4, "ring", 0, 1), [3, 0, 1, 2])
+        sources = migration_sources(5, "random", 0, 3)
+        self.assertEqual(sorted(sources), list(range(5))) #Every island sends exactly once.
+        self.assertTrue(all(source != island for island, source in enumerate(sources)))
+
+    def test_run_returns_per_island_stats(self):
+        model = IslandModel(num_islands=2, island_size=6, generations=2, migration_interval=1,
+                            num_migrants=1, steps=20, world_size=(10, 10), num_resources=6)
+        result = model.run()
+        self.assertEqual(result["stats"].shape, (2, 2, 3))
+        self.assertEqual(len(result["populations"]), 2)
+        self.assertEqual(result["fitness"].shape, (2, 6))
+        self.assertEqual(result["best_fitness"], np.nanmax(result["fitness"]))
+
+if __name__ == '__main__':
+    unittest.main()
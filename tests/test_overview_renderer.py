@@ -0,0 +1,82 @@
+# tests/test_overview_renderer.py
+import unittest
+import numpy as np
+import pygame
+from src.visualization.vis_components import overview_renderer
+from src.visualization.vis_components.position_manager import PositionManager
+
+class Dot:
+    def __init__(self, x, y, color=(255, 0, 0)):
+        self.x, self.y, self.color = x, y, color
+
+    def get_position(self):
+        return self.x, self.y
+
+    def is_alive(self):
+        return True
+
+class TestOverviewMap(unittest.TestCase):
+
+    def setUp(self):
+        self.heights = np.zeros((4, 5))
+        self.heights[3, 4] = 1.0
+        self.colors = np.full((4, 5, 3), 100, dtype=np.uint8)
+        self.types = np.zeros((4, 5), dtype=int)
+        self.overview = overview_renderer.OverviewMap(self.colors, self.heights, self.types)
+
+    def test_shading_and_iso_layout(self):
+        iso = pygame.surfarray.array3d(self.overview.iso)
+        self.assertEqual(self.overview.iso.get_size(), (9, 8))
+        low = round(100 * overview_renderer.SHADE_MIN)
+        self.assertEqual(tuple(iso[3, 0]), (low,) * 3) #Cell (0, 0): u = 0 - 0 + 3, v = 0.
+        self.assertEqual(tuple(iso[4, 0]), (low,) * 3)
+        self.assertEqual(tuple(iso[4, 7]), (100,) * 3) #Cell (4, 3), the highest, at full brightness.
+        self.assertEqual(tuple(iso[0, 0]), overview_renderer.BACKGROUND_COLOR)
+
+    def test_only_changed_cells_are_rewritten(self):
+        resources = np.zeros((4, 5))
+        agent = Dot(1.5, 2.2)
+        self.assertEqual(self.overview.update(self.heights, self.types, resources, [agent]), 1)
+        self.assertEqual(self.overview.update(self.heights, self.types, resources, [agent]), 1) #Just the agent's cell.
+        resources = resources.copy() #Food respawns as a new map.
+        resources[0, 0] = 1
+        agent.x = 2.5
+        self.assertEqual(self.overview.update(self.heights, self.types, resources, [agent]), 3)
+        top_down = pygame.surfarray.array3d(self.overview.top_down)
+        self.assertEqual(tuple(top_down[0, 0]), overview_renderer.RESOURCE_COLOR)
+        self.assertEqual(tuple(top_down[2, 2]), (255, 0, 0))
+        self.assertNotEqual(tuple(top_down[1, 2]), (255, 0, 0)) #The cell the agent left.
+        resources[0, 0] = 0 #Collected in place.
+        self.assertEqual(self.overview.update(self.heights, self.types, resources, [agent]), 2)
+        self.assertNotEqual(tuple(pygame.surfarray.array3d(self.overview.top_down)[0, 0]), overview_renderer.RESOURCE_COLOR)
+
+    def test_changed_cells_are_reshaded(self):
+        resources = np.zeros((4, 5))
+        self.heights[1, 2] = 1.0  # Not reported: stays as it was.
+        self.heights[3, 4] = 0.0
+        self.assertEqual(self.overview.update(self.heights, self.types, resources, [],
+                                              changed_cells=(np.array([3]), np.array([4]))), 1)
+        top_down = pygame.surfarray.array3d(self.overview.top_down)
+        low = round(100 * overview_renderer.SHADE_MIN)
+        self.assertEqual(tuple(top_down[4, 3]), (low,) * 3)
+        self.assertEqual(tuple(top_down[2, 1]), (low,) * 3)
+
+    def test_minimap_is_reused_until_something_changes(self):
+        position_manager = PositionManager(game_width=400, screen_height=300, map_width=5, map_height=4)
+        resources = np.zeros((4, 5))
+        agent = Dot(1.5, 2.2)
+        self.overview.update(self.heights, self.types, resources, [agent])
+        minimap, position = self.overview.minimap(position_manager, 300)
+        agent.x = 1.9  # Same cell.
+        self.overview.update(self.heights, self.types, resources, [agent])
+        self.assertIs(self.overview.minimap(position_manager, 300)[0], minimap)
+        agent.x = 3.5
+        self.overview.update(self.heights, self.types, resources, [agent])
+        self.assertIsNot(self.overview.minimap(position_manager, 300)[0], minimap)
+        minimap = self.overview.minimap(position_manager, 300)[0]
+        position_manager.base_x += 100  # The viewport moved.
+        self.assertIsNot(self.overview.minimap(position_manager, 300)[0], minimap)
+        self.assertEqual(position[1] + minimap.get_height(), 300 - overview_renderer.MINIMAP_MARGIN + 1)
+
+if __name__ == '__main__':
+    unittest.main()
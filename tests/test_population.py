@@ -0,0 +1,43 @@
+# tests/test_population.py
+import unittest
+from src.agent import agent
+from src.agent.population import Population, DeathArchive
+
+class TestPopulation(unittest.TestCase):
+
+    def setUp(self):
+        self.agents = [agent.Agent(x=i, y=i, group=i % 2) for i in range(4)]
+        self.population = Population(self.agents, archive_capacity=3)
+
+    def test_reap_removes_dead_agents(self):
+        self.agents[1].energy = 0
+        dead = self.population.reap(current_time=500)
+        self.assertEqual(dead, [self.agents[1]])
+        self.assertEqual(len(self.population), 3)
+        self.assertNotIn(self.agents[1], list(self.population))
+
+        record = self.population.deaths.records()[0]
+        self.assertEqual(record['time'], 500)
+        self.assertEqual((record['x'], record['y']), (1, 1))
+        self.assertEqual(self.population.deaths.counts_by_cause()["starvation"], 1)
+
+    def test_slots_are_recycled(self):
+        self.agents[2].energy = 0
+        self.population.reap(current_time=0)
+        newborn = agent.Agent(x=0, y=0, group=0)
+        self.assertEqual(self.population.add(newborn), 2) #Reuses the freed slot.
+        self.assertEqual(len(self.population.slots), 4)
+        self.assertIs(self.population.slots[2], newborn)
+        self.assertEqual(newborn.agent_id, 4)  # Ids are not recycled with the slot.
+        self.assertEqual([a.agent_id for a in self.agents], [0, 1, 2, 3])
+
+    def test_archive_is_bounded(self):
+        archive = DeathArchive(capacity=3)
+        for t in range(5):
+            archive.record(t, 0, 0, "starvation")
+        self.assertEqual(len(archive), 3)
+        self.assertEqual(archive.total, 5)
+        self.assertEqual(archive.records()['time'].tolist(), [2, 3, 4]) #Oldest first.
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+# tests/test_position_manager.py
+import unittest
+import numpy as np
+from src.visualization.vis_components.position_manager import PositionManager
+
+def grid_to_iso(grid_x, grid_y, height, tile_width, tile_height):
+    return (grid_x - grid_y) * tile_width / 2, (grid_x + grid_y) * tile_height / 2 - height
+
+class TestPositionManager(unittest.TestCase):
+
+    def setUp(self):
+        self.position_manager = PositionManager(800, 600, map_width=200, map_height=200)
+        self.position_manager.set_zoom(1.5)
+        self.position_manager.base_x += 12
+
+    def test_world_position_inverts_render_position(self):
+        screen_x, screen_y = self.position_manager.get_render_position(37.0, -12.5)
+        world_x, world_y = self.position_manager.get_world_position(screen_x, screen_y)
+        self.assertAlmostEqual(world_x, 37.0)
+        self.assertAlmostEqual(world_y, -12.5)
+
+    def test_visible_cells_contain_every_on_screen_cell(self):
+        tile_width = self.position_manager.get_terrain_cell_size() * 2
+        tile_height = tile_width / 2
+        x0, y0, x1, y1 = self.position_manager.get_visible_cells(200, 200, tile_width, tile_height, max_height=30)
+        self.assertLess((x1 - x0) * (y1 - y0), 200 * 200) #Something was culled.
+        ys, xs = np.mgrid[0:200, 0:200]
+        heights = (xs * 7 + ys * 3) % 31 #Arbitrary heights in [0, 30].
+        screen_x, screen_y = self.position_manager.get_render_position(*grid_to_iso(xs, ys, heights, tile_width, tile_height))
+        on_screen = (screen_x >= 0) & (screen_x < 800) & (screen_y >= 0) & (screen_y < 600)
+        self.assertTrue(on_screen.any())
+        inside = (xs >= x0) & (xs < x1) & (ys >= y0) & (ys < y1)
+        self.assertTrue(inside[on_screen].all())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+# tests/test_render_queue.py
+import unittest
+import pygame
+from src.visualization.vis_components import render_queue
+
+class TestRenderQueue(unittest.TestCase):
+
+    def solid(self, color, size=(4, 4)):
+        surface = pygame.Surface(size)
+        surface.fill(color)
+        return surface
+
+    def test_draws_back_to_front(self):
+        queue = render_queue.RenderQueue()
+        screen = pygame.Surface((4, 4))
+        queue.add(self.solid((255, 0, 0)), (0, 0), depth=5) #Nearer, added first.
+        queue.add(self.solid((0, 255, 0)), (0, 0), depth=2)
+        queue.draw(screen)
+        self.assertEqual(tuple(screen.get_at((1, 1)))[:3], (255, 0, 0))
+        self.assertEqual(len(queue), 0)
+
+    def test_layer_then_order_break_ties(self):
+        queue = render_queue.RenderQueue()
+        screen = pygame.Surface((4, 4))
+        queue.add(self.solid((0, 0, 255)), (0, 0), depth=3, layer=render_queue.LAYER_TERRAIN)
+        queue.add(self.solid((255, 0, 0)), (0, 0), depth=3, order=2.0)
+        queue.add(self.solid((0, 255, 0)), (0, 0), depth=3, order=1.0)
+        queue.draw(screen)
+        self.assertEqual(tuple(screen.get_at((1, 1)))[:3], (255, 0, 0))
+
+    def test_overlay_and_area(self):
+        queue = render_queue.RenderQueue()
+        screen = pygame.Surface((4, 4))
+        queue.add(self.solid((255, 255, 255)), (0, 0), depth=render_queue.OVERLAY_DEPTH, area=(0, 0, 2, 2))
+        queue.add(self.solid((255, 0, 0)), (0, 0), depth=100)
+        queue.draw(screen)
+        self.assertEqual(tuple(screen.get_at((1, 1)))[:3], (255, 255, 255))
+        self.assertEqual(tuple(screen.get_at((3, 3)))[:3], (255, 0, 0)) #Outside the overlay's area.
+
+    def test_occludable_items(self):
+        queue = render_queue.RenderQueue()
+        queue.add(self.solid((255, 0, 0), (2, 3)), (5, 6), depth=3, cell=(1, 2))
+        queue.add(self.solid((255, 0, 0)), (0, 0), depth=render_queue.OVERLAY_DEPTH)
+        self.assertEqual(queue.occludable, [(pygame.Rect(5, 6, 2, 3), (1, 2))])
+        queue.draw(pygame.Surface((4, 4)))
+        self.assertEqual(queue.occludable, [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+# tests/test_rl.py
+import tempfile
+import unittest
+from functools import partial
+import numpy as np
+from src.agent_simulation import World
+from src.rl.environment import SimulationEnv, observation_size
+from src.rl.replay_buffer import ReplayBuffer, SumTree
+from src.rl.vec_env import SyncVecEnv, SubprocVecEnv, SharedMemoryVecEnv
+
+class TestVecEnv(unittest.TestCase):
+
+    def setUp(self):
+        self.world = World.generate(12, 12, 10, seed=0)
+        self.env_fns = [partial(SimulationEnv, self.world, num_agents=3, seed=i, max_steps=15) for i in range(2)]
+
+    def run_env(self, vec_env, steps=40):
+        rng = np.random.default_rng(0)
+        observations = vec_env.reset()
+        rewards = []
+        for _ in range(steps):
+            observations, reward, dones, infos = vec_env.step(rng.integers(0, 9, vec_env.num_envs))
+            rewards.append(reward.copy()) #Shared memory vec envs return views into their buffer.
+        vec_env.close()
+        return observations, np.stack(rewards), dones, infos
+
+    def test_sync_shapes_and_auto_reset(self):
+        vec_env = SyncVecEnv(self.env_fns)
+        self.assertEqual(vec_env.num_envs, 6)
+        observations, rewards, dones, infos = self.run_env(vec_env, steps=15)
+        self.assertEqual(observations.shape, (6, observation_size()))
+        self.assertEqual(observations.dtype, np.float32)
+        self.assertEqual(rewards.shape, (15, 6))
+        self.assertTrue(dones.all()) #max_steps reached on the 15th step.
+        self.assertIn("terminal_observation", infos[0])
+
+    def test_subproc_matches_sync(self):
+        sync_result = self.run_env(SyncVecEnv(self.env_fns))
+        subproc_result = self.run_env(SubprocVecEnv(self.env_fns))
+        np.testing.assert_array_equal(sync_result[0], subproc_result[0])
+        np.testing.assert_array_equal(sync_result[1], subproc_result[1])
+
+    def test_shared_memory_matches_sync(self):
+        sync_result = self.run_env(SyncVecEnv(self.env_fns))
+        vec_env = SharedMemoryVecEnv(self.env_fns, n_steps=16) #40 steps wrap the buffer twice.
+        shared_result = self.run_env(vec_env)
+        np.testing.assert_array_equal(sync_result[0], shared_result[0])
+        np.testing.assert_array_equal(sync_result[1], shared_result[1])
+        np.testing.assert_array_equal(sync_result[2], shared_result[2])
+
+class TestReplayBuffer(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def make_buffer(self, **kwargs):
+        return ReplayBuffer(self.directory.name, capacity=10, obs_shape=(3,), **kwargs)
+
+    def add_batch(self, buffer, start, n):
+        observations = np.arange(start, start + n, dtype=np.float32)[:, None].repeat(3, axis=1)
+        return buffer.add(observations, np.arange(n), np.arange(start, start + n), observations + 1, np.zeros(n, bool))
+
+    def test_ring_overwrites_oldest(self):
+        buffer = self.make_buffer()
+        self.add_batch(buffer, 0, 7)
+        slots = self.add_batch(buffer, 7, 6)
+        np.testing.assert_array_equal(slots, [7, 8, 9, 0, 1, 2])
+        self.assertEqual(len(buffer), 10)
+        self.assertEqual(buffer.position, 3)
+        np.testing.assert_array_equal(buffer.arrays["rewards"], [10, 11, 12, 3, 4, 5, 6, 7, 8, 9])
+
+    def test_sum_tree_find(self):
+        tree = SumTree(5)
+        tree.update(np.arange(5), [1.0, 0.0, 2.0, 0.0, 1.0])
+        self.assertEqual(tree.total, 4.0)
+        np.testing.assert_array_equal(tree.find([0.0, 0.99, 1.0, 2.5, 3.0, 3.99]), [0, 0, 2, 2, 4, 4])
+
+    def test_prioritized_sampling(self):
+        buffer = self.make_buffer(prioritized=True, alpha=1.0, epsilon=0.0)
+        self.add_batch(buffer, 0, 10)
+        buffer.update_priorities(np.arange(10), [0, 0, 0, 0, 0, 0, 0, 0, 0, 100])
+        batch = buffer.sample(8, rng=np.random.default_rng(0))
+        self.assertTrue((batch["indices"] == 9).all())
+        np.testing.assert_array_equal(batch["rewards"], 9)
+
+    def test_resume(self):
+        buffer = self.make_buffer(prioritized=True)
+        self.add_batch(buffer, 0, 4)
+        buffer.update_priorities([1], [5.0])
+        buffer.close()
+        resumed = self.make_buffer(prioritized=True)
+        self.assertEqual((len(resumed), resumed.position), (4, 4))
+        np.testing.assert_array_equal(resumed.arrays["rewards"][:4], [0, 1, 2, 3])
+        self.assertAlmostEqual(resumed.tree.total, 3 + (5.0 + 1e-6) ** 0.6) #Three new transitions at priority 1.
+        with self.assertRaises(ValueError):
+            ReplayBuffer(self.directory.name, capacity=20, obs_shape=(3,))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+# tests/test_snapshots.py
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from src.agent import agent
+from src.agent.population import Population
+from src.utils import snapshots, data_logging
+
+class TestSnapshots(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = os.path.join(tempfile.mkdtemp(), "run")
+
+    def tearDown(self):
+        shutil.rmtree(os.path.dirname(self.directory))
+
+    def write_ticks(self, ticks, agents=4, chunk_rows=10):
+        with snapshots.SnapshotWriter(self.directory, chunk_rows=chunk_rows) as writer:
+            for tick in ticks:
+                writer.append(tick, {
+                    "agent_id": np.arange(agents),
+                    "agent_x": np.full(agents, tick * 0.5),
+                    "energy": np.linspace(0, 100, agents),
+                })
+
+    def test_round_trip_in_chunks(self):
+        self.write_ticks(range(6))  # 24 rows: chunks of 10, 10 and 4.
+        reader = snapshots.SnapshotReader(self.directory)
+        self.assertEqual([chunk["rows"] for chunk in reader.chunks], [10, 10, 4])
+        data = reader.read()
+        self.assertEqual(len(data), 24)
+        self.assertEqual(data.dtype, snapshots.AGENT_SNAPSHOT_DTYPE)
+        np.testing.assert_array_equal(data["time_step"], np.repeat(np.arange(6), 4))
+        np.testing.assert_array_equal(data["agent_x"], np.repeat(np.arange(6) * 0.5, 4))
+        np.testing.assert_array_equal(data["agent_y"], 0)  # Not given.
+
+    def test_column_and_time_range(self):
+        self.write_ticks(range(6))
+        reader = snapshots.SnapshotReader(self.directory)
+        np.testing.assert_array_equal(reader.column("agent_x", start=2, stop=4), np.repeat([1.0, 1.5], 4))
+        data = reader.read(["agent_id"], start=5)
+        self.assertEqual(data.dtype.names, ("agent_id",))
+        np.testing.assert_array_equal(data["agent_id"], np.arange(4))
+        self.assertEqual(len(reader.read(start=10)), 0)
+
+    def test_reopening_appends(self):
+        self.write_ticks(range(2))
+        self.write_ticks(range(2, 3))
+        self.assertEqual(len(snapshots.SnapshotReader(self.directory)), 12)
+        with self.assertRaises(ValueError):
+            snapshots.SnapshotWriter(self.directory, dtype=[("time_step", np.int64)])
+
+    def test_load_data(self):
+        self.write_ticks(range(3))
+        data = data_logging.load_data(self.directory, format='npz', columns=["time_step", "energy"], start=1)
+        self.assertEqual(len(data), 8)
+        self.assertEqual(float(data["energy"][-1]), 100.0)
+
+    def test_agent_snapshot_ids_are_not_reused(self):
+        agents = [agent.Agent(x=i, y=2 * i, group=0) for i in range(3)]
+        population = Population(agents)
+        agents[0].energy = 0
+        population.reap(current_time=0)
+        newborn = agent.Agent(x=7, y=8, group=0)
+        population.add(newborn)  # Takes the dead agent's slot.
+        columns = snapshots.agent_snapshot(list(population))
+        self.assertEqual(sorted(columns["agent_id"]), [1, 2, 3])
+        self.assertEqual(columns["agent_x"][columns["agent_id"].index(3)], 7)
+        self.assertEqual(snapshots.agent_snapshot([agent.Agent(x=0, y=0, group=0)])["agent_id"], [-1])
+
+if __name__ == '__main__':
+    unittest.main()
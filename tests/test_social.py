@@ -0,0 +1,91 @@
+# tests/test_social.py
+import unittest
+import numpy as np
+from src.agent import social
+
+class TestSpatialHash(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.positions = rng.uniform(0, 100, (500, 2))
+        self.groups = rng.integers(0, 2, 500)
+        self.spatial_hash = social.SpatialHash(cell_size=4.0)
+        self.spatial_hash.rebuild(self.positions, self.groups)
+
+    def brute_force_distances(self, index):
+        return np.hypot(*(self.positions - self.positions[index]).T)
+
+    def test_query_radius_matches_brute_force(self):
+        for index in (0, 17, 250):
+            x, y = self.positions[index]
+            found = self.spatial_hash.query_radius(x, y, 7.5, exclude=index)
+            distances = self.brute_force_distances(index)
+            expected = set(np.flatnonzero(distances <= 7.5).tolist()) - {index}
+            self.assertEqual(set(found.tolist()), expected)
+
+    def test_query_rect_matches_brute_force(self):
+        found = self.spatial_hash.query_rect(10, 20, 35.5, 30)
+        x, y = self.positions.T
+        expected = np.flatnonzero((x >= 10) & (x < 35.5) & (y >= 20) & (y < 30))
+        self.assertEqual(sorted(found.tolist()), expected.tolist())
+
+    def test_k_nearest_same_and_other_group(self):
+        for same_group in (True, False):
+            x, y = self.positions[3]
+            group = self.groups[3]
+            found = self.spatial_hash.k_nearest(x, y, 4, group=group, same_group=same_group, exclude=3)
+            distances = self.brute_force_distances(3)
+            mask = (self.groups == group) if same_group else (self.groups != group)
+            distances[~mask] = np.inf
+            distances[3] = np.inf
+            np.testing.assert_allclose(distances[found], np.sort(distances)[:4])
+
+    def test_update_positions_refiles_moved_agents(self):
+        self.positions[10] = (99.0, 99.0)
+        self.spatial_hash.update_positions(self.positions)
+        found = self.spatial_hash.query_radius(99.0, 99.0, 0.5)
+        self.assertIn(10, found.tolist())
+
+    def test_update_positions_with_agents_added_and_removed(self):
+        spatial_hash = social.SpatialHash(cell_size=4.0, capacity=2)
+        spatial_hash.update_positions([(1.0, 1.0), (50.0, 50.0)], [0, 1])
+        grown = np.array([(1.0, 1.0), (50.0, 50.0), (2.0, 2.0), (80.0, 10.0), (51.0, 50.0)])
+        spatial_hash.update_positions(grown, [0, 1, 1, 0, 1])  # Past the capacity.
+        self.assertEqual(spatial_hash.count, 5)
+        self.assertEqual(sorted(spatial_hash.query_radius(1.5, 1.5, 2.0).tolist()), [0, 2])
+        self.assertEqual(spatial_hash.query_rect(79, 9, 81, 11).tolist(), [3])
+        self.assertEqual(spatial_hash.k_nearest(50.0, 50.0, 1, group=1, exclude=1).tolist(), [4])
+        spatial_hash.update_positions(grown[:3])  # The last two left.
+        self.assertEqual(spatial_hash.count, 3)
+        self.assertEqual(spatial_hash.query_rect(0, 0, 100, 100).size, 3)
+        spatial_hash.move(7, 10.0, 10.0)  # Not in the hash yet.
+        self.assertEqual(spatial_hash.query_radius(10.0, 10.0, 0.5).tolist(), [7])
+
+    def test_recycled_slot_does_not_keep_the_old_group(self):
+        spatial_hash = social.SpatialHash(cell_size=4.0)
+        spatial_hash.update_positions([(1.0, 1.0), (2.0, 2.0)], [0, 1])
+        spatial_hash.update_positions([(1.0, 1.0)])  # Id 1 left...
+        spatial_hash.update_positions([(1.0, 1.0), (3.0, 3.0)])  # ...and a new agent took its slot.
+        self.assertEqual(spatial_hash.groups[1], -1)
+        self.assertEqual(spatial_hash.k_nearest(1.0, 1.0, 1, group=1).tolist(), [])
+
+    def test_insert_move_remove(self):
+        spatial_hash = social.SpatialHash(cell_size=2.0)
+        spatial_hash.insert(0, 1.0, 1.0, group=0)
+        spatial_hash.insert(5, 30.0, 30.0, group=1)
+        spatial_hash.move(0, 29.0, 29.0)
+        self.assertEqual(sorted(spatial_hash.query_radius(30.0, 30.0, 2.0).tolist()), [0, 5])
+        spatial_hash.remove(5)
+        self.assertEqual(spatial_hash.k_nearest(0.0, 0.0, 3).tolist(), [0])
+
+    def test_groups_version_changes_with_groups(self):
+        spatial_hash = social.SpatialHash(cell_size=2.0)
+        spatial_hash.rebuild([(0, 0), (1, 1)], groups=[0, 1])
+        version = spatial_hash.groups_version
+        spatial_hash.update_positions([(5, 5), (1, 1)], groups=[0, 1])  # Moved, same groups.
+        self.assertEqual(spatial_hash.groups_version, version)
+        spatial_hash.update_positions([(5, 5), (1, 1)], groups=[1, 1])
+        self.assertGreater(spatial_hash.groups_version, version)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+# tests/test_sprite_atlas.py
+import unittest
+import pygame
+from src.visualization.vis_components import sprite_atlas
+
+class TestSpriteAtlas(unittest.TestCase):
+
+    def setUp(self):
+        self.built = []
+
+    def build(self, zoom):
+        self.built.append(zoom)
+        return pygame.Surface((10, 10))
+
+    def test_quantized_zoom_shares_sprite(self):
+        atlas = sprite_atlas.SpriteAtlas()
+        first = atlas.get("cube", 1.2000000000000002, self.build)
+        self.assertIs(atlas.get("cube", 1.2, self.build), first)
+        self.assertEqual(self.built, [1.2])
+        self.assertEqual((atlas.hits, atlas.misses), (1, 1))
+
+    def test_evicts_least_recently_used_over_budget(self):
+        one_sprite = pygame.Surface((10, 10)).get_pitch() * 10
+        atlas = sprite_atlas.SpriteAtlas(budget=2 * one_sprite)
+        atlas.get("cube", 1.0, self.build)
+        atlas.get("cube", 2.0, self.build)
+        atlas.get("cube", 1.0, self.build) #Now the most recently used.
+        atlas.get("cube", 3.0, self.build)
+        self.assertEqual(len(atlas), 2)
+        self.assertLessEqual(atlas.bytes, atlas.budget)
+        atlas.get("cube", 1.0, self.build)
+        self.assertEqual(self.built, [1.0, 2.0, 3.0]) #1.0 was kept, 2.0 evicted.
+
+    def test_scaled(self):
+        atlas = sprite_atlas.SpriteAtlas()
+        base = pygame.Surface((40, 40))
+        self.assertIs(atlas.scaled("cube", base, 1.0, lambda z: z * z), base)
+        self.assertEqual(atlas.scaled("cube", base, 1.5, lambda z: z * z).get_size(), (90, 90))
+
+if __name__ == '__main__':
+    unittest.main()
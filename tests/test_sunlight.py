@@ -0,0 +1,55 @@
+# tests/test_sunlight.py
+import math
+import unittest
+import numpy as np
+from src.environment import sunlight
+
+class TestSunlight(unittest.TestCase):
+
+    def setUp(self):
+        self.terrain = np.zeros((9, 9))
+        self.terrain[4, 4] = 1.0 #A single pillar on flat ground.
+
+    def test_angle_and_intensity(self):
+        azimuth, elevation = sunlight.get_sunlight_angle(sunlight.DAY_LENGTH / 4)
+        self.assertAlmostEqual(azimuth, math.pi / 2) #Noon: the sun is due south.
+        self.assertAlmostEqual(elevation, sunlight.MAX_ELEVATION)
+        self.assertEqual(sunlight.calculate_sunlight_intensity(sunlight.DAY_LENGTH * 0.75), 0.0) #Midnight.
+
+    def test_shadow_falls_away_from_sun(self):
+        shadow = sunlight.apply_shadow(self.terrain, 0.0, math.radians(30)) #Sun in the east (+x).
+        self.assertTrue(shadow[4, :4].all())
+        self.assertFalse(shadow[4, 4:].any())
+        self.assertEqual(shadow.sum(), 4)
+
+        shadow = sunlight.apply_shadow(self.terrain, math.pi / 2, math.radians(30)) #Sun in the south (+y).
+        self.assertTrue(shadow[:4, 4].all())
+        self.assertEqual(shadow.sum(), 4)
+
+    def test_shadow_length_depends_on_elevation(self):
+        self.terrain[4, 4] = 0.2
+        low = sunlight.apply_shadow(self.terrain, 0.0, math.radians(20)).sum()
+        high = sunlight.apply_shadow(self.terrain, 0.0, math.radians(60)).sum()
+        self.assertGreater(low, high)
+
+    def test_masks_are_cached_per_bucket(self):
+        sun = sunlight.Sunlight(self.terrain, max_masks=2)
+        first = sun.shadow_mask(10.0)
+        self.assertIs(sun.shadow_mask(10.01), first) #Same angle bucket.
+        self.assertEqual((sun.hits, sun.misses), (1, 1))
+        sun.shadow_mask(40.0)
+        sun.shadow_mask(50.0)
+        self.assertEqual(len(sun._masks), 2) #Least recently used mask evicted.
+        sun.invalidate()
+        self.assertEqual(len(sun._masks), 0)
+
+    def test_light_map(self):
+        sun = sunlight.Sunlight(self.terrain)
+        noon = sun.light_map(sunlight.DAY_LENGTH / 4)
+        self.assertEqual(noon.dtype, np.float32)
+        self.assertAlmostEqual(float(noon.max()), sunlight.AMBIENT_LIGHT + (1 - sunlight.AMBIENT_LIGHT) * math.sin(sunlight.MAX_ELEVATION), places=5)
+        night = sun.light_map(sunlight.DAY_LENGTH * 0.75)
+        self.assertTrue(np.allclose(night, sunlight.AMBIENT_LIGHT))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -40,5 +40,27 @@ class TestTerrain(unittest.TestCase):
         slope = terrain.calculate_slope(heightmap, 5, 5)
         self.assertGreaterEqual(slope, 0)  # Slope should be non-negative
 
+    def test_calculate_constrained_heights(self):
+        heightmap = np.zeros((3, 4))
+        heightmap[1, 1] = 1.0
+        factor = terrain.height_scale_factor(4)
+        constrained = terrain.calculate_constrained_heights(heightmap, 10)
+        self.assertEqual(constrained.dtype, np.float32)
+        self.assertAlmostEqual(constrained[0, 1], factor - 10, places=4)  # Pulled up to within 10 of its scaled neighbour.
+        self.assertAlmostEqual(constrained[1, 2], 10)  # Neighbours are clamped in order; the last one wins.
+        self.assertAlmostEqual(constrained[1, 1], 1.0)  # Its neighbours are flat.
+        self.assertEqual(constrained[2, 3], 0)
+
+    def test_update_constrained_heights(self):
+        rng = np.random.default_rng(0)
+        heightmap = rng.random((6, 7)) * 0.2
+        constrained = terrain.calculate_constrained_heights(heightmap, 40)
+        dirty = np.zeros(heightmap.shape, dtype=bool)
+        dirty[0, 0] = dirty[3, 4] = True
+        heightmap[dirty] -= 0.05
+        ys, xs = terrain.update_constrained_heights(constrained, heightmap, 40, dirty)
+        self.assertEqual(len(ys), 3 + 5)  # The dirty cells and their neighbours.
+        np.testing.assert_array_equal(constrained, terrain.calculate_constrained_heights(heightmap, 40))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
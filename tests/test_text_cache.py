@@ -0,0 +1,40 @@
+# tests/test_text_cache.py
+import unittest
+import pygame
+from src.visualization.vis_components import text_cache
+
+class TestTextCache(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        pygame.font.init()
+
+    def test_unchanged_text_is_rendered_once(self):
+        cache = text_cache.TextCache()
+        font = cache.get_font(20)
+        self.assertIs(cache.get_font(20), font)
+        first = cache.render(font, "Age: 1.00", (255, 255, 255))
+        self.assertIs(cache.render(font, "Age: 1.00", [255, 255, 255]), first)
+        self.assertIsNot(cache.render(font, "Age: 1.02", (255, 255, 255)), first) #Changed value.
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_lru_eviction(self):
+        cache = text_cache.TextCache(max_entries=2)
+        font = cache.get_font(20)
+        a = cache.render(font, "a", (0, 0, 0))
+        cache.render(font, "b", (0, 0, 0))
+        cache.render(font, "a", (0, 0, 0)) #Most recently used.
+        cache.render(font, "c", (0, 0, 0))
+        self.assertEqual(len(cache), 2)
+        self.assertIs(cache.render(font, "a", (0, 0, 0)), a)
+
+    def test_outlined_label(self):
+        cache = text_cache.TextCache()
+        font = cache.get_font(20)
+        fill = font.render("A1", True, (255, 255, 255))
+        label = cache.outlined(font, "A1", (255, 255, 255), offset=2)
+        self.assertEqual(label.get_size(), (fill.get_width() + 4, fill.get_height() + 4))
+        self.assertIs(cache.outlined(font, "A1", (255, 255, 255), offset=2), label)
+
+if __name__ == '__main__':
+    unittest.main()
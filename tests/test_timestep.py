@@ -0,0 +1,46 @@
+# tests/test_timestep.py
+import unittest
+import numpy as np
+from src.utils.timestep import FixedTimestep, snapshot_positions, interpolate_positions
+
+class Point:
+    def __init__(self, x, y):
+        self.x, self.y = x, y
+
+    def get_position(self):
+        return self.x, self.y
+
+class TestFixedTimestep(unittest.TestCase):
+
+    def test_steps_do_not_depend_on_frame_time(self):
+        fast, slow = FixedTimestep(0.125), FixedTimestep(0.125)
+        fast_steps = sum(fast.advance(0.0625) for _ in range(16))
+        slow_steps = sum(slow.advance(0.25) for _ in range(4))
+        self.assertEqual(fast_steps, slow_steps)
+        self.assertEqual(fast_steps, 8)
+
+    def test_alpha_and_rate(self):
+        timestep = FixedTimestep(0.125)
+        self.assertEqual(timestep.advance(0.0625, rate=3.0), 1)
+        self.assertAlmostEqual(timestep.alpha, 0.5)
+
+    def test_falls_behind_and_skips_frames(self):
+        timestep = FixedTimestep(0.125, max_steps=2, max_skipped_frames=2, max_frame_time=1.0)
+        self.assertEqual(timestep.advance(1.0), 2)
+        self.assertTrue(timestep.behind)
+        self.assertLessEqual(timestep.accumulator, 2 * 0.125) #Backlog is capped.
+        self.assertFalse(timestep.should_render())
+        timestep.advance(1.0)
+        self.assertFalse(timestep.should_render())
+        timestep.advance(1.0)
+        self.assertTrue(timestep.should_render()) #Never more than max_skipped_frames in a row.
+
+    def test_interpolate_positions(self):
+        a, b = Point(0.0, 0.0), Point(5.0, 5.0)
+        previous = snapshot_positions([a])
+        a.x = 2.0
+        positions = interpolate_positions([a, b], previous, 0.25)
+        self.assertTrue(np.allclose(positions, [[0.5, 0.0], [5.0, 5.0]]))
+
+if __name__ == '__main__':
+    unittest.main()